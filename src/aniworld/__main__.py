@@ -6,14 +6,18 @@ import sys
 import logging
 from typing import NoReturn
 
+from . import config
 from .entry import aniworld
-from .config import VERSION, IS_NEWEST_VERSION
 
 
 def set_terminal_title() -> None:
     """Set the terminal window title with version and update status."""
-    title = f"AniWorld-Downloader v.{VERSION}"
-    if not IS_NEWEST_VERSION:
+    # Keep the escape sequence (and the update check) out of piped output
+    if not sys.stdout.isatty():
+        return
+
+    title = f"AniWorld-Downloader v.{config.VERSION}"
+    if not config.IS_NEWEST_VERSION:
         title += " (Update Available)"
 
     # ANSI escape sequence to set terminal title
@@ -1,9 +1,12 @@
 import logging
 import subprocess
-from typing import List, Optional
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterator, List, Optional, Tuple
 
+from ..config import DEFAULT_PREFETCH_EPISODES
 from ..parser import arguments
-from ..aniskip import aniskip
+from ..aniskip import aniskip, prefetch_aniskip
 from ..models import Anime
 
 # Set of characters not allowed in filenames on most filesystems
@@ -36,12 +39,15 @@ def get_media_title(anime, episode, sanitized_title: str) -> str:
     return f"{sanitized_title} - S{episode.season:02}E{episode.episode:03} - ({anime.language})"
 
 
-def get_direct_link(episode, episode_title: str) -> Optional[str]:
+def get_direct_link(episode, episode_title: str, race: bool = False) -> Optional[str]:
     """
     Try to get a direct link for the episode.
+    With race, the fastest of all providers offering the language is used.
     Log a warning and return None if it fails.
     """
     try:
+        if race:
+            return episode.race_direct_link()
         return episode.get_direct_link()
     except Exception as err:
         logging.warning(
@@ -52,6 +58,60 @@ def get_direct_link(episode, episode_title: str) -> Optional[str]:
         return None
 
 
+def iter_direct_links(
+    anime: Anime,
+    format_title: Callable,
+    lookahead: int = DEFAULT_PREFETCH_EPISODES,
+    race: bool = False,
+) -> Iterator[Tuple[object, str, Optional[str]]]:
+    """
+    Yield (episode, episode_title, direct_link) for every episode in order.
+
+    While the caller handles an episode, the direct links of the next
+    lookahead episodes are resolved in the background. That covers the
+    episode HTML, the provider map, the redirect and the extractor call.
+    At most lookahead episodes are resolved ahead, so links are not fetched
+    long before they are used. With race, every episode is downloaded
+    from its fastest provider.
+    """
+    episodes = iter(anime)
+
+    if lookahead <= 1 or len(anime) <= 1:
+        for episode in episodes:
+            episode_title = format_title(anime, episode)
+            yield episode, episode_title, get_direct_link(episode, episode_title, race)
+        return
+
+    executor = ThreadPoolExecutor(
+        max_workers=lookahead, thread_name_prefix="episode-prefetch"
+    )
+    pending = deque()
+
+    def fill_pending():
+        while len(pending) < lookahead:
+            episode = next(episodes, None)
+            if episode is None:
+                return
+            episode_title = format_title(anime, episode)
+            pending.append(
+                (
+                    episode,
+                    episode_title,
+                    executor.submit(get_direct_link, episode, episode_title, race),
+                )
+            )
+
+    try:
+        fill_pending()
+        while pending:
+            episode, episode_title, future = pending.popleft()
+            fill_pending()
+            yield episode, episode_title, future.result()
+    finally:
+        # Stop resolving ahead when the caller stops early or is interrupted
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
 def execute_command(command: List[str]) -> None:
     """Execute command or print it if in command-only mode."""
     if arguments.only_command:
@@ -68,6 +128,31 @@ def execute_command(command: List[str]) -> None:
         raise
 
 
+def prefetch_aniskip_data(anime: Anime) -> None:
+    """Fetch the skip times of all episodes at once so playback never waits."""
+    if not anime.aniskip or arguments.only_direct_link:
+        return
+
+    seasons = {}
+    for episode in anime:
+        # Movies have no MyAnimeList season to look up
+        if episode.season:
+            seasons.setdefault(episode.season, []).append(episode)
+
+    for season, episodes in seasons.items():
+        try:
+            prefetch_aniskip(
+                anime.title,
+                season,
+                [episode.episode for episode in episodes],
+                episodes[0].season_episode_count[season],
+            )
+        except Exception as err:
+            logging.warning(
+                "Failed to prefetch aniskip data for %s: %s", anime.title, err
+            )
+
+
 def get_aniskip_data(anime: Anime, episode) -> Optional[str]:
     """Get aniskip data for episode if enabled."""
     if not anime.aniskip:
@@ -79,6 +164,7 @@ def get_aniskip_data(anime: Anime, episode) -> Optional[str]:
             episode.episode,
             episode.season,
             episode.season_episode_count[episode.season],
+            script_opts_only=arguments.aniskip_script_opts,
         )
     except Exception as err:
         logging.warning("Failed to get aniskip data for %s: %s", anime.title, err)
@@ -1,14 +1,15 @@
 import re
 import logging
 import sys
+from contextlib import nullcontext
 from pathlib import Path
 from typing import Optional, Callable
-import yt_dlp
 
-from ..models import Anime
-from ..config import PROVIDER_HEADERS_D
+from ..common import get_provider_health, is_hoster_failure
+from ..models import Anime, get_direct_links
+from .. import config
 from ..parser import arguments
-from .common import get_direct_link, sanitize_filename
+from .common import iter_direct_links, sanitize_filename
 
 
 class QuietLogger:
@@ -51,28 +52,28 @@ def _get_output_filename(anime: Anime, episode, sanitized_title: str) -> str:
 
 
 def _build_ytdl_options(
-    output_path: str, anime: Anime, progress_hook: Optional[Callable] = None
+    output_path: str,
+    anime: Anime,
+    progress_hook: Optional[Callable] = None,
+    provider: Optional[str] = None,
 ) -> dict:
     """Build yt-dlp options dictionary with all necessary parameters."""
+    provider = provider or anime.provider
     options = {
         "nocheckcertificate": True,
         "fragment_retries": float("inf"),
         "concurrent_fragment_downloads": 4,
         "outtmpl": output_path,
+        "continuedl": True,  # Resume from .part files of interrupted downloads
         "quiet": False,  # Allow progress hooks to work
         "no_warnings": True,
         "logger": _create_quiet_logger(),  # Custom logger to suppress most output
     }
 
     # Add provider-specific headers
-    if anime.provider in PROVIDER_HEADERS_D:
-        headers = {}
-        for header in PROVIDER_HEADERS_D[anime.provider]:
-            if ":" in header:
-                key, value = header.split(":", 1)
-                headers[key.strip()] = value.strip()
-        if headers:
-            options["http_headers"] = headers
+    headers = config.get_download_headers(provider)
+    if headers:
+        options["http_headers"] = headers
 
     # Add progress hook if provided
     if progress_hook:
@@ -185,14 +186,34 @@ class CliProgressBar:
             print(f"\rDownload failed: {d.get('error', 'Unknown error')}")
 
 
+def _is_hoster_download_error(error: Exception) -> bool:
+    """Check whether a yt-dlp download failed because of the hoster"""
+    from yt_dlp.networking.exceptions import HTTPError, TransportError
+
+    exc_info = getattr(error, "exc_info", None)
+    cause = exc_info[1] if exc_info else None
+    if isinstance(cause, HTTPError):
+        return cause.status in config.HTTP_RETRY_STATUS_CODES
+    if isinstance(cause, TransportError):
+        return True
+    return cause is not None and is_hoster_failure(cause)
+
+
 def _execute_download(
     direct_link: str,
     output_path: Path,
     anime: Anime,
     episode_title: str = "",
     web_progress_callback: Optional[Callable] = None,
+    provider: Optional[str] = None,
 ) -> bool:
     """Execute download using yt-dlp Python API with progress tracking."""
+    # yt-dlp takes a while to import and is not needed to only print links
+    import yt_dlp
+
+    provider = provider or anime.provider
+    transfer = {"bytes": 0, "elapsed": 0.0}
+
     try:
         # Create CLI progress bar
         cli_progress = CliProgressBar(episode_title)
@@ -202,6 +223,11 @@ def _execute_download(
             # Update CLI progress
             cli_progress.update(d)
 
+            # Remember the transfer for the provider health
+            if d["status"] in ("downloading", "finished"):
+                transfer["bytes"] = d.get("downloaded_bytes") or transfer["bytes"]
+                transfer["elapsed"] = d.get("elapsed") or transfer["elapsed"]
+
             # Update web progress if callback provided
             if web_progress_callback:
                 try:
@@ -213,23 +239,34 @@ def _execute_download(
                     logging.warning(f"Web progress callback error: {e}")
 
         # Build yt-dlp options
-        options = _build_ytdl_options(str(output_path), anime, combined_progress_hook)
+        options = _build_ytdl_options(
+            str(output_path), anime, combined_progress_hook, provider
+        )
 
         # Execute download with yt-dlp
         with yt_dlp.YoutubeDL(options) as ydl:
             ydl.download([direct_link])
 
         print("")  # New line after progress bar
+        if transfer["elapsed"]:
+            get_provider_health().record_success(
+                provider, bytes_per_second=transfer["bytes"] / transfer["elapsed"]
+            )
         return True
 
     except yt_dlp.DownloadError as e:
+        # Expired links or geo blocks do not mean the hoster is down
+        if _is_hoster_download_error(e):
+            get_provider_health().record_failure(provider, e)
         logging.error(f"yt-dlp download error: {e}")
         print(f"\n❌ Download failed: {e}")
         return False
     except KeyboardInterrupt:
         logging.info("Download interrupted by user")
         print("\n⏹️ Download interrupted by user")
-        _cleanup_partial_files(output_path.parent)
+        # The web queue resumes interrupted downloads, keep its .part files
+        if web_progress_callback is None:
+            _cleanup_partial_files(output_path.parent)
         raise
     except Exception as e:
         logging.error(f"Unexpected download error: {e}")
@@ -237,15 +274,47 @@ def _execute_download(
         return False
 
 
-def download(anime: Anime, web_progress_callback: Optional[Callable] = None) -> None:
-    """Download all episodes of an anime."""
+def _print_direct_links(anime: Anime) -> None:
+    """Resolve the direct links of all episodes concurrently and print them."""
+    episodes = list(anime)
+    for episode, direct_link in zip(episodes, get_direct_links(episodes)):
+        episode_title = _format_episode_title(anime, episode)
+        if not direct_link:
+            logging.warning(
+                'Something went wrong with "%s".\nNo direct link found.', episode_title
+            )
+            continue
+
+        print(episode_title)
+        print(f"{direct_link}\n")
+
+
+def download(
+    anime: Anime,
+    web_progress_callback: Optional[Callable] = None,
+    provider_limit: Optional[Callable] = None,
+) -> None:
+    """
+    Download all episodes of an anime.
+
+    Args:
+        anime: Anime with the episodes to download
+        web_progress_callback: Called with the yt-dlp progress of every episode
+        provider_limit: Called with the provider an episode is downloaded
+            from, returns a context manager held during its transfer. Racing
+            and fallbacks may pick another provider than anime.provider.
+    """
     sanitized_anime_title = sanitize_filename(anime.title)
 
-    for episode in anime:
-        episode_title = _format_episode_title(anime, episode)
+    # Links are only printed, so all of them are resolved at once
+    if arguments.only_direct_link and not arguments.race_providers:
+        _print_direct_links(anime)
+        return
 
-        # Get direct link
-        direct_link = get_direct_link(episode, episode_title)
+    # Direct links of the next episodes are resolved while one is downloading
+    for episode, episode_title, direct_link in iter_direct_links(
+        anime, _format_episode_title, race=arguments.race_providers
+    ):
         if not direct_link:
             logging.warning(
                 'Something went wrong with "%s".\nNo direct link found.', episode_title
@@ -277,8 +346,8 @@ def download(anime: Anime, web_progress_callback: Optional[Callable] = None) ->
             command.extend(["--quiet", "--no-warnings"])
 
             # Add headers if any
-            if anime.provider in PROVIDER_HEADERS_D:
-                for header in PROVIDER_HEADERS_D[anime.provider]:
+            if anime.provider in config.PROVIDER_HEADERS_D:
+                for header in config.PROVIDER_HEADERS_D[anime.provider]:
                     command.extend(["--add-header", header])
 
             print(
@@ -287,7 +356,21 @@ def download(anime: Anime, web_progress_callback: Optional[Callable] = None) ->
             print(" ".join(command))
             continue
 
-        # Execute download
-        _execute_download(
-            direct_link, output_path, anime, episode_title, web_progress_callback
-        )
+        # Execute download, falling back to the next fastest raced provider
+        while direct_link:
+            provider = episode._selected_provider
+            with provider_limit(provider) if provider_limit else nullcontext():
+                if _execute_download(
+                    direct_link,
+                    output_path,
+                    anime,
+                    episode_title,
+                    web_progress_callback,
+                    provider,
+                ):
+                    break
+            direct_link = episode.next_direct_link()
+            if direct_link:
+                logging.warning(
+                    'Retrying "%s" with provider %s', episode_title, episode._selected_provider
+                )
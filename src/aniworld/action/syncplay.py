@@ -4,9 +4,9 @@ import hashlib
 from typing import Optional, List
 
 from ..models import Anime
+from .. import config
 from ..config import (
     MPV_PATH,
-    PROVIDER_HEADERS_W,
     SYNCPLAY_PATH,
 )
 from ..common import (
@@ -22,6 +22,7 @@ from .common import (
     sanitize_filename,
     execute_command,
     get_aniskip_data,
+    prefetch_aniskip_data,
 )
 
 
@@ -118,6 +119,7 @@ def _build_syncplay_command(
 def _process_anime_episodes(anime: Anime) -> None:
     """Process and play all episodes of an anime through syncplay."""
     sanitized_anime_title = sanitize_filename(anime.title)
+    prefetch_aniskip_data(anime)
 
     for episode in anime:
         episode_title = _format_episode_title(anime, episode)
@@ -146,7 +148,7 @@ def _process_anime_episodes(anime: Anime) -> None:
         command = _build_syncplay_command(
             source=direct_link,
             title=episode.title_german,
-            headers=PROVIDER_HEADERS_W.get(anime.provider),
+            headers=config.PROVIDER_HEADERS_W.get(anime.provider),
             aniskip_data=aniskip_data,
             anime=anime,
             media_title=media_title,
@@ -2,7 +2,8 @@ import logging
 from typing import Optional, List
 
 from ..common import download_mpv
-from ..config import MPV_PATH, PROVIDER_HEADERS_W
+from .. import config
+from ..config import MPV_PATH
 from ..models import Anime
 from ..parser import arguments
 from .common import (
@@ -12,6 +13,7 @@ from .common import (
     get_direct_link,
     execute_command,
     get_aniskip_data,
+    prefetch_aniskip_data,
 )
 
 
@@ -54,6 +56,7 @@ def _process_local_files() -> None:
 def _process_anime_episodes(anime: Anime) -> None:
     """Process and watch all episodes of an anime through MPV."""
     sanitized_anime_title = sanitize_filename(anime.title)
+    prefetch_aniskip_data(anime)
 
     for episode in anime:
         episode_title = format_episode_title(anime, episode)
@@ -81,7 +84,7 @@ def _process_anime_episodes(anime: Anime) -> None:
         command = _build_watch_command(
             source=direct_link,
             media_title=media_title,
-            headers=PROVIDER_HEADERS_W.get(anime.provider),
+            headers=config.PROVIDER_HEADERS_W.get(anime.provider),
             aniskip_data=aniskip_data,
             anime=anime,
         )
@@ -1,4 +1,8 @@
 from .aniskip import (
     get_mal_id_from_title as get_mal_id_from_title,
+    get_skip_times as get_skip_times,
+    get_skip_times_batch as get_skip_times_batch,
+    prefetch_aniskip as prefetch_aniskip,
     aniskip as aniskip,
+    cleanup_chapters as cleanup_chapters,
 )
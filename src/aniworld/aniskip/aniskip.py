@@ -1,15 +1,29 @@
 import re
+import atexit
 import logging
+import os
+import shutil
 import tempfile
+import threading
 import json
-from typing import Dict, Optional, List
-from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Optional, List
 
 import requests
 from bs4 import BeautifulSoup
 
-from ..config import DEFAULT_REQUEST_TIMEOUT, MPV_SCRIPTS_DIRECTORY
-from ..common import copy_file_if_different, setup_autostart, setup_autoexit
+from ..config import (
+    ANISKIP_MISSING_TTL,
+    ANISKIP_PREFETCH_CONCURRENCY,
+    DEFAULT_REQUEST_TIMEOUT,
+    get_http_session,
+)
+from ..common import (
+    get_metadata_cache,
+    setup_autostart,
+    setup_autoexit,
+    setup_mpv_script,
+)
 
 # Constants
 CHAPTER_FORMAT = "\n[CHAPTER]\nTIMEBASE=1/1000\nSTART={}\nEND={}\nTITLE={}\n"
@@ -17,6 +31,12 @@ OPTION_FORMAT = "skip-{}_start={},skip-{}_end={}"
 MAL_ANIME_URL = "https://myanimelist.net/anime/{}"
 MAL_SEARCH_URL = "https://myanimelist.net/search/prefix.json?type=anime&keyword={}"
 ANISKIP_API_URL = "https://api.aniskip.com/v1/skip-times/{}/{}?types=op&types=ed"
+# Makes aniskip.lua add the chapters itself when no chapters file is passed
+CHAPTERS_OPTION = "skip-chapters=yes"
+
+# Chapters files of this session, reused per episode and removed on exit
+_chapters_directory: Optional[str] = None
+_chapters_directory_lock = threading.Lock()
 
 
 def _float_to_milliseconds(value: float) -> str:
@@ -29,7 +49,7 @@ def _make_request(
 ) -> requests.Response:
     """Make HTTP request with error handling."""
     try:
-        response = requests.get(url, timeout=timeout)
+        response = get_http_session().get(url, timeout=timeout)
         response.raise_for_status()
         return response
     except requests.RequestException as err:
@@ -92,12 +112,10 @@ def _find_sequel_info(soup: BeautifulSoup) -> Optional[str]:
     return link_element.get("href")
 
 
-def _write_chapter(file_handle, start_time: float, end_time: float, title: str) -> None:
-    """Write chapter information to file."""
-    file_handle.write(
-        CHAPTER_FORMAT.format(
-            _float_to_milliseconds(start_time), _float_to_milliseconds(end_time), title
-        )
+def _format_chapter(start_time: float, end_time: float, title: str) -> str:
+    """Format chapter information for a chapters file."""
+    return CHAPTER_FORMAT.format(
+        _float_to_milliseconds(start_time), _float_to_milliseconds(end_time), title
     )
 
 
@@ -106,6 +124,10 @@ def _create_skip_option(skip_type: str, start_time: float, end_time: float) -> s
     return OPTION_FORMAT.format(skip_type, start_time, skip_type, end_time)
 
 
+def _mal_id_cache_key(title: str, season: int) -> str:
+    return f"{title.strip().lower()}/{season}"
+
+
 def check_episodes(anime_id: int) -> Optional[int]:
     """
     Check episode count for anime on MyAnimeList.
@@ -116,6 +138,11 @@ def check_episodes(anime_id: int) -> Optional[int]:
     Returns:
         Episode count or None if not found
     """
+    cache = get_metadata_cache()
+    cached = cache.get("mal_episodes", str(anime_id))
+    if cached is not None:
+        return cached or None
+
     try:
         response = _make_request(MAL_ANIME_URL.format(anime_id))
         soup = BeautifulSoup(response.content, "html.parser")
@@ -124,10 +151,18 @@ def check_episodes(anime_id: int) -> Optional[int]:
         if episode_count is None:
             logging.warning("Episode count not found for anime ID: %s", anime_id)
 
+        # Airing anime have no episode count yet, so they are retried soon
+        cache.set(
+            "mal_episodes",
+            str(anime_id),
+            episode_count or 0,
+            negative=episode_count is None,
+        )
         return episode_count
 
     except Exception as err:
         logging.error("Failed to check episodes for anime ID %s: %s", anime_id, err)
+        cache.set("mal_episodes", str(anime_id), 0, negative=True)
         return None
 
 
@@ -135,6 +170,9 @@ def get_mal_id_from_title(title: str, season: int) -> Optional[int]:
     """
     Get MAL ID from anime title and season.
 
+    The IDs of the seasons walked through to find it are cached as well, so a
+    later season only follows the sequels after the highest cached one.
+
     Args:
         title: Anime title
         season: Season number
@@ -142,7 +180,30 @@ def get_mal_id_from_title(title: str, season: int) -> Optional[int]:
     Returns:
         MAL anime ID or None if not found
     """
+    cache = get_metadata_cache()
+    cached = cache.get("mal_id", _mal_id_cache_key(title, season))
+    if cached is not None:
+        return cached or None
+
+    anime_id = _find_mal_id(title, season)
+    cache.set(
+        "mal_id",
+        _mal_id_cache_key(title, season),
+        anime_id or 0,
+        negative=anime_id is None,
+    )
+    return anime_id
+
+
+def _find_mal_id(title: str, season: int) -> Optional[int]:
+    """Search MyAnimeList for the first season and follow its sequels"""
     logging.debug("Fetching MAL ID for: %s (Season %d)", title, season)
+    cache = get_metadata_cache()
+
+    for known_season in range(season - 1, 0, -1):
+        known_id = cache.get("mal_id", _mal_id_cache_key(title, known_season))
+        if known_id:
+            return _follow_sequels(title, known_id, known_season, season)
 
     try:
         keyword = _clean_anime_title(title)
@@ -166,22 +227,166 @@ def get_mal_id_from_title(title: str, season: int) -> Optional[int]:
         logging.debug(
             "Found MAL ID: %s for %s", anime_id, json.dumps(best_match, indent=4)
         )
+        if season > 1:
+            cache.set("mal_id", _mal_id_cache_key(title, 1), anime_id)
 
-        # Navigate to correct season
-        current_id = anime_id
-        for _ in range(season - 1):
-            current_id = get_sequel_anime_id(current_id)
-            if current_id is None:
-                logging.error("Could not find season %d for anime: %s", season, title)
-                return None
-
-        return current_id
+        return _follow_sequels(title, anime_id, 1, season)
 
     except Exception as err:
         logging.error("Failed to get MAL ID for %s: %s", title, err)
         return None
 
 
+def _follow_sequels(
+    title: str, anime_id: int, from_season: int, season: int
+) -> Optional[int]:
+    """Navigate from the MAL ID of one season to the one of a later season"""
+    cache = get_metadata_cache()
+    current_id = anime_id
+    for current_season in range(from_season + 1, season + 1):
+        current_id = get_sequel_anime_id(current_id)
+        if current_id is None:
+            logging.error("Could not find season %d for anime: %s", season, title)
+            return None
+        if current_season < season:
+            cache.set("mal_id", _mal_id_cache_key(title, current_season), current_id)
+
+    return current_id
+
+
+def get_skip_times(anime_id: int, episode: int) -> Optional[Dict]:
+    """
+    Get the AniSkip opening and ending times of an episode.
+
+    Args:
+        anime_id: MAL anime ID
+        episode: Episode number
+
+    Returns:
+        AniSkip API response data or None if no skip times are known
+    """
+    cache = get_metadata_cache()
+    cache_key = f"{anime_id}/{episode}"
+    cached = cache.get("skip_times", cache_key)
+    if cached is not None:
+        return cached or None
+
+    try:
+        aniskip_url = ANISKIP_API_URL.format(anime_id, episode)
+        response = get_http_session().get(aniskip_url, timeout=DEFAULT_REQUEST_TIMEOUT)
+
+        if response.status_code == 500:
+            logging.info("Aniskip API is currently not working!")
+            cache.set("skip_times", cache_key, {}, negative=True)
+            return None
+
+        if response.status_code != 200:
+            logging.info(
+                "Failed to fetch AniSkip data (Status: %d)", response.status_code
+            )
+            cache.set("skip_times", cache_key, {}, negative=True)
+            return None
+
+        metadata = response.json()
+
+        if not metadata.get("found"):
+            logging.warning(
+                "No skip times found for anime %s episode %d", anime_id, episode
+            )
+            cache.set("skip_times", cache_key, {}, ttl=ANISKIP_MISSING_TTL)
+            return None
+
+        cache.set("skip_times", cache_key, metadata)
+        return metadata
+
+    except Exception as err:
+        logging.error("Failed to fetch skip times: %s", err)
+        return None
+
+
+def get_skip_times_batch(
+    anime_id: int,
+    episodes: Iterable[int],
+    concurrency: int = ANISKIP_PREFETCH_CONCURRENCY,
+) -> Dict[int, Optional[Dict]]:
+    """
+    Get the AniSkip times of several episodes concurrently.
+
+    Args:
+        anime_id: MAL anime ID
+        episodes: Episode numbers
+        concurrency: Requests sent at once
+
+    Returns:
+        Skip times (or None) by episode number
+    """
+    episodes = list(dict.fromkeys(episodes))
+    if not episodes:
+        return {}
+
+    with ThreadPoolExecutor(
+        max_workers=max(1, min(concurrency, len(episodes)))
+    ) as executor:
+        skip_times = executor.map(
+            lambda episode: get_skip_times(anime_id, episode), episodes
+        )
+        return dict(zip(episodes, skip_times))
+
+
+def _resolve_anime_id(
+    title: str, season: int, aniworld_episodes: int
+) -> Optional[int]:
+    """Get the MAL ID of a season if its episode count matches AniWorld's"""
+    if title.isdigit():
+        anime_id = int(title)
+    else:
+        anime_id = get_mal_id_from_title(title, season)
+
+    if not anime_id:
+        logging.warning("No MAL ID found for: %s", title)
+        return None
+
+    mal_episodes = check_episodes(anime_id)
+    if mal_episodes != aniworld_episodes:
+        logging.warning(
+            "Episode count mismatch: MAL=%s, AniWorld=%s",
+            mal_episodes,
+            aniworld_episodes,
+        )
+        return None
+
+    return anime_id
+
+
+def prefetch_aniskip(
+    title: str, season: int, episodes: Iterable[int], aniworld_episodes: int
+) -> Dict[int, Optional[Dict]]:
+    """
+    Cache the skip times of many episodes of a season ahead of aniskip().
+
+    The MAL ID and episode count are looked up once, the skip times of all
+    episodes are fetched concurrently.
+
+    Args:
+        title: Anime title
+        season: Season number
+        episodes: Episode numbers of the season
+        aniworld_episodes: Total episodes in season
+
+    Returns:
+        Skip times (or None) by episode number
+    """
+    try:
+        anime_id = _resolve_anime_id(title, season, aniworld_episodes)
+        if not anime_id:
+            return {}
+        return get_skip_times_batch(anime_id, episodes)
+
+    except Exception as err:
+        logging.error("Aniskip prefetch failed for %s: %s", title, err)
+        return {}
+
+
 def get_sequel_anime_id(anime_id: int) -> Optional[int]:
     """
     Get sequel anime ID from MAL.
@@ -213,53 +418,94 @@ def get_sequel_anime_id(anime_id: int) -> Optional[int]:
         return None
 
 
-def build_options(metadata: Dict, chapters_file: str) -> str:
+def _get_chapters_directory() -> str:
+    """Create the chapters directory of this session on first use"""
+    global _chapters_directory
+    with _chapters_directory_lock:
+        if _chapters_directory is None:
+            _chapters_directory = tempfile.mkdtemp(prefix="aniworld-chapters-")
+            atexit.register(cleanup_chapters)
+        elif not os.path.isdir(_chapters_directory):
+            os.makedirs(_chapters_directory, exist_ok=True)
+        return _chapters_directory
+
+
+def cleanup_chapters() -> None:
+    """Remove the chapters files of this session."""
+    global _chapters_directory
+    with _chapters_directory_lock:
+        if _chapters_directory is not None:
+            shutil.rmtree(_chapters_directory, ignore_errors=True)
+            _chapters_directory = None
+
+
+def get_chapters_file(anime_id: int, episode: int) -> str:
+    """
+    Get the path of an episode's chapters file in the session directory.
+
+    Args:
+        anime_id: MAL anime ID
+        episode: Episode number
+
+    Returns:
+        Path of the chapters file, which may not be written yet
+    """
+    return os.path.join(_get_chapters_directory(), f"{anime_id}-{episode}.ffmetadata")
+
+
+def build_options(metadata: Dict, chapters_file: Optional[str] = None) -> str:
     """
     Build MPV options from aniskip metadata.
 
     Args:
         metadata: Aniskip API response data
-        chapters_file: Path to chapters file
+        chapters_file: Path to chapters file, chapters are only written if given
 
     Returns:
         MPV options string
     """
     op_end, ed_start = None, None
     options = []
+    chapters = [";FFMETADATA1"]
 
     try:
-        with open(chapters_file, "a", encoding="utf-8") as f:
-            for skip in metadata.get("results", []):
-                skip_type = skip.get("skip_type")
-                interval = skip.get("interval", {})
-                start_time = interval.get("start_time")
-                end_time = interval.get("end_time")
-
-                if None in (skip_type, start_time, end_time):
-                    logging.warning("Invalid skip data: %s", skip)
-                    continue
-
-                # Determine chapter name
-                chapter_name = {"op": "Opening", "ed": "Ending"}.get(
-                    skip_type, skip_type.title()
-                )
-
-                # Track timings for episode chapter
-                if skip_type == "op":
-                    op_end = end_time
-                elif skip_type == "ed":
-                    ed_start = start_time
-
-                # Write chapter info
-                _write_chapter(f, start_time, end_time, chapter_name)
-
-                # Add skip option
-                options.append(_create_skip_option(skip_type, start_time, end_time))
-
-            # Add episode chapter if we have opening end time
-            if op_end is not None:
-                episode_end = ed_start if ed_start is not None else op_end
-                _write_chapter(f, op_end, episode_end, "Episode")
+        for skip in metadata.get("results", []):
+            skip_type = skip.get("skip_type")
+            interval = skip.get("interval", {})
+            start_time = interval.get("start_time")
+            end_time = interval.get("end_time")
+
+            if None in (skip_type, start_time, end_time):
+                logging.warning("Invalid skip data: %s", skip)
+                continue
+
+            # Determine chapter name
+            chapter_name = {"op": "Opening", "ed": "Ending"}.get(
+                skip_type, skip_type.title()
+            )
+
+            # Track timings for episode chapter
+            if skip_type == "op":
+                op_end = end_time
+            elif skip_type == "ed":
+                ed_start = start_time
+
+            chapters.append(_format_chapter(start_time, end_time, chapter_name))
+
+            # Add skip option
+            options.append(_create_skip_option(skip_type, start_time, end_time))
+
+        # Add episode chapter if we have opening end time
+        if op_end is not None:
+            episode_end = ed_start if ed_start is not None else op_end
+            chapters.append(_format_chapter(op_end, episode_end, "Episode"))
+
+        if chapters_file and options:
+            # Written next to the target first, MPV never sees half a file
+            temporary_file = f"{chapters_file}.{threading.get_ident()}.tmp"
+            with open(temporary_file, "w", encoding="utf-8") as f:
+                f.write("".join(chapters))
+            os.replace(temporary_file, chapters_file)
 
         return ",".join(options)
 
@@ -268,45 +514,34 @@ def build_options(metadata: Dict, chapters_file: str) -> str:
         return ""
 
 
-def build_flags(anime_id: str, episode: int, chapters_file: str) -> str:
+def build_flags(
+    anime_id: str, episode: int, chapters_file: Optional[str] = None
+) -> str:
     """
     Build MPV flags for aniskip functionality.
 
     Args:
         anime_id: MAL anime ID
         episode: Episode number
-        chapters_file: Path to chapters file
+        chapters_file: Path to chapters file, an existing one is reused. Without
+            it the skip times only go to aniskip.lua, which adds the chapters
 
     Returns:
         MPV flags string
     """
     try:
-        aniskip_url = ANISKIP_API_URL.format(anime_id, episode)
-        response = requests.get(aniskip_url, timeout=DEFAULT_REQUEST_TIMEOUT)
-
-        if response.status_code == 500:
-            logging.info("Aniskip API is currently not working!")
-            return ""
-
-        if response.status_code != 200:
-            logging.info(
-                "Failed to fetch AniSkip data (Status: %d)", response.status_code
-            )
-            return ""
-
-        metadata = response.json()
-
-        if not metadata.get("found"):
-            logging.warning(
-                "No skip times found for anime %s episode %d", anime_id, episode
-            )
+        metadata = get_skip_times(int(anime_id), episode)
+        if not metadata:
             return ""
 
-        # Initialize chapters file
-        with open(chapters_file, "w", encoding="utf-8") as f:
-            f.write(";FFMETADATA1")
+        if chapters_file is None:
+            options = build_options(metadata)
+            return f"--script-opts={options},{CHAPTERS_OPTION}" if options else ""
 
-        options = build_options(metadata, chapters_file)
+        if os.path.exists(chapters_file):
+            options = build_options(metadata)
+        else:
+            options = build_options(metadata, chapters_file)
 
         if options:
             return f"--chapters-file={chapters_file} --script-opts={options}"
@@ -325,28 +560,16 @@ def setup_aniskip() -> bool:
     Returns:
         True if setup was successful
     """
-    try:
-        script_directory = Path(__file__).parent.parent
-        mpv_scripts_path = Path(MPV_SCRIPTS_DIRECTORY)
-
-        # Ensure scripts directory exists
-        mpv_scripts_path.mkdir(parents=True, exist_ok=True)
-
-        # Copy aniskip script
-        skip_source_path = script_directory / "aniskip" / "scripts" / "aniskip.lua"
-        skip_destination_path = mpv_scripts_path / "aniskip.lua"
-
-        copy_file_if_different(str(skip_source_path), str(skip_destination_path))
+    return setup_mpv_script("aniskip.lua")
 
-        logging.debug("Aniskip script setup completed")
-        return True
 
-    except Exception as err:
-        logging.error("Failed to setup aniskip: %s", err)
-        return False
-
-
-def aniskip(title: str, episode: int, season: int, aniworld_episodes: int) -> str:
+def aniskip(
+    title: str,
+    episode: int,
+    season: int,
+    aniworld_episodes: int,
+    script_opts_only: bool = False,
+) -> str:
     """
     Main aniskip function to generate MPV skip flags.
 
@@ -355,6 +578,8 @@ def aniskip(title: str, episode: int, season: int, aniworld_episodes: int) -> st
         episode: Episode number
         season: Season number
         aniworld_episodes: Total episodes in season
+        script_opts_only: Pass the skip times to aniskip.lua only, without
+            writing a chapters file
 
     Returns:
         MPV flags string for aniskip functionality
@@ -365,29 +590,17 @@ def aniskip(title: str, episode: int, season: int, aniworld_episodes: int) -> st
         setup_autoexit()
         setup_aniskip()
 
-        # Get anime ID
-        if title.isdigit():
-            anime_id = int(title)
-        else:
-            anime_id = get_mal_id_from_title(title, season)
-
+        # Get anime ID and validate episode count
+        anime_id = _resolve_anime_id(title, season, aniworld_episodes)
         if not anime_id:
-            logging.warning("No MAL ID found for: %s", title)
             return ""
 
-        # Validate episode count
-        mal_episodes = check_episodes(anime_id)
-        if mal_episodes != aniworld_episodes:
-            logging.warning(
-                "Episode count mismatch: MAL=%s, AniWorld=%s",
-                mal_episodes,
-                aniworld_episodes,
-            )
-            return ""
+        if script_opts_only:
+            return build_flags(str(anime_id), episode)
 
-        # Create temporary chapters file and build flags
-        with tempfile.NamedTemporaryFile(mode="w+", delete=False) as chapters_file:
-            return build_flags(str(anime_id), episode, chapters_file.name)
+        # Chapters files are kept per episode for the rest of the session
+        chapters_file = get_chapters_file(anime_id, episode)
+        return build_flags(str(anime_id), episode, chapters_file)
 
     except Exception as err:
         logging.error("Aniskip failed for %s: %s", title, err)
@@ -3,6 +3,8 @@ local mpv_options = require("mp.options")
 
 local options = {
     op_start = 0, op_end = 0, ed_start = 0, ed_end = 0,
+    -- Set when the skip times are passed without a chapters file
+    chapters = false,
 }
 mpv_options.read_options(options, "skip")
 
@@ -19,4 +21,21 @@ local function skip()
     end
 end
 
-mp.observe_property("time-pos", "number", skip)
\ No newline at end of file
+local function add_chapters()
+    if not options.chapters then return end
+
+    local chapters = {}
+    if options.op_start ~= options.op_end then
+        table.insert(chapters, { time = options.op_start, title = "Opening" })
+        table.insert(chapters, { time = options.op_end, title = "Episode" })
+    end
+    if options.ed_start ~= options.ed_end then
+        table.insert(chapters, { time = options.ed_start, title = "Ending" })
+    end
+    table.sort(chapters, function(a, b) return a.time < b.time end)
+
+    mp.set_property_native("chapter-list", chapters)
+end
+
+mp.observe_property("time-pos", "number", skip)
+mp.register_event("file-loaded", add_chapters)
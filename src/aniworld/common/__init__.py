@@ -1,4 +1,5 @@
 from .common import (
+    EpisodeHrefIndex as EpisodeHrefIndex,
     copy_file_if_different as copy_file_if_different,
     download_file as download_file,
     download_mpv as download_mpv,
@@ -11,4 +12,16 @@ from .common import (
     remove_mpv_scripts as remove_mpv_scripts,
     setup_autoexit as setup_autoexit,
     setup_autostart as setup_autostart,
+    setup_mpv_script as setup_mpv_script,
+)
+from .cache import (
+    DirectLinkCache as DirectLinkCache,
+    MetadataCache as MetadataCache,
+    get_direct_link_cache as get_direct_link_cache,
+    get_metadata_cache as get_metadata_cache,
+)
+from .provider_health import (
+    ProviderHealth as ProviderHealth,
+    get_provider_health as get_provider_health,
+    is_hoster_failure as is_hoster_failure,
 )
@@ -0,0 +1,488 @@
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+import requests
+
+from .. import config
+from ..config import (
+    DEFAULT_DIRECT_LINK_TTL,
+    DIRECT_LINK_TTLS,
+    DIRECT_LINK_VALIDATION_TIMEOUT,
+    METADATA_CACHE_MAX_ENTRIES,
+    METADATA_CACHE_NEGATIVE_TTL,
+    METADATA_CACHE_PATH,
+    METADATA_CACHE_TTLS,
+    MIN_DIRECT_LINK_TTL,
+    get_async_http_session,
+)
+
+# Evict least recently used entries after this many writes
+_EVICTION_INTERVAL = 100
+# Reads refresh the last access of an entry at most this often, in batches
+# written with the next write or once this many are pending
+_ACCESS_RESOLUTION = 60
+_ACCESS_FLUSH_BATCH = 100
+_DEFAULT_TTL = 60 * 60
+
+# Query parameters hosters use for the unix time a signed link expires at
+_EXPIRY_PARAMS = ("expires", "expire", "expiry", "exp", "e", "validto", "valid_to")
+# Seconds before a signed link's own expiry it is no longer reused
+_EXPIRY_MARGIN = 60
+# HEAD responses proving that a cached direct link no longer works
+_EXPIRED_STATUS_CODES = (401, 403, 404, 410)
+# Seconds a learned direct link TTL is kept
+_LEARNED_TTL_LIFETIME = 7 * 24 * 60 * 60
+# Factor a learned TTL grows by when links outlive half of it
+_LEARNED_TTL_GROWTH = 1.5
+
+
+class MetadataCache:
+    """
+    Persistent cache for scraped metadata like season counts and titles.
+
+    Values are stored as JSON in a SQLite file so the CLI and the web
+    interface share them across runs. Every kind of metadata has its own
+    TTL, failed lookups are only remembered for a few seconds, and the
+    least recently used entries are evicted above max_entries. Reads do not
+    write, their access times are batched into later writes.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_entries: int = METADATA_CACHE_MAX_ENTRIES,
+    ):
+        """
+        Initialize the metadata cache.
+
+        Args:
+            path: Path to the SQLite cache file (if None, uses METADATA_CACHE_PATH)
+            max_entries: Number of entries kept before evicting the least recently used
+        """
+        self.path = path or METADATA_CACHE_PATH
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._accessed: Dict[Tuple[str, str], float] = {}
+
+        try:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = self._connect(self.path)
+        except (OSError, sqlite3.Error) as err:
+            # Read-only home directories must not break scraping
+            logging.warning(
+                "Metadata cache unavailable at %s, using memory: %s", self.path, err
+            )
+            self._conn = self._connect(":memory:")
+
+    @staticmethod
+    def _connect(path: str) -> sqlite3.Connection:
+        """Open the cache database and create its table"""
+        conn = sqlite3.connect(path, check_same_thread=False, timeout=5)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS metadata_cache (
+                kind TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value TEXT NOT NULL,
+                expires_at REAL NOT NULL,
+                last_access REAL NOT NULL,
+                PRIMARY KEY (kind, key)
+            )
+        """)
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_metadata_cache_last_access
+            ON metadata_cache (last_access)
+        """)
+        conn.commit()
+        return conn
+
+    def get(self, kind: str, key: str, default: Any = None) -> Any:
+        """
+        Get a cached value.
+
+        Args:
+            kind: Kind of metadata (e.g. "seasons")
+            key: Cache key within the kind
+            default: Returned when the value is missing or expired
+
+        Returns:
+            Cached value or default
+        """
+        now = time.time()
+        try:
+            with self._lock, self._conn:
+                row = self._conn.execute(
+                    "SELECT value, expires_at, last_access FROM metadata_cache "
+                    "WHERE kind = ? AND key = ?",
+                    (kind, key),
+                ).fetchone()
+                if row is None:
+                    return default
+
+                value, expires_at, last_access = row
+                if expires_at <= now:
+                    self._conn.execute(
+                        "DELETE FROM metadata_cache WHERE kind = ? AND key = ?",
+                        (kind, key),
+                    )
+                    return default
+
+                if now - last_access >= _ACCESS_RESOLUTION:
+                    self._accessed[(kind, key)] = now
+                    if len(self._accessed) >= _ACCESS_FLUSH_BATCH:
+                        self._flush_accesses()
+                return json.loads(value)
+
+        except (sqlite3.Error, ValueError) as err:
+            logging.debug("Metadata cache lookup failed for %s/%s: %s", kind, key, err)
+            return default
+
+    def set(
+        self,
+        kind: str,
+        key: str,
+        value: Any,
+        negative: bool = False,
+        ttl: Optional[float] = None,
+    ) -> None:
+        """
+        Store a value.
+
+        Args:
+            kind: Kind of metadata (e.g. "seasons")
+            key: Cache key within the kind
+            value: JSON serializable value
+            negative: Value stands for a failed lookup and expires after
+                METADATA_CACHE_NEGATIVE_TTL seconds
+            ttl: Seconds until the value expires (defaults to the TTL of the kind)
+        """
+        if ttl is None:
+            ttl = (
+                METADATA_CACHE_NEGATIVE_TTL
+                if negative
+                else METADATA_CACHE_TTLS.get(kind, _DEFAULT_TTL)
+            )
+
+        now = time.time()
+        try:
+            with self._lock, self._conn:
+                self._flush_accesses()
+                self._conn.execute(
+                    """
+                    INSERT OR REPLACE INTO metadata_cache (kind, key, value, expires_at, last_access)
+                    VALUES (?, ?, ?, ?, ?)
+                """,
+                    (kind, key, json.dumps(value), now + ttl, now),
+                )
+
+                self._writes += 1
+                if self._writes >= _EVICTION_INTERVAL:
+                    self._writes = 0
+                    self._evict(now)
+
+        except (sqlite3.Error, TypeError, ValueError) as err:
+            logging.debug("Metadata cache write failed for %s/%s: %s", kind, key, err)
+
+    def _flush_accesses(self) -> None:
+        """Write the batched last access times, caller must hold _lock"""
+        if not self._accessed:
+            return
+        self._conn.executemany(
+            "UPDATE metadata_cache SET last_access = ? "
+            "WHERE kind = ? AND key = ? AND last_access < ?",
+            [
+                (accessed, kind, key, accessed)
+                for (kind, key), accessed in self._accessed.items()
+            ],
+        )
+        self._accessed.clear()
+
+    def _evict(self, now: float) -> None:
+        """Drop expired entries and the least recently used ones above the cap"""
+        self._conn.execute("DELETE FROM metadata_cache WHERE expires_at <= ?", (now,))
+        count = self._conn.execute("SELECT COUNT(*) FROM metadata_cache").fetchone()[0]
+        if count > self.max_entries:
+            self._conn.execute(
+                """
+                DELETE FROM metadata_cache WHERE rowid IN (
+                    SELECT rowid FROM metadata_cache
+                    ORDER BY last_access LIMIT ?
+                )
+            """,
+                (count - self.max_entries,),
+            )
+
+    def delete(self, kind: str, key: str) -> None:
+        """
+        Remove a cached value.
+
+        Args:
+            kind: Kind of metadata (e.g. "seasons")
+            key: Cache key within the kind
+        """
+        try:
+            with self._lock, self._conn:
+                self._conn.execute(
+                    "DELETE FROM metadata_cache WHERE kind = ? AND key = ?",
+                    (kind, key),
+                )
+        except sqlite3.Error as err:
+            logging.debug("Metadata cache delete failed for %s/%s: %s", kind, key, err)
+
+    def clear(self) -> None:
+        """Remove all cached values."""
+        try:
+            with self._lock, self._conn:
+                self._accessed.clear()
+                self._conn.execute("DELETE FROM metadata_cache")
+        except sqlite3.Error as err:
+            logging.debug("Failed to clear metadata cache: %s", err)
+
+
+_metadata_cache = None
+_metadata_cache_lock = threading.Lock()
+
+
+def get_metadata_cache() -> MetadataCache:
+    """Get or create the process wide metadata cache"""
+    global _metadata_cache
+    if _metadata_cache is None:
+        with _metadata_cache_lock:
+            if _metadata_cache is None:
+                _metadata_cache = MetadataCache()
+    return _metadata_cache
+
+
+class DirectLinkCache:
+    """
+    Cache of direct links resolved by the provider extractors.
+
+    Links are stored in the metadata cache, so the CLI, watch, syncplay
+    and the web download manager all reuse them. A link expires at the
+    time signed into its URL or after the TTL of its provider. Before
+    reuse it is validated with a HEAD request. Links that are rejected
+    earlier than expected shorten the TTL learned for their provider,
+    links that keep working let it grow back.
+    """
+
+    KIND = "direct_link"
+    TTL_KIND = "direct_link_ttl"
+
+    def __init__(self, cache: Optional[MetadataCache] = None):
+        """
+        Initialize the direct link cache.
+
+        Args:
+            cache: Metadata cache to store links in (if None, uses the shared one)
+        """
+        self._cache = cache
+
+    @property
+    def cache(self) -> MetadataCache:
+        return self._cache or get_metadata_cache()
+
+    @staticmethod
+    def _key(provider: str, embeded_link: str) -> str:
+        return f"{provider}|{embeded_link}"
+
+    def get_ttl(self, provider: str) -> float:
+        """Seconds a link of the provider is trusted without its own expiry"""
+        learned = self.cache.get(self.TTL_KIND, provider)
+        if learned is not None:
+            return learned
+        return DIRECT_LINK_TTLS.get(provider, DEFAULT_DIRECT_LINK_TTL)
+
+    @staticmethod
+    def parse_expiry(direct_link: str) -> Optional[float]:
+        """
+        Read the unix time a signed link expires at from its query string.
+
+        Args:
+            direct_link: Direct link returned by an extractor
+
+        Returns:
+            Expiry timestamp or None if the link carries no future expiry
+        """
+        now = time.time()
+        for name, value in parse_qsl(urlsplit(direct_link).query):
+            if name.lower() not in _EXPIRY_PARAMS or not value.isdigit():
+                continue
+            expires_at = int(value)
+            # Milliseconds
+            if expires_at > 10**12:
+                expires_at /= 1000
+            # Some hosters put the creation time under these names
+            if expires_at > now:
+                return expires_at
+        return None
+
+    def get(self, provider: str, embeded_link: str) -> Optional[str]:
+        """
+        Get a cached direct link that still answers.
+
+        Args:
+            provider: Provider name (e.g. "VOE")
+            embeded_link: Embedded link the direct link was extracted from
+
+        Returns:
+            Direct link or None if none is cached or it stopped working
+        """
+        entry = self.cache.get(self.KIND, self._key(provider, embeded_link))
+        if not entry:
+            return None
+
+        return self._validated(
+            provider, embeded_link, entry, self._is_alive(provider, entry["url"])
+        )
+
+    async def aget(self, provider: str, embeded_link: str) -> Optional[str]:
+        """Async counterpart of get, validating on the shared aiohttp session"""
+        entry = self.cache.get(self.KIND, self._key(provider, embeded_link))
+        if not entry:
+            return None
+
+        return self._validated(
+            provider, embeded_link, entry, await self._ais_alive(provider, entry["url"])
+        )
+
+    def _validated(
+        self,
+        provider: str,
+        embeded_link: str,
+        entry: Dict[str, Any],
+        alive: Optional[bool],
+    ) -> Optional[str]:
+        """
+        Handle the outcome of validating a cached link.
+
+        Args:
+            provider: Provider name (e.g. "VOE")
+            embeded_link: Embedded link the direct link was extracted from
+            entry: Cached entry of the direct link
+            alive: True if the link works, False if the hoster rejected it
+                as expired and None if the validation failed otherwise
+
+        Returns:
+            Direct link or None if it cannot be reused
+        """
+        age = time.time() - entry["created_at"]
+        if alive:
+            self._grow_ttl(provider, age)
+            return entry["url"]
+
+        # A link that could not be checked is not reused either, but only a
+        # rejected one says something about how long links of the provider live
+        self.cache.delete(self.KIND, self._key(provider, embeded_link))
+        if alive is False:
+            self._learn_ttl(provider, age)
+        return None
+
+    def set(self, provider: str, embeded_link: str, direct_link: str) -> None:
+        """
+        Store a freshly extracted direct link.
+
+        Args:
+            provider: Provider name (e.g. "VOE")
+            embeded_link: Embedded link the direct link was extracted from
+            direct_link: Direct link returned by the extractor
+        """
+        now = time.time()
+        expires_at = self.parse_expiry(direct_link)
+        if expires_at is not None:
+            ttl = expires_at - now - _EXPIRY_MARGIN
+        else:
+            ttl = self.get_ttl(provider)
+
+        if ttl <= 0:
+            return
+
+        self.cache.set(
+            self.KIND,
+            self._key(provider, embeded_link),
+            {"url": direct_link, "created_at": now},
+            ttl=ttl,
+        )
+
+    def _learn_ttl(self, provider: str, age: float) -> None:
+        """Shorten the provider TTL after a link was rejected at age seconds"""
+        ttl = max(MIN_DIRECT_LINK_TTL, age * 0.8)
+        if ttl < self.get_ttl(provider):
+            logging.info(
+                "Direct links of %s expire early, caching them for %d seconds",
+                provider,
+                ttl,
+            )
+            self.cache.set(self.TTL_KIND, provider, ttl, ttl=_LEARNED_TTL_LIFETIME)
+
+    def _grow_ttl(self, provider: str, age: float) -> None:
+        """Lengthen a learned TTL after a link still worked at age seconds"""
+        learned = self.cache.get(self.TTL_KIND, provider)
+        if learned is None or age < learned / 2:
+            return
+
+        configured = DIRECT_LINK_TTLS.get(provider, DEFAULT_DIRECT_LINK_TTL)
+        ttl = min(configured, max(age, learned * _LEARNED_TTL_GROWTH))
+        if ttl >= configured:
+            self.cache.delete(self.TTL_KIND, provider)
+        elif ttl > learned:
+            self.cache.set(self.TTL_KIND, provider, ttl, ttl=_LEARNED_TTL_LIFETIME)
+
+    @staticmethod
+    def _is_alive(provider: str, direct_link: str) -> Optional[bool]:
+        """
+        Validate a cached link with a HEAD request using the download headers.
+
+        The request does not go through the retrying shared session, a dead
+        link would otherwise delay the fresh extraction by several timeouts.
+
+        Returns:
+            True if the link works, False if the hoster rejects it and None
+            if the request failed
+        """
+        try:
+            response = requests.head(
+                direct_link,
+                headers=config.get_download_headers(provider),
+                timeout=DIRECT_LINK_VALIDATION_TIMEOUT,
+                allow_redirects=True,
+                verify=False,
+            )
+            return response.status_code not in _EXPIRED_STATUS_CODES
+        except requests.RequestException as err:
+            logging.debug("Cached direct link of %s failed validation: %s", provider, err)
+            return None
+
+    @staticmethod
+    async def _ais_alive(provider: str, direct_link: str) -> Optional[bool]:
+        """Async counterpart of _is_alive"""
+        import aiohttp
+
+        try:
+            async with get_async_http_session().head(
+                direct_link,
+                headers=config.get_download_headers(provider),
+                timeout=aiohttp.ClientTimeout(total=DIRECT_LINK_VALIDATION_TIMEOUT),
+                allow_redirects=True,
+                ssl=False,
+            ) as response:
+                return response.status not in _EXPIRED_STATUS_CODES
+        except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+            logging.debug("Cached direct link of %s failed validation: %s", provider, err)
+            return None
+
+
+_direct_link_cache = DirectLinkCache()
+
+
+def get_direct_link_cache() -> DirectLinkCache:
+    """Get the process wide direct link cache"""
+    return _direct_link_cache
@@ -1,3 +1,4 @@
+import filecmp
 import json
 import logging
 import platform
@@ -6,6 +7,8 @@ import subprocess
 import sys
 import os
 import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Optional, Set, Tuple
 
@@ -22,10 +25,11 @@ from ..config import (
     DEFAULT_APPDATA_PATH,
     MPV_PATH,
     SYNCPLAY_PATH,
+    SEASON_FETCH_CONCURRENCY,
+    VERSION,
+    get_http_session,
 )
-
-# Global cache for season/movie counts to avoid duplicate requests
-_ANIME_DATA_CACHE = {}
+from .cache import get_metadata_cache
 
 
 # Constants
@@ -40,13 +44,19 @@ PACKAGE_MANAGERS = {
     "nix-env": "nix-env -iA nixpkgs.{}",
 }
 
+# href="…/<slug>/staffel-<season>/episode-<episode>" or "…/<slug>/filme/film-<film>"
+EPISODE_HREF_PATTERN = re.compile(
+    r"""href\s*=\s*["'][^"']*?/([^/"']+)/"""
+    r"(?:staffel-(\d+)/episode-(\d+)|filme/film-(\d+))"
+)
+
 
 def _make_request(
     url: str, timeout: int = DEFAULT_REQUEST_TIMEOUT
 ) -> requests.Response:
     """Make HTTP request with error handling."""
     try:
-        response = requests.get(url, timeout=timeout)
+        response = get_http_session().get(url, timeout=timeout)
         response.raise_for_status()
         return response
     except requests.RequestException as err:
@@ -168,7 +178,7 @@ def download_file(url: str, path: str) -> bool:
         True if download successful
     """
     try:
-        response = requests.get(
+        response = get_http_session().get(
             url, stream=True, allow_redirects=True, timeout=DEFAULT_REQUEST_TIMEOUT
         )
         response.raise_for_status()
@@ -459,15 +469,59 @@ def download_syncplay(
     return True
 
 
-def _parse_season_episodes(soup: BeautifulSoup, season: int) -> int:
-    """Parse episode count for a specific season."""
-    episode_links = soup.find_all("a", href=True)
-    unique_links = set(
-        link["href"]
-        for link in episode_links
-        if f"staffel-{season}/episode-" in link["href"]
-    )
-    return len(unique_links)
+class EpisodeHrefIndex:
+    """
+    Episodes and films linked from a page, collected in a single pass.
+
+    Every href of the page is matched once against EPISODE_HREF_PATTERN
+    instead of scanning all anchors again for every season or film.
+    """
+
+    __slots__ = ("episodes", "films")
+
+    def __init__(self, html: str, slug: Optional[str] = None):
+        """
+        Index the episode and film links of a page.
+
+        Args:
+            html: HTML content of the page
+            slug: Only index links of this anime, all anime if None
+        """
+        self.episodes: Dict[int, Set[int]] = {}
+        self.films: Set[int] = set()
+
+        for match in EPISODE_HREF_PATTERN.finditer(html):
+            link_slug, season, episode, film = match.groups()
+            if slug is not None and link_slug != slug:
+                continue
+            if film is not None:
+                self.films.add(int(film))
+            else:
+                self.episodes.setdefault(int(season), set()).add(int(episode))
+
+    def episode_count(self, season: int) -> int:
+        """Number of different episodes linked for a season."""
+        return len(self.episodes.get(season, ()))
+
+    def movie_count(self) -> int:
+        """Number of films linked without a gap, starting at film-1."""
+        count = 0
+        while count + 1 in self.films:
+            count += 1
+        return count
+
+
+def _fetch_season_episode_count(
+    base_url: str, season: int, slug: Optional[str] = None
+) -> Optional[int]:
+    """Fetch a single season page and count its episodes, None on failure."""
+    season_url = f"{base_url}staffel-{season}"
+    try:
+        season_response = _make_request(season_url)
+        return EpisodeHrefIndex(season_response.text, slug).episode_count(season)
+    except Exception as err:
+        logging.warning("Failed to get episodes for season %d: %s", season, err)
+        return None
 
 
 def get_season_episode_count(slug: str, link: str = ANIWORLD_TO) -> Dict[int, int]:
@@ -481,41 +535,52 @@ def get_season_episode_count(slug: str, link: str = ANIWORLD_TO) -> Dict[int, in
     Returns:
         Dictionary mapping season numbers to episode counts
     """
-    # Check cache first
-    cache_key = f"seasons_{slug}"
-    if cache_key in _ANIME_DATA_CACHE:
-        return _ANIME_DATA_CACHE[cache_key]
+    if S_TO not in link:
+        base_url = f"{ANIWORLD_TO}/anime/stream/{slug}/"
+    else:
+        base_url = f"{S_TO}/serie/stream/{slug}/"
+
+    # Check cache first, JSON turns the season numbers into strings
+    cache = get_metadata_cache()
+    cached = cache.get("seasons", base_url)
+    if cached is not None:
+        return {int(season): count for season, count in cached.items()}
 
     try:
-        if S_TO not in link:
-            base_url = f"{ANIWORLD_TO}/anime/stream/{slug}/"
-        else:
-            base_url = f"{S_TO}/serie/stream/{slug}/"
         response = _make_request(base_url)
         soup = BeautifulSoup(response.content, "html.parser")
 
         season_meta = soup.find("meta", itemprop="numberOfSeasons")
         number_of_seasons = int(season_meta["content"]) if season_meta else 0
 
+        # Season pages are independent, fetch and parse them concurrently
+        seasons = range(1, number_of_seasons + 1)
         episode_counts = {}
-        for season in range(1, number_of_seasons + 1):
-            season_url = f"{base_url}staffel-{season}"
-            try:
-                season_response = _make_request(season_url)
-                season_soup = BeautifulSoup(season_response.content, "html.parser")
-                episode_counts[season] = _parse_season_episodes(season_soup, season)
-            except Exception as err:
-                logging.warning("Failed to get episodes for season %d: %s", season, err)
-                episode_counts[season] = 0
-
-        # Cache the result
-        _ANIME_DATA_CACHE[cache_key] = episode_counts
+        if seasons:
+            with ThreadPoolExecutor(
+                max_workers=min(SEASON_FETCH_CONCURRENCY, len(seasons))
+            ) as executor:
+                counts = executor.map(
+                    lambda season: _fetch_season_episode_count(
+                        base_url, season, slug
+                    ),
+                    seasons,
+                )
+                episode_counts = dict(zip(seasons, counts))
+
+        # A season that failed to load is retried soon instead of being
+        # cached as empty for hours
+        incomplete = any(count is None for count in episode_counts.values())
+        episode_counts = {
+            season: count or 0 for season, count in episode_counts.items()
+        }
+        cache.set("seasons", base_url, episode_counts, negative=incomplete)
         return episode_counts
 
     except Exception as err:
         logging.error("Failed to get season episode count for %s: %s", slug, err)
-        # Cache empty result to avoid repeated failures
-        _ANIME_DATA_CACHE[cache_key] = {}
+        # Remember the failure briefly to avoid hammering the site
+        cache.set("seasons", base_url, {}, negative=True)
         return {}
 
 
@@ -530,41 +595,24 @@ def get_movie_episode_count(slug: str) -> int:
         Number of movies available
     """
     # Check cache first
-    cache_key = f"movies_{slug}"
-    if cache_key in _ANIME_DATA_CACHE:
-        return _ANIME_DATA_CACHE[cache_key]
+    cache = get_metadata_cache()
+    cached = cache.get("movies", slug)
+    if cached is not None:
+        return cached
 
     try:
         movie_page_url = f"{ANIWORLD_TO}/anime/stream/{slug}/filme"
         response = _make_request(movie_page_url)
-        soup = BeautifulSoup(response.content, "html.parser")
-
-        movie_indices = []
-        movie_index = 1
 
-        while True:
-            expected_subpath = f"{slug}/filme/film-{movie_index}"
-            matching_links = [
-                link["href"]
-                for link in soup.find_all("a", href=True)
-                if expected_subpath in link["href"]
-            ]
-
-            if matching_links:
-                movie_indices.append(movie_index)
-                movie_index += 1
-            else:
-                break
-
-        result = max(movie_indices) if movie_indices else 0
+        result = EpisodeHrefIndex(response.text, slug).movie_count()
         # Cache the result
-        _ANIME_DATA_CACHE[cache_key] = result
+        cache.set("movies", slug, result)
         return result
 
     except Exception as err:
         logging.error("Failed to get movie count for %s: %s", slug, err)
-        # Cache failure result
-        _ANIME_DATA_CACHE[cache_key] = 0
+        # Remember the failure briefly to avoid hammering the site
+        cache.set("movies", slug, 0, negative=True)
         return 0
 
 
@@ -745,6 +793,9 @@ def remove_mpv_scripts() -> None:
             logging.info("Removing script: %s", script_path)
             _remove_file_safe(script_path)
 
+        _installed_scripts.discard(script)
+        get_metadata_cache().delete("mpv_scripts", script_path)
+
 
 def copy_file_if_different(source_path: str, destination_path: str) -> bool:
     """
@@ -790,35 +841,91 @@ def copy_file_if_different(source_path: str, destination_path: str) -> bool:
         return False
 
 
-def _setup_script(script_name: str) -> bool:
-    """Setup MPV script by copying from source to destination."""
+# MPV scripts verified by this process, set up again only after removal
+_installed_scripts: Set[str] = set()
+_installed_scripts_lock = threading.Lock()
+
+
+def _get_script_stamp(source_path: Path, destination_path: Path) -> Optional[str]:
+    """Identify a script release and its installed copy by version, size and mtime"""
     try:
-        script_directory = Path(__file__).parent.parent
-        mpv_scripts_directory = Path(MPV_SCRIPTS_DIRECTORY)
+        source = source_path.stat()
+        destination = destination_path.stat()
+    except OSError:
+        return None
+
+    # A copy of another size is not the shipped script
+    if source.st_size != destination.st_size:
+        return None
+    return (
+        f"{VERSION}:{source.st_size}:{source.st_mtime_ns}:"
+        f"{destination.st_size}:{destination.st_mtime_ns}"
+    )
 
-        # Ensure scripts directory exists
-        mpv_scripts_directory.mkdir(parents=True, exist_ok=True)
 
-        source_path = script_directory / "aniskip" / "scripts" / script_name
-        destination_path = mpv_scripts_directory / script_name
+def setup_mpv_script(script_name: str) -> bool:
+    """
+    Install an MPV script shipped in aniskip/scripts.
 
-        return copy_file_if_different(str(source_path), str(destination_path))
+    A script is verified once per process. The stamp of the verified copy is
+    kept in the metadata cache, so later runs skip comparing the files as
+    long as neither the release nor the installed copy changed.
 
-    except Exception as err:
-        logging.error("Failed to setup %s: %s", script_name, err)
-        return False
+    Args:
+        script_name: File name of the script, e.g. "aniskip.lua"
+
+    Returns:
+        True if the script is installed
+    """
+    if script_name in _installed_scripts:
+        return True
+
+    with _installed_scripts_lock:
+        if script_name in _installed_scripts:
+            return True
+
+        try:
+            script_directory = Path(__file__).parent.parent
+            mpv_scripts_directory = Path(MPV_SCRIPTS_DIRECTORY)
+
+            source_path = script_directory / "aniskip" / "scripts" / script_name
+            destination_path = mpv_scripts_directory / script_name
+
+            cache = get_metadata_cache()
+            cache_key = str(destination_path)
+            stamp = _get_script_stamp(source_path, destination_path)
+            if stamp is None or cache.get("mpv_scripts", cache_key) != stamp:
+                # Ensure scripts directory exists
+                mpv_scripts_directory.mkdir(parents=True, exist_ok=True)
+                copy_file_if_different(str(source_path), str(destination_path))
+
+                # The copy returns False for identical files and failures alike,
+                # a stale copy must not be stamped as verified
+                if not filecmp.cmp(source_path, destination_path, shallow=False):
+                    logging.error("Failed to install %s", script_name)
+                    return False
+
+                stamp = _get_script_stamp(source_path, destination_path)
+                if stamp is None:
+                    return False
+                cache.set("mpv_scripts", cache_key, stamp)
+
+            _installed_scripts.add(script_name)
+            return True
+
+        except Exception as err:
+            logging.error("Failed to setup %s: %s", script_name, err)
+            return False
 
 
 def setup_autostart() -> bool:
     """Setup autostart script for MPV."""
-    logging.debug("Setting up autostart script")
-    return _setup_script("autostart.lua")
+    return setup_mpv_script("autostart.lua")
 
 
 def setup_autoexit() -> bool:
     """Setup autoexit script for MPV."""
-    logging.debug("Setting up autoexit script")
-    return _setup_script("autoexit.lua")
+    return setup_mpv_script("autoexit.lua")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,241 @@
+import asyncio
+import logging
+import sys
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import requests
+
+from ..config import (
+    HTTP_RETRY_STATUS_CODES,
+    PROVIDER_COOLDOWN,
+    PROVIDER_FAILURE_THRESHOLD,
+    PROVIDER_HEALTH_SMOOTHING,
+    SUPPORTED_PROVIDERS,
+)
+from .cache import MetadataCache, get_metadata_cache
+
+
+def _new_stats() -> Dict[str, Any]:
+    return {
+        "successes": 0,
+        "failures": 0,
+        "consecutive_failures": 0,
+        "error_rate": 0.0,
+        "latency": None,
+        "bytes_per_second": None,
+        "open_until": 0.0,
+        "last_error": None,
+        "updated_at": None,
+    }
+
+
+def _smooth(average: Optional[float], value: float) -> float:
+    """Exponential moving average, starting at the first value"""
+    if average is None:
+        return value
+    return average + PROVIDER_HEALTH_SMOOTHING * (value - average)
+
+
+def is_hoster_failure(error: BaseException) -> bool:
+    """
+    Check whether an error means that a hoster is down or overloaded.
+
+    Only network errors and 429/5xx responses count. Parse errors, empty
+    results and missing extractors are our own problem and must not open
+    the circuit of a healthy hoster. Extractors wrap request errors in
+    ValueError, so the explicit causes of an error are followed too.
+
+    Args:
+        error: Error an extraction failed with
+
+    Returns:
+        True if the failure should count against the hoster's health
+    """
+    # aiohttp errors can only occur once the async extractors loaded it
+    aiohttp = sys.modules.get("aiohttp")
+
+    while error is not None:
+        if isinstance(error, requests.HTTPError):
+            response = error.response
+            return (
+                response is not None
+                and response.status_code in HTTP_RETRY_STATUS_CODES
+            )
+        if aiohttp is not None and isinstance(error, aiohttp.ClientResponseError):
+            return error.status in HTTP_RETRY_STATUS_CODES
+        if isinstance(
+            error,
+            (requests.RequestException, asyncio.TimeoutError, TimeoutError, ConnectionError),
+        ):
+            return True
+        if aiohttp is not None and isinstance(error, aiohttp.ClientError):
+            return True
+        error = error.__cause__
+    return False
+
+
+class ProviderHealth:
+    """
+    Health registry of the streaming providers with a circuit breaker.
+
+    Extractor calls, throughput probes and downloads report their outcome
+    here. After PROVIDER_FAILURE_THRESHOLD consecutive failures a provider
+    is skipped for PROVIDER_COOLDOWN seconds. The next failure after the
+    cool-down skips it again right away, a success closes the circuit.
+    Scores are kept in the metadata cache, so the CLI shows the ones
+    recorded by the web interface and earlier runs.
+    """
+
+    KIND = "provider_health"
+
+    def __init__(self, cache: Optional[MetadataCache] = None):
+        """
+        Initialize the provider health registry.
+
+        Args:
+            cache: Metadata cache to keep scores in (if None, uses the shared one)
+        """
+        self._cache = cache
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, Any]] = {}
+
+    @property
+    def cache(self) -> MetadataCache:
+        return self._cache or get_metadata_cache()
+
+    def _get_stats(self, provider: str) -> Dict[str, Any]:
+        """
+        Get the current stats of a provider, caller must hold _lock.
+
+        The stats are read from the metadata cache every time, so outcomes
+        recorded by other processes (e.g. the web interface while a CLI run
+        is going on) are not overwritten by an outdated copy.
+        """
+        stats = self.cache.get(self.KIND, provider)
+        if stats is None:
+            # Kept in memory too in case the cache is unavailable
+            stats = self._stats.get(provider) or _new_stats()
+        self._stats[provider] = stats
+        return stats
+
+    def is_available(self, provider: str) -> bool:
+        """
+        Check whether a provider is worth trying.
+
+        Args:
+            provider: Provider name (e.g. "VOE")
+
+        Returns:
+            False while the circuit of the provider is open
+        """
+        with self._lock:
+            return self._get_stats(provider)["open_until"] <= time.time()
+
+    def allow_retry(self, provider: str) -> None:
+        """
+        Let one more attempt through the open circuit of a provider.
+
+        Used when every provider is skipped. The circuit is half-open
+        afterwards: a success closes it, the next failure opens it again.
+
+        Args:
+            provider: Provider name (e.g. "VOE")
+        """
+        with self._lock:
+            stats = self._get_stats(provider)
+            if stats["open_until"] > time.time():
+                logging.info("Every provider is failing, retrying '%s'", provider)
+                stats["open_until"] = 0.0
+                self._save(provider, stats)
+
+    def record_success(
+        self,
+        provider: str,
+        latency: Optional[float] = None,
+        bytes_per_second: Optional[float] = None,
+    ) -> None:
+        """
+        Record a successful extraction, probe or download.
+
+        Args:
+            provider: Provider name (e.g. "VOE")
+            latency: Seconds the request took
+            bytes_per_second: Measured throughput
+        """
+        with self._lock:
+            stats = self._get_stats(provider)
+            stats["successes"] += 1
+            stats["consecutive_failures"] = 0
+            stats["open_until"] = 0.0
+            stats["error_rate"] = _smooth(stats["error_rate"], 0.0)
+            if latency is not None:
+                stats["latency"] = _smooth(stats["latency"], latency)
+            if bytes_per_second is not None:
+                stats["bytes_per_second"] = _smooth(
+                    stats["bytes_per_second"], bytes_per_second
+                )
+            self._save(provider, stats)
+
+    def record_failure(self, provider: str, error: Optional[Exception] = None) -> None:
+        """
+        Record a failed extraction, probe or download.
+
+        Args:
+            provider: Provider name (e.g. "VOE")
+            error: Error the provider failed with
+        """
+        with self._lock:
+            stats = self._get_stats(provider)
+            stats["failures"] += 1
+            stats["consecutive_failures"] += 1
+            stats["error_rate"] = _smooth(stats["error_rate"], 1.0)
+            if error is not None:
+                stats["last_error"] = str(error)[:200]
+
+            if stats["consecutive_failures"] >= PROVIDER_FAILURE_THRESHOLD:
+                if stats["open_until"] <= time.time():
+                    logging.warning(
+                        "Provider '%s' failed %d times in a row, skipping it for %d seconds",
+                        provider,
+                        stats["consecutive_failures"],
+                        PROVIDER_COOLDOWN,
+                    )
+                stats["open_until"] = time.time() + PROVIDER_COOLDOWN
+            self._save(provider, stats)
+
+    def _save(self, provider: str, stats: Dict[str, Any]) -> None:
+        stats["updated_at"] = time.time()
+        self.cache.set(self.KIND, provider, stats)
+
+    def get_scores(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the health of every provider with recorded outcomes.
+
+        Returns:
+            Dictionary mapping provider names to their stats, a score from
+            0 to 100 and whether they are currently tried
+        """
+        now = time.time()
+        scores = {}
+        with self._lock:
+            for provider in SUPPORTED_PROVIDERS:
+                stats = self._get_stats(provider)
+                if not stats["successes"] and not stats["failures"]:
+                    continue
+                scores[provider] = {
+                    **stats,
+                    "score": round(100 * (1 - stats["error_rate"])),
+                    "available": stats["open_until"] <= now,
+                    "cooldown_remaining": max(0, round(stats["open_until"] - now)),
+                }
+        return scores
+
+
+_provider_health = ProviderHealth()
+
+
+def get_provider_health() -> ProviderHealth:
+    """Get the process wide provider health registry"""
+    return _provider_health
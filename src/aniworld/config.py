@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import os
 import os
@@ -5,13 +6,17 @@ import pathlib
 import platform
 import shutil
 import tempfile
+import threading
+import weakref
 from functools import lru_cache
 from importlib.metadata import PackageNotFoundError, version
+from typing import Dict
 from packaging.version import Version, InvalidVersion
 from urllib3.exceptions import InsecureRequestWarning
 import urllib3
 import requests
-from fake_useragent import UserAgent
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 
 #########################################################################################
@@ -94,6 +99,124 @@ urllib3.disable_warnings(InsecureRequestWarning)
 
 DEFAULT_REQUEST_TIMEOUT = 30
 
+
+def _get_int_env(name: str, default: int) -> int:
+    """Read a positive integer from the environment, falling back to default"""
+    try:
+        return max(1, int(os.getenv(name, default)))
+    except (TypeError, ValueError):
+        logging.warning("Invalid value for %s, using %d", name, default)
+        return default
+
+
+#########################################################################################
+# Shared HTTP Session
+#########################################################################################
+
+# Number of hosts with a pool of kept-alive connections
+HTTP_POOL_CONNECTIONS = 16
+# Kept-alive connections per host
+HTTP_POOL_MAXSIZE = _get_int_env("ANIWORLD_HTTP_POOL_MAXSIZE", 10)
+HTTP_MAX_RETRIES = _get_int_env("ANIWORLD_HTTP_MAX_RETRIES", 3)
+HTTP_RETRY_BACKOFF_FACTOR = 0.5
+HTTP_RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+MAX_REDIRECT_HOPS = 10
+# Season pages of a series fetched at once
+SEASON_FETCH_CONCURRENCY = _get_int_env("ANIWORLD_SEASON_FETCH_CONCURRENCY", 8)
+# Connections of the async HTTP session across all hosts
+ASYNC_HTTP_CONNECTION_LIMIT = _get_int_env("ANIWORLD_ASYNC_HTTP_CONNECTION_LIMIT", 100)
+# Episodes whose direct links are resolved at once by the async extractors
+ASYNC_RESOLVE_CONCURRENCY = _get_int_env("ANIWORLD_ASYNC_RESOLVE_CONCURRENCY", 32)
+
+_http_session = None
+_http_session_lock = threading.Lock()
+
+
+def _create_http_session() -> requests.Session:
+    """
+    Create a session with kept-alive per-host pools and retries.
+
+    Only failed connections and 429/5xx responses are retried. A read timeout
+    is not, a hoster that stops answering would otherwise block a request for
+    several timeouts in a row instead of failing over to the provider health
+    tracking.
+    """
+    retry = Retry(
+        total=HTTP_MAX_RETRIES,
+        connect=HTTP_MAX_RETRIES,
+        read=False,
+        status=HTTP_MAX_RETRIES,
+        backoff_factor=HTTP_RETRY_BACKOFF_FACTOR,
+        status_forcelist=HTTP_RETRY_STATUS_CODES,
+        allowed_methods=frozenset(["GET", "HEAD"]),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=HTTP_POOL_CONNECTIONS,
+        pool_maxsize=HTTP_POOL_MAXSIZE,
+        max_retries=retry,
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_http_session() -> requests.Session:
+    """
+    Get the process wide HTTP session shared by all scrapers and extractors.
+
+    Reusing the session keeps TCP/TLS connections to aniworld.to, s.to and
+    the hosters alive between requests. It is safe to use from several
+    threads as long as callers pass per-request headers instead of changing
+    the session itself.
+    """
+    global _http_session
+    if _http_session is None:
+        with _http_session_lock:
+            if _http_session is None:
+                _http_session = _create_http_session()
+    return _http_session
+
+
+# aiohttp sessions are bound to the event loop they were created in
+_async_http_sessions = weakref.WeakKeyDictionary()
+
+
+def get_async_http_session():
+    """
+    Get the aiohttp session of the running event loop shared by the async
+    extractors.
+
+    Like get_http_session, it keeps connections to the hosters alive and
+    callers pass per-request headers. Close it with close_async_http_session
+    before the event loop ends.
+
+    Returns:
+        aiohttp.ClientSession bound to the running event loop
+    """
+    import aiohttp
+
+    loop = asyncio.get_running_loop()
+    session = _async_http_sessions.get(loop)
+    if session is None or session.closed:
+        session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=ASYNC_HTTP_CONNECTION_LIMIT, limit_per_host=HTTP_POOL_MAXSIZE
+            ),
+            timeout=aiohttp.ClientTimeout(total=DEFAULT_REQUEST_TIMEOUT),
+        )
+        _async_http_sessions[loop] = session
+    return session
+
+
+async def close_async_http_session() -> None:
+    """Close the aiohttp session of the running event loop"""
+    session = _async_http_sessions.pop(asyncio.get_running_loop(), None)
+    if session is not None and not session.closed:
+        await session.close()
+
+
 try:
     VERSION = version("aniworld")
 except PackageNotFoundError:
@@ -105,7 +228,7 @@ def get_latest_github_version():
     """Get latest GitHub version with caching to avoid repeated API calls"""
     try:
         url = "https://api.github.com/repos/phoenixthrush/AniWorld-Downloader/releases/latest"
-        response = requests.get(url, timeout=DEFAULT_REQUEST_TIMEOUT)
+        response = get_http_session().get(url, timeout=DEFAULT_REQUEST_TIMEOUT)
         return (
             response.json().get("tag_name", "") if response.status_code == 200 else ""
         )
@@ -145,11 +268,19 @@ def is_newest_version():
     return None, False
 
 
-try:
-    LATEST_VERSION, IS_NEWEST_VERSION = is_newest_version()
-except (TypeError, ValueError):  # GitHub API Rate Limit (60/h) #52 or other errors
-    LATEST_VERSION = None
-    IS_NEWEST_VERSION = True
+@lru_cache(maxsize=1)
+def get_version_status():
+    """
+    Check for a newer release once, on first access of LATEST_VERSION or
+    IS_NEWEST_VERSION instead of on every import.
+
+    Returns:
+        tuple: The latest version (or None) and whether this one is the newest
+    """
+    try:
+        return is_newest_version()
+    except (TypeError, ValueError):  # GitHub API Rate Limit (60/h) #52 or other errors
+        return None, True
 
 PLATFORM_SYSTEM = platform.system()
 
@@ -175,13 +306,11 @@ SUPPORTED_PROVIDERS = (
 @lru_cache(maxsize=1)
 def get_random_user_agent():
     """Get random user agent with caching to avoid repeated UserAgent() calls"""
+    from fake_useragent import UserAgent
+
     ua = UserAgent(os=["Windows", "Mac OS X"])
     return ua.random
 
-
-# Backward compatibility - keep RANDOM_USER_AGENT as a constant
-RANDOM_USER_AGENT = get_random_user_agent()
-
 LULUVDO_USER_AGENT = (
     "Mozilla/5.0 (Android 15; Mobile; rv:132.0) Gecko/132.0 Firefox/132.0"
 )
@@ -193,10 +322,10 @@ def _get_provider_headers_d():
     return {
         "Vidmoly": ['Referer: "https://vidmoly.net"'],
         "Doodstream": ['Referer: "https://dood.li/"'],
-        "VOE": [f"User-Agent: {RANDOM_USER_AGENT}"],
+        "VOE": [f"User-Agent: {get_random_user_agent()}"],
         "LoadX": ["Accept: */*"],
         "Filemoon": [
-            f"User-Agent: {RANDOM_USER_AGENT}",
+            f"User-Agent: {get_random_user_agent()}",
             'Referer: "https://filemoon.to"',
         ],
         "Luluvdo": [
@@ -212,10 +341,10 @@ def _get_provider_headers_w():
     return {
         "Vidmoly": ['Referer: "https://vidmoly.net"'],
         "Doodstream": ['Referer: "https://dood.li/"'],
-        "VOE": [f"User-Agent: {RANDOM_USER_AGENT}"],
+        "VOE": [f"User-Agent: {get_random_user_agent()}"],
         "Luluvdo": [f"User-Agent: {LULUVDO_USER_AGENT}"],
         "Filemoon": [
-            f"User-Agent: {RANDOM_USER_AGENT}",
+            f"User-Agent: {get_random_user_agent()}",
             'Referer: "https://filemoon.to"',
         ],
     }
@@ -234,10 +363,47 @@ def get_provider_headers_w():
     return _get_provider_headers_w()
 
 
-# For backward compatibility, keep these as module-level variables
-# but they will be lazily evaluated when accessed
-PROVIDER_HEADERS_D = get_provider_headers_d()
-PROVIDER_HEADERS_W = get_provider_headers_w()
+# RANDOM_USER_AGENT, PROVIDER_HEADERS_D and PROVIDER_HEADERS_W are module
+# attributes built on first access, fake_useragent is slow to load. Read them
+# as config.RANDOM_USER_AGENT at call time to keep startup fast.
+_LAZY_ATTRIBUTES = {
+    "RANDOM_USER_AGENT": get_random_user_agent,
+    "PROVIDER_HEADERS_D": get_provider_headers_d,
+    "PROVIDER_HEADERS_W": get_provider_headers_w,
+    "LATEST_VERSION": lambda: get_version_status()[0],
+    "IS_NEWEST_VERSION": lambda: get_version_status()[1],
+}
+_lazy_attributes_lock = threading.Lock()
+
+
+def __getattr__(name):
+    factory = _LAZY_ATTRIBUTES.get(name)
+    if factory is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    with _lazy_attributes_lock:
+        # VOE adds its referer to the headers, so they are built only once
+        if name not in globals():
+            globals()[name] = factory()
+    return globals()[name]
+
+
+def get_download_headers(provider: str) -> Dict[str, str]:
+    """
+    Parse the "Key: Value" download headers of a provider into a dictionary.
+
+    Args:
+        provider: Provider name as used in PROVIDER_HEADERS_D
+
+    Returns:
+        Header values by name, empty for providers without headers
+    """
+    headers = {}
+    for header in __getattr__("PROVIDER_HEADERS_D").get(provider, []):
+        if ":" in header:
+            key, value = header.split(":", 1)
+            headers[key.strip()] = value.strip()
+    return headers
 
 
 USES_DEFAULT_PROVIDER = False
@@ -257,6 +423,45 @@ DEFAULT_PROVIDER_DOWNLOAD = "VOE"
 DEFAULT_PROVIDER_WATCH = "Filemoon"
 DEFAULT_TERMINAL_SIZE = (90, 30)
 
+
+# Web download queue concurrency
+DEFAULT_MAX_CONCURRENT_DOWNLOADS = _get_int_env("ANIWORLD_MAX_CONCURRENT_DOWNLOADS", 2)
+DEFAULT_MAX_CONCURRENT_EPISODES = _get_int_env("ANIWORLD_MAX_CONCURRENT_EPISODES", 1)
+# Episodes whose direct links are resolved ahead of the running download
+DEFAULT_PREFETCH_EPISODES = _get_int_env("ANIWORLD_PREFETCH_EPISODES", 3)
+# Simultaneous episode downloads allowed per provider across all jobs
+DEFAULT_PROVIDER_CONCURRENCY = 2
+PROVIDER_CONCURRENCY_LIMITS = {
+    "VOE": 2,
+    "Filemoon": 2,
+    "Vidmoly": 2,
+    "Doodstream": 1,
+    "LoadX": 1,
+    "Luluvdo": 1,
+}
+# Resolve all providers of an episode and download from the fastest one
+DEFAULT_RACE_PROVIDERS = os.getenv("ANIWORLD_RACE_PROVIDERS", "").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+# Providers resolved at once while racing
+PROVIDER_RACE_CONCURRENCY = _get_int_env("ANIWORLD_PROVIDER_RACE_CONCURRENCY", 4)
+# Bytes fetched from every direct link to measure its throughput
+PROVIDER_PROBE_BYTES = 256 * 1024
+PROVIDER_PROBE_TIMEOUT = 10
+# HLS playlists followed to the first segment while probing (master and media)
+PROVIDER_PROBE_MAX_PLAYLISTS = 2
+# Priorities of queued downloads, higher ones start first. Only admins may
+# queue above the default, so a user cannot starve the downloads of others.
+DEFAULT_DOWNLOAD_PRIORITY = 0
+DOWNLOAD_PRIORITY_MIN = -10
+DOWNLOAD_PRIORITY_MAX = 10
+# Seconds between batched writes of download queue progress to the database
+DOWNLOAD_QUEUE_FLUSH_INTERVAL = 2
+# Finished downloads kept in the database
+DOWNLOAD_QUEUE_HISTORY_LIMIT = 100
+
 # https://learn.microsoft.com/en-us/windows/win32/fileio/naming-a-file
 INVALID_PATH_CHARS = ("<", ">", ":", '"', "/", "\\", "|", "?", "*", "&")
 
@@ -277,6 +482,75 @@ MPV_DIRECTORY = (
 
 MPV_SCRIPTS_DIRECTORY = os.path.join(MPV_DIRECTORY, "scripts")
 
+#########################################################################################
+# Metadata Cache
+#########################################################################################
+
+if os.name == "nt":
+    _DEFAULT_CACHE_DIRECTORY = os.path.join(
+        os.getenv("LOCALAPPDATA") or DEFAULT_APPDATA_PATH, "aniworld"
+    )
+else:
+    _DEFAULT_CACHE_DIRECTORY = os.path.join(
+        os.getenv("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "aniworld"
+    )
+
+# Shared by the CLI and the web interface
+METADATA_CACHE_PATH = os.getenv(
+    "ANIWORLD_METADATA_CACHE",
+    os.path.join(_DEFAULT_CACHE_DIRECTORY, "metadata_cache.db"),
+)
+METADATA_CACHE_MAX_ENTRIES = _get_int_env("ANIWORLD_METADATA_CACHE_MAX_ENTRIES", 5000)
+# Seconds a cached value stays valid, per kind of metadata
+METADATA_CACHE_TTLS = {
+    "seasons": 6 * 60 * 60,
+    "movies": 6 * 60 * 60,
+    "title": 7 * 24 * 60 * 60,
+    "providers": 60 * 60,
+    # aniworld.to/s.to /redirect/ links -> hoster embed URL
+    "redirect": 6 * 60 * 60,
+    # Provider health scores shared by the CLI and the web interface
+    "provider_health": 7 * 24 * 60 * 60,
+    # title + season -> MyAnimeList ID, MyAnimeList ID -> episode count
+    "mal_id": 30 * 24 * 60 * 60,
+    "mal_episodes": 24 * 60 * 60,
+    # MyAnimeList ID + episode -> AniSkip opening and ending times
+    "skip_times": 7 * 24 * 60 * 60,
+    # Installed MPV scripts, verified again once this expires
+    "mpv_scripts": 30 * 24 * 60 * 60,
+}
+# Seconds a failed lookup is remembered before it is retried
+METADATA_CACHE_NEGATIVE_TTL = 30
+# Pass skip times to aniskip.lua only instead of also writing chapters files
+DEFAULT_ANISKIP_SCRIPT_OPTS = os.getenv(
+    "ANIWORLD_ANISKIP_SCRIPT_OPTS", ""
+).lower() in ("1", "true", "yes")
+# Seconds an episode without AniSkip times is not asked for again
+ANISKIP_MISSING_TTL = 6 * 60 * 60
+# AniSkip requests sent at once when prefetching the skip times of a season
+ANISKIP_PREFETCH_CONCURRENCY = _get_int_env("ANIWORLD_ANISKIP_PREFETCH_CONCURRENCY", 4)
+
+# Seconds a resolved direct link is reused unless the link carries its own
+# expiry, shortened automatically when links of a provider expire earlier
+DEFAULT_DIRECT_LINK_TTL = 30 * 60
+DIRECT_LINK_TTLS = {
+    "VOE": 60 * 60,
+    "Filemoon": 60 * 60,
+    "Vidmoly": 60 * 60,
+    "Doodstream": 30 * 60,
+    "Luluvdo": 30 * 60,
+}
+MIN_DIRECT_LINK_TTL = 60
+# Timeout of the HEAD request validating a cached direct link
+DIRECT_LINK_VALIDATION_TIMEOUT = 5
+
+# Consecutive failures after which a provider is skipped
+PROVIDER_FAILURE_THRESHOLD = _get_int_env("ANIWORLD_PROVIDER_FAILURE_THRESHOLD", 3)
+# Seconds a failing provider is skipped before it is tried again
+PROVIDER_COOLDOWN = _get_int_env("ANIWORLD_PROVIDER_COOLDOWN", 5 * 60)
+# Weight of the latest outcome in the moving averages of provider health
+PROVIDER_HEALTH_SMOOTHING = 0.3
+
 
 @lru_cache(maxsize=1)
 def _get_mpv_path():
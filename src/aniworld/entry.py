@@ -7,9 +7,7 @@ from .ascii_art import display_traceback_art
 from .action import watch, syncplay
 from .models import Anime, Episode, SUPPORTED_SITES, Movie
 from .parser import arguments
-from .search import search_media
 from .execute import execute
-from .menu import menu
 from .common import generate_links
 from .config import S_TO, MEGAKINO_URL
 
@@ -127,6 +125,8 @@ def _group_episodes_by_series(links: List[str]) -> List[Union[Anime, Movie]]:
 
     # Handle case when no links are provided but we need to create a default anime
     if not media_list and not links:
+        from .search import search_media
+
         selected_media = search_media()
         if selected_media is None:
             return []
@@ -156,6 +156,10 @@ def _handle_episode_mode() -> None:
 
 def _handle_interactive_mode() -> None:
     """Handle interactive menu mode."""
+    # curses, npyscreen and the search client are only needed here
+    from .menu import menu
+    from .search import search_media
+
     slug = arguments.slug
 
     if not slug:
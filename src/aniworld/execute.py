@@ -82,7 +82,7 @@ def execute(media_list: List[Union[Anime, Movie]]) -> None:
     Raises:
         SystemExit: If no anime could be processed successfully
     """
-    if not anime_list:
+    if not media_list:
         logging.warning("No anime provided to execute")
         return
 
@@ -1,10 +1,46 @@
 import importlib
 import pkgutil
+import threading
+
+# Extractor functions are named after the provider module defining them, e.g.
+# get_direct_link_from_voe lives in provider/voe.py. Listing the modules does not
+# import them, so a provider (and its dependencies) is only loaded on first use.
+_EXTRACTOR_PREFIXES = (
+    "get_direct_link_from_",
+    "aget_direct_link_from_",
+    "get_preview_image_link_from_",
+)
+_PROVIDER_MODULES = frozenset(
+    module_name
+    for _, module_name, _ in pkgutil.iter_modules([__path__[0] + "/provider"])
+)
+_import_lock = threading.Lock()
+
+
+def __getattr__(name: str):
+    """
+    Import the provider module of an extractor function on first access.
+
+    Args:
+        name: Name of the extractor function
+
+    Returns:
+        The extractor function, cached as a module attribute
+
+    Raises:
+        AttributeError: If no provider module defines the function
+    """
+    for prefix in _EXTRACTOR_PREFIXES:
+        if name.startswith(prefix) and name[len(prefix):] in _PROVIDER_MODULES:
+            with _import_lock:
+                module = importlib.import_module(
+                    f".provider.{name[len(prefix):]}", __name__
+                )
+            if hasattr(module, name):
+                func = getattr(module, name)
+                globals()[name] = func
+                return func
+            break
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-for _, module_name, _ in pkgutil.iter_modules([__path__[0] + "/provider"]):
-    mod = importlib.import_module(f".provider.{module_name}", __name__)
-    for attr in dir(mod):
-        if attr.startswith("get_direct_link_from_") or attr.startswith(
-            "get_preview_image_link_from_"
-        ):
-            globals()[attr] = getattr(mod, attr)
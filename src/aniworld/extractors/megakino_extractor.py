@@ -3,7 +3,6 @@ import requests
 import logging
 from urllib.parse import urljoin
 from .. import config
-from ..config import RANDOM_USER_AGENT
 
 def megakino_get_direct_link(url: str) -> str or None:
     """
@@ -23,7 +22,7 @@ def megakino_get_direct_link(url: str) -> str or None:
     """
     try:
         token_url = f"{config.MEGAKINO_URL}/index.php?yg=token"
-        headers = {'User-Agent': RANDOM_USER_AGENT}
+        headers = {'User-Agent': config.RANDOM_USER_AGENT}
 
         with requests.Session() as s:
             # Step 1: Get the anti-bot token.
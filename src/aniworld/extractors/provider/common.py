@@ -1 +1,86 @@
-# This should contain common functions between providers in future
+import asyncio
+from typing import Dict, Optional
+
+import requests
+
+from ...config import get_async_http_session
+
+
+class AsyncResponse:
+    """Response of async_request, mirroring the parts of requests.Response the extractors use"""
+
+    __slots__ = ("url", "status_code", "headers", "content", "encoding")
+
+    def __init__(
+        self,
+        url: str,
+        status_code: int,
+        headers: Dict[str, str],
+        content: bytes,
+        encoding: str,
+    ) -> None:
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.encoding = encoding
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding, errors="replace")
+
+
+async def async_request(
+    url: str,
+    method: str = "GET",
+    headers: Optional[Dict[str, str]] = None,
+    allow_redirects: bool = True,
+    verify: bool = True,
+) -> AsyncResponse:
+    """
+    Make an HTTP request on the shared aiohttp session.
+
+    Failures raise the same exceptions as requests, so the async extractors
+    handle errors exactly like their synchronous counterparts.
+
+    Args:
+        url: URL to request
+        method: HTTP method (GET, POST, HEAD)
+        headers: Optional headers dictionary
+        allow_redirects: Whether to follow redirects
+        verify: Whether to verify TLS certificates
+
+    Returns:
+        Response with the whole body read
+
+    Raises:
+        requests.HTTPError: If the server answers with an error status
+        requests.RequestException: If the request fails
+    """
+    import aiohttp
+
+    try:
+        async with get_async_http_session().request(
+            method,
+            url,
+            headers=headers,
+            allow_redirects=allow_redirects,
+            ssl=None if verify else False,
+        ) as response:
+            content = b"" if method.upper() == "HEAD" else await response.read()
+            result = AsyncResponse(
+                str(response.url),
+                response.status,
+                dict(response.headers),
+                content,
+                response.charset or "utf-8",
+            )
+            if response.status >= 400:
+                # Like requests, the error carries the response and its status
+                raise requests.HTTPError(
+                    f"{response.status} Error: {response.reason} for url: {response.url}",
+                    response=result,
+                )
+            return result
+    except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+        raise requests.RequestException(f"Request failed for {url}: {err!r}") from err
@@ -7,7 +7,9 @@ from urllib.parse import urljoin
 
 import requests
 
-from ...config import RANDOM_USER_AGENT, DEFAULT_REQUEST_TIMEOUT
+from ... import config
+from ...config import DEFAULT_REQUEST_TIMEOUT, get_http_session
+from .common import AsyncResponse, async_request
 
 # Constants
 DOODSTREAM_BASE_URL = "https://dood.li"
@@ -18,13 +20,16 @@ TOKEN_PATTERN = r"token=([a-zA-Z0-9]+)"
 
 def _get_headers() -> dict:
     """Get request headers for Doodstream."""
-    return {"User-Agent": RANDOM_USER_AGENT, "Referer": f"{DOODSTREAM_BASE_URL}/"}
+    return {
+        "User-Agent": config.RANDOM_USER_AGENT,
+        "Referer": f"{DOODSTREAM_BASE_URL}/",
+    }
 
 
 def _make_request(url: str, headers: dict) -> requests.Response:
     """Make HTTP request with error handling."""
     try:
-        response = requests.get(
+        response = get_http_session().get(
             url, headers=headers, timeout=DEFAULT_REQUEST_TIMEOUT, verify=False
         )
         response.raise_for_status()
@@ -34,6 +39,15 @@ def _make_request(url: str, headers: dict) -> requests.Response:
         raise
 
 
+async def _amake_request(url: str, headers: dict) -> AsyncResponse:
+    """Make async HTTP request with error handling."""
+    try:
+        return await async_request(url, headers=headers, verify=False)
+    except requests.RequestException as err:
+        logging.error(f"Request failed for {url}: {err}")
+        raise
+
+
 def _extract_data(pattern: str, content: str) -> Optional[str]:
     """Extract data using regex pattern."""
     match = re.search(pattern, content)
@@ -86,6 +100,23 @@ def _get_video_base_url(pass_md5_url: str, headers: dict) -> str:
         raise
 
 
+async def _aget_video_base_url(pass_md5_url: str, headers: dict) -> str:
+    """Get video base URL from pass_md5 endpoint asynchronously."""
+    try:
+        md5_response = await _amake_request(pass_md5_url, headers)
+        video_base_url = md5_response.text.strip()
+
+        if not video_base_url:
+            raise ValueError("Empty video base URL received")
+
+        logging.debug(f"Retrieved video base URL: {video_base_url}")
+        return video_base_url
+
+    except Exception as err:
+        logging.error(f"Failed to get video base URL from {pass_md5_url}: {err}")
+        raise
+
+
 def _build_direct_link(video_base_url: str, token: str) -> str:
     """Build the final direct link."""
     random_string = _generate_random_string(10)
@@ -140,6 +171,42 @@ def get_direct_link_from_doodstream(embeded_doodstream_link: str) -> str:
         raise
 
 
+async def aget_direct_link_from_doodstream(embeded_doodstream_link: str) -> str:
+    """
+    Async counterpart of get_direct_link_from_doodstream using the shared aiohttp session.
+
+    Args:
+        embeded_doodstream_link: Doodstream embed URL
+
+    Returns:
+        Direct download link
+
+    Raises:
+        ValueError: If required data cannot be extracted
+        requests.RequestException: If HTTP requests fail
+    """
+    if not embeded_doodstream_link:
+        raise ValueError("Embed URL cannot be empty")
+
+    logging.info(f"Extracting direct link from Doodstream: {embeded_doodstream_link}")
+
+    try:
+        headers = _get_headers()
+        response = await _amake_request(embeded_doodstream_link, headers)
+
+        pass_md5_url = _extract_pass_md5_url(response.text, embeded_doodstream_link)
+        token = _extract_token(response.text, embeded_doodstream_link)
+        video_base_url = await _aget_video_base_url(pass_md5_url, headers)
+        direct_link = _build_direct_link(video_base_url, token)
+
+        logging.info("Successfully extracted Doodstream direct link")
+        return direct_link
+
+    except Exception as err:
+        logging.error(f"Failed to extract direct link from Doodstream: {err}")
+        raise
+
+
 if __name__ == "__main__":
     # Setup basic logging for standalone execution
     logging.basicConfig(level=logging.DEBUG)
@@ -1,27 +1,41 @@
 import re
 import logging
-from typing import Optional
+import string
+from typing import Iterator, Optional
 
 import requests
-import jsbeautifier
 from bs4 import BeautifulSoup
 
-from ...config import RANDOM_USER_AGENT, DEFAULT_REQUEST_TIMEOUT
+from ... import config
+from ...config import DEFAULT_REQUEST_TIMEOUT, get_http_session
+from .common import AsyncResponse, async_request
 
 # Constants
 FILEMOON_BASE_URL = "https://filemoon.to/"
 FILE_PATTERN = r'file:\s*"([^"]+)"'
+FILE_REGEX = re.compile(FILE_PATTERN)
+
+# Dean Edwards' p.a.c.k.e.r: eval(function(p,a,c,k,e,d){...}('payload',radix,count,
+# 'symbol|table'.split('|')...)). The player setup holding the file URL is packed.
+PACKED_PATTERN = re.compile(
+    r"eval\(function\(p,a,c,k,e,[dr]\).*?\}\("
+    r"'(?P<payload>(?:[^'\\]|\\.)*)',\s*(?P<radix>\d+),\s*(?P<count>\d+),\s*"
+    r"'(?P<symbols>[^']*)'\.split\('\|'\)",
+    re.DOTALL,
+)
+PACKED_WORD_PATTERN = re.compile(r"\b\w+\b", re.ASCII)
+PACKER_ALPHABET = string.digits + string.ascii_lowercase + string.ascii_uppercase
 
 
 def _get_headers() -> dict:
     """Get request headers for Filemoon."""
-    return {"referer": FILEMOON_BASE_URL, "user-agent": RANDOM_USER_AGENT}
+    return {"referer": FILEMOON_BASE_URL, "user-agent": config.RANDOM_USER_AGENT}
 
 
 def _make_request(url: str, headers: Optional[dict] = None) -> requests.Response:
     """Make HTTP request with error handling."""
     try:
-        response = requests.get(url, headers=headers, timeout=DEFAULT_REQUEST_TIMEOUT)
+        response = get_http_session().get(url, headers=headers, timeout=DEFAULT_REQUEST_TIMEOUT)
         response.raise_for_status()
         return response
     except requests.RequestException as err:
@@ -29,6 +43,15 @@ def _make_request(url: str, headers: Optional[dict] = None) -> requests.Response
         raise
 
 
+async def _amake_request(url: str, headers: Optional[dict] = None) -> AsyncResponse:
+    """Make async HTTP request with error handling."""
+    try:
+        return await async_request(url, headers=headers)
+    except requests.RequestException as err:
+        logging.error(f"Request failed for {url}: {err}")
+        raise
+
+
 def _convert_embed_to_download_url(embed_url: str) -> str:
     """Convert embed URL to download URL format."""
     if "/e/" not in embed_url:
@@ -58,8 +81,76 @@ def _extract_iframe_src(html_content: str, source_url: str) -> str:
         raise
 
 
+def _unbase(word: str, radix: int) -> int:
+    """Decode a packer symbol index written in the given radix."""
+    if radix <= 36:
+        return int(word, radix)
+
+    index = 0
+    for char in word:
+        index = index * radix + PACKER_ALPHABET.index(char)
+    return index
+
+
+def _unpack_javascript(html_content: str) -> Iterator[str]:
+    """
+    Unpack the p.a.c.k.e.r blocks of a page without beautifying all of it.
+
+    Args:
+        html_content: HTML content with packed scripts
+
+    Yields:
+        Source of every packed block that could be unpacked
+    """
+    for match in PACKED_PATTERN.finditer(html_content):
+        radix = int(match.group("radix"))
+        symbols = match.group("symbols").split("|")
+        if not 2 <= radix <= len(PACKER_ALPHABET) or len(symbols) != int(
+            match.group("count")
+        ):
+            logging.debug("Skipping malformed packed script")
+            continue
+
+        def lookup(word_match: re.Match) -> str:
+            word = word_match.group(0)
+            try:
+                return symbols[_unbase(word, radix)] or word
+            except (ValueError, IndexError):
+                return word
+
+        payload = match.group("payload").replace("\\\\", "\\").replace("\\'", "'")
+        yield PACKED_WORD_PATTERN.sub(lookup, payload)
+
+
+def _find_file_url(html_content: str, source_url: str) -> str:
+    """
+    Extract the file URL, unpacking only the packed player script if possible.
+
+    Args:
+        html_content: HTML content of the iframe
+        source_url: URL of the iframe, used in error messages
+
+    Returns:
+        File URL
+
+    Raises:
+        ValueError: If neither the packed scripts nor the beautified page
+            contain a file URL
+    """
+    for unpacked in _unpack_javascript(html_content):
+        match = FILE_REGEX.search(unpacked)
+        if match:
+            logging.debug(f"Extracted file URL from packed script: {match.group(1)}")
+            return match.group(1)
+
+    logging.debug("No file URL in packed scripts, beautifying the whole page")
+    return _extract_file_url(_beautify_javascript(html_content), source_url)
+
+
 def _beautify_javascript(html_content: str) -> str:
     """Beautify JavaScript content for easier parsing."""
+    import jsbeautifier
+
     try:
         beautified = jsbeautifier.beautify(html_content)
         logging.debug("Successfully beautified JavaScript content")
@@ -72,7 +163,7 @@ def _beautify_javascript(html_content: str) -> str:
 
 def _extract_file_url(content: str, source_url: str) -> str:
     """Extract file URL from beautified content."""
-    matches = re.findall(FILE_PATTERN, content)
+    matches = FILE_REGEX.findall(content)
 
     if not matches:
         logging.error(f"No file URL found in content from {source_url}")
@@ -119,11 +210,44 @@ def get_direct_link_from_filemoon(embeded_filemoon_link: str) -> str:
         headers = _get_headers()
         iframe_response = _make_request(iframe_src, headers)
 
-        # Beautify JavaScript content
-        beautified_content = _beautify_javascript(iframe_response.text)
-
         # Extract file URL
-        file_url = _extract_file_url(beautified_content, iframe_src)
+        file_url = _find_file_url(iframe_response.text, iframe_src)
+
+        logging.info("Successfully extracted Filemoon direct link")
+        return file_url
+
+    except Exception as err:
+        logging.error(f"Failed to extract direct link from Filemoon: {err}")
+        raise
+
+
+async def aget_direct_link_from_filemoon(embeded_filemoon_link: str) -> str:
+    """
+    Async counterpart of get_direct_link_from_filemoon using the shared aiohttp session.
+
+    Args:
+        embeded_filemoon_link: Filemoon embed URL
+
+    Returns:
+        Direct download link
+
+    Raises:
+        ValueError: If required data cannot be extracted
+        requests.RequestException: If HTTP requests fail
+    """
+    if not embeded_filemoon_link:
+        raise ValueError("Embed URL cannot be empty")
+
+    logging.info(f"Extracting direct link from Filemoon: {embeded_filemoon_link}")
+
+    try:
+        download_url = _convert_embed_to_download_url(embeded_filemoon_link)
+        response = await _amake_request(download_url)
+
+        iframe_src = _extract_iframe_src(response.text, download_url)
+        iframe_response = await _amake_request(iframe_src, _get_headers())
+
+        file_url = _find_file_url(iframe_response.text, iframe_src)
 
         logging.info("Successfully extracted Filemoon direct link")
         return file_url
@@ -155,9 +279,9 @@ def get_preview_image_link_from_filemoon(embeded_filemoon_link: str) -> str:
     try:
         # Resolve final redirected URL to get video ID
         logging.debug("Resolving redirect to obtain video ID...")
-        response = requests.head(
+        response = get_http_session().head(
             embeded_filemoon_link,
-            headers={"User-Agent": RANDOM_USER_AGENT},
+            headers={"User-Agent": config.RANDOM_USER_AGENT},
             timeout=DEFAULT_REQUEST_TIMEOUT,
             allow_redirects=True,
         )
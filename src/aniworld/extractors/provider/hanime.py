@@ -7,7 +7,7 @@ from urllib.parse import urlparse
 
 import requests
 
-from ...config import DEFAULT_REQUEST_TIMEOUT
+from ...config import DEFAULT_REQUEST_TIMEOUT, get_http_session
 
 # Constants
 VIDEO_MANIFEST_PATTERN = r"^.*videos_manifest.*$"
@@ -34,7 +34,7 @@ def _make_request(url: str, retry_count: int = 0) -> requests.Response:
     """
     try:
         logger.debug(f"Making request to: {url} (attempt {retry_count + 1})")
-        response = requests.get(
+        response = get_http_session().get(
             url,
             timeout=DEFAULT_REQUEST_TIMEOUT,
             headers={
@@ -417,7 +417,7 @@ def validate_stream_url(url: str) -> bool:
         True if stream is accessible, False otherwise
     """
     try:
-        response = requests.head(url, timeout=DEFAULT_REQUEST_TIMEOUT)
+        response = get_http_session().head(url, timeout=DEFAULT_REQUEST_TIMEOUT)
         return response.status_code == 200
     except requests.RequestException:
         return False
@@ -5,7 +5,8 @@ import sys
 from typing import Dict, Optional
 from urllib.parse import urlparse
 
-from ...config import DEFAULT_REQUEST_TIMEOUT
+from ...config import DEFAULT_REQUEST_TIMEOUT, get_http_session
+from .common import AsyncResponse, async_request
 
 # Setup module logger
 logger = logging.getLogger(__name__)
@@ -66,7 +67,7 @@ def _make_request(
         logger.debug(f"Making {method} request to: {url}")
 
         if method.upper() == "HEAD":
-            response = requests.head(
+            response = get_http_session().head(
                 url,
                 allow_redirects=allow_redirects,
                 verify=False,
@@ -74,14 +75,14 @@ def _make_request(
                 headers=headers or {},
             )
         elif method.upper() == "POST":
-            response = requests.post(
+            response = get_http_session().post(
                 url,
                 headers=headers or {},
                 verify=False,
                 timeout=DEFAULT_REQUEST_TIMEOUT,
             )
         else:
-            response = requests.get(
+            response = get_http_session().get(
                 url,
                 headers=headers or {},
                 verify=False,
@@ -96,6 +97,41 @@ def _make_request(
         raise ValueError(f"Failed to fetch URL: {err}") from err
 
 
+async def _amake_request(
+    url: str,
+    method: str = "GET",
+    headers: Optional[Dict[str, str]] = None,
+    allow_redirects: bool = True,
+) -> AsyncResponse:
+    """
+    Make async HTTP request with error handling.
+
+    Args:
+        url: URL to request
+        method: HTTP method (GET, POST, HEAD)
+        headers: Optional headers dictionary
+        allow_redirects: Whether to follow redirects
+
+    Returns:
+        HTTP response object
+
+    Raises:
+        ValueError: If request fails
+    """
+    try:
+        logger.debug(f"Making async {method} request to: {url}")
+        return await async_request(
+            url,
+            method=method.upper(),
+            headers=headers or {},
+            allow_redirects=allow_redirects,
+            verify=False,
+        )
+    except requests.RequestException as err:
+        logger.error(f"Request failed for {url}: {err}")
+        raise ValueError(f"Failed to fetch URL: {err}") from err
+
+
 def _extract_id_hash_from_url(url: str) -> tuple[str, str]:
     """
     Extract ID hash and host from LoadX URL.
@@ -215,6 +251,44 @@ def get_direct_link_from_loadx(embeded_loadx_link: str) -> str:
         raise ValueError(f"Failed to extract video from LoadX: {err}") from err
 
 
+async def aget_direct_link_from_loadx(embeded_loadx_link: str) -> str:
+    """
+    Async counterpart of get_direct_link_from_loadx using the shared aiohttp session.
+
+    Args:
+        embeded_loadx_link: LoadX embedded URL
+
+    Returns:
+        Direct video URL
+
+    Raises:
+        ValueError: If extraction fails
+    """
+    try:
+        validated_url = _validate_loadx_url(embeded_loadx_link)
+        logger.info(f"Extracting video from LoadX URL: {validated_url}")
+
+        response = await _amake_request(
+            validated_url, method="HEAD", allow_redirects=True
+        )
+        id_hash, host = _extract_id_hash_from_url(response.url)
+
+        post_url = f"https://{host}/player/index.php?data={id_hash}&do=getVideo"
+        headers = {"X-Requested-With": "XMLHttpRequest"}
+        api_response = await _amake_request(post_url, method="POST", headers=headers)
+
+        video_url = _parse_video_response(api_response.text)
+
+        logger.info(f"Successfully extracted video URL: {video_url}")
+        return video_url
+
+    except ValueError:
+        raise
+    except Exception as err:
+        logger.error(f"Unexpected error extracting LoadX video: {err}")
+        raise ValueError(f"Failed to extract video from LoadX: {err}") from err
+
+
 def validate_video_url(url: str) -> bool:
     """
     Validate if a video URL is accessible.
@@ -226,7 +300,7 @@ def validate_video_url(url: str) -> bool:
         True if video is accessible, False otherwise
     """
     try:
-        response = requests.head(url, timeout=DEFAULT_REQUEST_TIMEOUT)
+        response = get_http_session().head(url, timeout=DEFAULT_REQUEST_TIMEOUT)
         return response.status_code == 200
     except requests.RequestException:
         return False
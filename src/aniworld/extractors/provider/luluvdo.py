@@ -7,6 +7,7 @@ from urllib.parse import urlparse
 import requests
 
 from ... import config
+from .common import AsyncResponse, async_request
 
 # Setup module logger
 logger = logging.getLogger(__name__)
@@ -135,7 +136,7 @@ def _make_request(url: str, headers: Dict[str, str]) -> requests.Response:
     """
     try:
         logger.debug(f"Making request to: {url}")
-        response = requests.get(
+        response = config.get_http_session().get(
             url, headers=headers, timeout=config.DEFAULT_REQUEST_TIMEOUT
         )
         response.raise_for_status()
@@ -146,6 +147,28 @@ def _make_request(url: str, headers: Dict[str, str]) -> requests.Response:
         raise ValueError(f"Failed to fetch URL: {err}") from err
 
 
+async def _amake_request(url: str, headers: Dict[str, str]) -> AsyncResponse:
+    """
+    Make async HTTP request with error handling.
+
+    Args:
+        url: URL to request
+        headers: Request headers
+
+    Returns:
+        HTTP response object
+
+    Raises:
+        ValueError: If request fails
+    """
+    try:
+        logger.debug(f"Making async request to: {url}")
+        return await async_request(url, headers=headers)
+    except requests.RequestException as err:
+        logger.error(f"Request failed for {url}: {err}")
+        raise ValueError(f"Failed to fetch URL: {err}") from err
+
+
 def _extract_video_url(response_text: str) -> str:
     """
     Extract video URL from response text.
@@ -232,6 +255,45 @@ def get_direct_link_from_luluvdo(
         raise ValueError(f"Failed to extract video from LuluVDO: {err}") from err
 
 
+async def aget_direct_link_from_luluvdo(
+    embeded_luluvdo_link: str, arguments: Optional[Any] = None
+) -> str:
+    """
+    Async counterpart of get_direct_link_from_luluvdo using the shared aiohttp session.
+
+    Args:
+        embeded_luluvdo_link: LuluVDO embedded URL
+        arguments: Optional arguments object for additional configuration
+
+    Returns:
+        Direct video URL
+
+    Raises:
+        ValueError: If extraction fails
+    """
+    try:
+        validated_url = _validate_luluvdo_url(embeded_luluvdo_link)
+        logger.info(f"Extracting video from LuluVDO URL: {validated_url}")
+
+        luluvdo_id = _extract_luluvdo_id(validated_url)
+        embed_url = _build_embed_url(luluvdo_id)
+
+        response = await _amake_request(embed_url, _build_headers(arguments))
+        if response.status_code != 200:
+            raise ValueError(f"Server returned status code: {response.status_code}")
+
+        video_url = _extract_video_url(response.text)
+
+        logger.info(f"Successfully extracted video URL: {video_url}")
+        return video_url
+
+    except ValueError:
+        raise
+    except Exception as err:
+        logger.error(f"Unexpected error extracting LuluVDO video: {err}")
+        raise ValueError(f"Failed to extract video from LuluVDO: {err}") from err
+
+
 def validate_video_url(url: str) -> bool:
     """
     Validate if a video URL is accessible.
@@ -243,7 +305,7 @@ def validate_video_url(url: str) -> bool:
         True if video is accessible, False otherwise
     """
     try:
-        response = requests.head(url, timeout=config.DEFAULT_REQUEST_TIMEOUT)
+        response = config.get_http_session().head(url, timeout=config.DEFAULT_REQUEST_TIMEOUT)
         return response.status_code == 200
     except requests.RequestException:
         return False
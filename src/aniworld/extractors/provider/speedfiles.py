@@ -6,7 +6,9 @@ from urllib.parse import urlparse
 
 import requests
 
-from ...config import DEFAULT_REQUEST_TIMEOUT, RANDOM_USER_AGENT
+from ... import config
+from ...config import DEFAULT_REQUEST_TIMEOUT, get_http_session
+from .common import AsyncResponse, async_request
 
 # Constants
 SPEEDFILES_PATTERN = re.compile(r'var _0x5opu234 = "(?P<encoded_data>.*?)";')
@@ -61,10 +63,10 @@ def _make_request(url: str) -> requests.Response:
     """
     try:
         logger.debug(f"Making request to: {url}")
-        response = requests.get(
+        response = get_http_session().get(
             url,
             timeout=DEFAULT_REQUEST_TIMEOUT,
-            headers={"User-Agent": RANDOM_USER_AGENT},
+            headers={"User-Agent": config.RANDOM_USER_AGENT},
         )
         response.raise_for_status()
         return response
@@ -74,6 +76,29 @@ def _make_request(url: str) -> requests.Response:
         raise ValueError(f"Failed to fetch URL: {err}") from err
 
 
+async def _amake_request(url: str) -> AsyncResponse:
+    """
+    Make async HTTP request with error handling.
+
+    Args:
+        url: URL to request
+
+    Returns:
+        HTTP response object
+
+    Raises:
+        ValueError: If request fails
+    """
+    try:
+        logger.debug(f"Making async request to: {url}")
+        return await async_request(
+            url, headers={"User-Agent": config.RANDOM_USER_AGENT}
+        )
+    except requests.RequestException as err:
+        logger.error(f"Request failed for {url}: {err}")
+        raise ValueError(f"Failed to fetch URL: {err}") from err
+
+
 def _check_server_status(response_text: str) -> None:
     """
     Check if SpeedFiles server is down.
@@ -220,6 +245,39 @@ def get_direct_link_from_speedfiles(embeded_speedfiles_link: str) -> str:
         raise ValueError(f"Failed to extract video from SpeedFiles: {err}") from err
 
 
+async def aget_direct_link_from_speedfiles(embeded_speedfiles_link: str) -> str:
+    """
+    Async counterpart of get_direct_link_from_speedfiles using the shared aiohttp session.
+
+    Args:
+        embeded_speedfiles_link: SpeedFiles embedded URL
+
+    Returns:
+        Direct video URL
+
+    Raises:
+        ValueError: If extraction fails
+    """
+    try:
+        validated_url = _validate_speedfiles_url(embeded_speedfiles_link)
+        logger.info(f"Extracting video from SpeedFiles URL: {validated_url}")
+
+        response = await _amake_request(validated_url)
+        _check_server_status(response.text)
+
+        encoded_data = _extract_encoded_data(response.text)
+        video_url = _decode_speedfiles_data(encoded_data)
+
+        logger.info(f"Successfully extracted video URL: {video_url}")
+        return video_url
+
+    except ValueError:
+        raise
+    except Exception as err:
+        logger.error(f"Unexpected error extracting SpeedFiles video: {err}")
+        raise ValueError(f"Failed to extract video from SpeedFiles: {err}") from err
+
+
 def validate_video_url(url: str) -> bool:
     """
     Validate if a video URL is accessible.
@@ -231,7 +289,7 @@ def validate_video_url(url: str) -> bool:
         True if video is accessible, False otherwise
     """
     try:
-        response = requests.head(url, timeout=DEFAULT_REQUEST_TIMEOUT)
+        response = get_http_session().head(url, timeout=DEFAULT_REQUEST_TIMEOUT)
         return response.status_code == 200
     except requests.RequestException:
         return False
@@ -3,13 +3,39 @@ import re
 import requests
 from bs4 import BeautifulSoup
 
-from ...config import DEFAULT_REQUEST_TIMEOUT, RANDOM_USER_AGENT
+from ... import config
+from ...config import DEFAULT_REQUEST_TIMEOUT, get_http_session
+from .common import async_request
 
 
 # Compile regex pattern once for better performance
 FILE_LINK_PATTERN = re.compile(r'file:\s*"(https?://[^"]+)"')
 
 
+def _extract_file_link(html: str) -> str:
+    """
+    Extract the video file link from a Vidmoly embed page.
+
+    Raises:
+        ValueError: If no direct link is found
+    """
+    # Use compiled regex to search directly in the HTML content
+    match = FILE_LINK_PATTERN.search(html)
+    if match:
+        return match.group(1)
+
+    # Fallback to BeautifulSoup parsing if direct search fails
+    soup = BeautifulSoup(html, "html.parser")
+    scripts = soup.find_all("script", string=True)
+
+    for script in scripts:
+        match = FILE_LINK_PATTERN.search(script.string)
+        if match:
+            return match.group(1)
+
+    raise ValueError("No direct link found in Vidmoly page.")
+
+
 def get_direct_link_from_vidmoly(embeded_vidmoly_link: str) -> str:
     """
     Extract direct video link from Vidmoly embed page.
@@ -25,34 +51,49 @@ def get_direct_link_from_vidmoly(embeded_vidmoly_link: str) -> str:
         requests.RequestException: If the request fails
     """
     try:
-        response = requests.get(
+        response = get_http_session().get(
             embeded_vidmoly_link,
-            headers={"User-Agent": RANDOM_USER_AGENT},
+            headers={"User-Agent": config.RANDOM_USER_AGENT},
             timeout=DEFAULT_REQUEST_TIMEOUT,
         )
         response.raise_for_status()  # Raise an exception for bad status codes
 
-        # Use compiled regex to search directly in the HTML content
-        match = FILE_LINK_PATTERN.search(response.text)
-        if match:
-            return match.group(1)
+        return _extract_file_link(response.text)
+
+    except requests.RequestException as err:
+        raise ValueError(f"Failed to fetch Vidmoly page: {err}") from err
+    except ValueError:
+        raise
+    except Exception as err:
+        raise ValueError(f"Error parsing Vidmoly page: {err}") from err
 
-        # Fallback to BeautifulSoup parsing if direct search fails
-        soup = BeautifulSoup(response.text, "html.parser")
-        scripts = soup.find_all("script", string=True)
 
-        for script in scripts:
-            match = FILE_LINK_PATTERN.search(script.string)
-            if match:
-                return match.group(1)
+async def aget_direct_link_from_vidmoly(embeded_vidmoly_link: str) -> str:
+    """
+    Async counterpart of get_direct_link_from_vidmoly using the shared aiohttp session.
+
+    Args:
+        embeded_vidmoly_link: URL of the Vidmoly embed page
+
+    Returns:
+        Direct video URL
+
+    Raises:
+        ValueError: If no direct link is found
+    """
+    try:
+        response = await async_request(
+            embeded_vidmoly_link, headers={"User-Agent": config.RANDOM_USER_AGENT}
+        )
+        return _extract_file_link(response.text)
 
     except requests.RequestException as err:
         raise ValueError(f"Failed to fetch Vidmoly page: {err}") from err
+    except ValueError:
+        raise
     except Exception as err:
         raise ValueError(f"Error parsing Vidmoly page: {err}") from err
 
-    raise ValueError("No direct link found in Vidmoly page.")
-
 
 def get_preview_image_link_from_vidmoly(embeded_vidmoly_link: str) -> str:
     """
@@ -70,9 +111,9 @@ def get_preview_image_link_from_vidmoly(embeded_vidmoly_link: str) -> str:
     """
     try:
         # Perform initial request to fetch HTML content
-        response = requests.get(
+        response = get_http_session().get(
             embeded_vidmoly_link,
-            headers={"User-Agent": RANDOM_USER_AGENT},
+            headers={"User-Agent": config.RANDOM_USER_AGENT},
             timeout=DEFAULT_REQUEST_TIMEOUT,
         )
         response.raise_for_status()
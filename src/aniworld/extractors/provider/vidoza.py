@@ -3,13 +3,41 @@ import re
 import requests
 from bs4 import BeautifulSoup
 
-from ...config import DEFAULT_REQUEST_TIMEOUT, RANDOM_USER_AGENT
+from ... import config
+from ...config import DEFAULT_REQUEST_TIMEOUT, get_http_session
+from .common import async_request
 
 
 # Compile regex pattern once for better performance
 SOURCE_LINK_PATTERN = re.compile(r'src:\s*"([^"]+)"')
 
 
+def _extract_source_link(html_content: str) -> str:
+    """
+    Extract the video source link from a Vidoza embed page.
+
+    Raises:
+        ValueError: If no direct link is found
+    """
+    # Direct text search for better performance
+    if "sourcesCode:" in html_content:
+        match = SOURCE_LINK_PATTERN.search(html_content)
+        if match:
+            return match.group(1)
+
+    # Fallback to BeautifulSoup parsing if direct search fails
+    soup = BeautifulSoup(html_content, "html.parser")
+    scripts = soup.find_all("script", string=True)
+
+    for script in scripts:
+        if "sourcesCode:" in script.string:
+            match = SOURCE_LINK_PATTERN.search(script.string)
+            if match:
+                return match.group(1)
+
+    raise ValueError("No direct link found in Vidoza page.")
+
+
 def get_direct_link_from_vidoza(embeded_vidoza_link: str) -> str:
     """
     Extract direct video link from Vidoza embed page.
@@ -25,37 +53,49 @@ def get_direct_link_from_vidoza(embeded_vidoza_link: str) -> str:
         requests.RequestException: If the request fails
     """
     try:
-        response = requests.get(
+        response = get_http_session().get(
             embeded_vidoza_link,
-            headers={"User-Agent": RANDOM_USER_AGENT},
+            headers={"User-Agent": config.RANDOM_USER_AGENT},
             timeout=DEFAULT_REQUEST_TIMEOUT,
         )
         response.raise_for_status()  # Raise an exception for bad status codes
 
-        # Direct text search for better performance
-        html_content = response.text
-        if "sourcesCode:" in html_content:
-            match = SOURCE_LINK_PATTERN.search(html_content)
-            if match:
-                return match.group(1)
+        return _extract_source_link(response.text)
 
-        # Fallback to BeautifulSoup parsing if direct search fails
-        soup = BeautifulSoup(response.content, "html.parser")
-        scripts = soup.find_all("script", string=True)
+    except requests.RequestException as err:
+        raise ValueError(f"Failed to fetch Vidoza page: {err}") from err
+    except ValueError:
+        raise
+    except Exception as err:
+        raise ValueError(f"Error parsing Vidoza page: {err}") from err
 
-        for script in scripts:
-            if "sourcesCode:" in script.string:
-                match = SOURCE_LINK_PATTERN.search(script.string)
-                if match:
-                    return match.group(1)
+
+async def aget_direct_link_from_vidoza(embeded_vidoza_link: str) -> str:
+    """
+    Async counterpart of get_direct_link_from_vidoza using the shared aiohttp session.
+
+    Args:
+        embeded_vidoza_link: URL of the Vidoza embed page
+
+    Returns:
+        Direct video URL
+
+    Raises:
+        ValueError: If no direct link is found
+    """
+    try:
+        response = await async_request(
+            embeded_vidoza_link, headers={"User-Agent": config.RANDOM_USER_AGENT}
+        )
+        return _extract_source_link(response.text)
 
     except requests.RequestException as err:
         raise ValueError(f"Failed to fetch Vidoza page: {err}") from err
+    except ValueError:
+        raise
     except Exception as err:
         raise ValueError(f"Error parsing Vidoza page: {err}") from err
 
-    raise ValueError("No direct link found in Vidoza page.")
-
 
 if __name__ == "__main__":
     link = input("Enter Vidoza Link: ")
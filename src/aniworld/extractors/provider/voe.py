@@ -2,14 +2,15 @@ import re
 import base64
 import binascii
 import json
+import string
+from functools import lru_cache
 from typing import Optional, Dict, Any
-from urllib.request import Request, urlopen
-from urllib.error import HTTPError, URLError
 
 import requests
 from bs4 import BeautifulSoup
 
 from ... import config
+from .common import async_request
 
 
 # Compile regex patterns once for better performance
@@ -19,31 +20,51 @@ HLS_PATTERN = re.compile(r"'hls': '(?P<hls>[^']+)'")
 
 # Pre-compiled junk parts for replacement
 JUNK_PARTS = ["@$", "^^", "~@", "%?", "*~", "!!", "#&"]
+JUNK_PATTERN = re.compile("|".join(re.escape(part) for part in JUNK_PARTS))
+
+# Translation tables replacing per character loops
+_ROT13 = (
+    string.ascii_lowercase[13:]
+    + string.ascii_lowercase[:13]
+    + string.ascii_uppercase[13:]
+    + string.ascii_uppercase[:13]
+)
+ROT13_TABLE = str.maketrans(string.ascii_letters, _ROT13)
+# ROT13 and removal of the underscores left by replace_junk in one pass
+DECODE_TABLE = str.maketrans(string.ascii_letters, _ROT13, "_")
+
+
+class _ShiftTable(dict):
+    """Translation table shifting code points back, filled on first lookup."""
+
+    def __init__(self, n: int):
+        super().__init__()
+        self.n = n
+
+    def __missing__(self, code: int) -> str:
+        # chr raises ValueError below zero, just like the shift itself
+        self[code] = shifted = chr(code - self.n)
+        return shifted
+
+
+@lru_cache(maxsize=None)
+def _get_shift_table(n: int) -> _ShiftTable:
+    return _ShiftTable(n)
 
 
 def shift_letters(input_str: str) -> str:
     """Apply ROT13 cipher to alphabetic characters."""
-    result = []
-    for c in input_str:
-        code = ord(c)
-        if 65 <= code <= 90:  # Uppercase A-Z
-            code = (code - 65 + 13) % 26 + 65
-        elif 97 <= code <= 122:  # Lowercase a-z
-            code = (code - 97 + 13) % 26 + 97
-        result.append(chr(code))
-    return "".join(result)
+    return input_str.translate(ROT13_TABLE)
 
 
 def replace_junk(input_str: str) -> str:
     """Replace junk patterns with underscores."""
-    for part in JUNK_PARTS:
-        input_str = input_str.replace(part, "_")
-    return input_str
+    return JUNK_PATTERN.sub("_", input_str)
 
 
 def shift_back(s: str, n: int) -> str:
     """Shift characters back by n positions."""
-    return "".join(chr(ord(c) - n) for c in s)
+    return s.translate(_get_shift_table(n))
 
 
 def decode_voe_string(encoded: str) -> Dict[str, Any]:
@@ -60,8 +81,8 @@ def decode_voe_string(encoded: str) -> Dict[str, Any]:
         ValueError: If decoding fails at any step
     """
     try:
-        step1 = shift_letters(encoded)
-        step2 = replace_junk(step1).replace("_", "")
+        # Junk parts contain no letters, so they can be dropped before ROT13
+        step2 = JUNK_PATTERN.sub("", encoded).translate(DECODE_TABLE)
         step3 = base64.b64decode(step2).decode()
         step4 = shift_back(step3, 3)
         step5 = base64.b64decode(step4[::-1]).decode()
@@ -91,6 +112,64 @@ def extract_voe_from_script(html: str) -> Optional[str]:
     return None
 
 
+def _find_redirect_url(response_text: str) -> str:
+    """Find the URL the VOE embed page redirects to."""
+    redirect_match = REDIRECT_PATTERN.search(response_text)
+    if not redirect_match:
+        raise ValueError("No redirect URL found in VOE response.")
+    return redirect_match.group(0)
+
+
+def _add_referer(redirect_url: str) -> None:
+    """Update provider headers with the referer of the redirect URL."""
+    parts = redirect_url.strip().split("/")
+    if len(parts) >= 3:
+        referer = f'Referer: "{parts[0]}//{parts[2]}/"'
+        for provider_headers in (config.PROVIDER_HEADERS_D, config.PROVIDER_HEADERS_W):
+            if referer not in provider_headers["VOE"]:
+                provider_headers["VOE"].append(referer)
+
+
+def _extract_voe_source(html: str) -> str:
+    """
+    Extract the video source from the final VOE page.
+
+    Args:
+        html: HTML content of the page the embed page redirects to
+
+    Returns:
+        Video source URL
+
+    Raises:
+        ValueError: If no extraction method finds a source
+    """
+    # Method 1: Extract from script tag
+    extracted = extract_voe_from_script(html)
+    if extracted:
+        return extracted
+
+    # Method 2: Extract from base64 encoded variable
+    b64_match = B64_PATTERN.search(html)
+    if b64_match:
+        try:
+            decoded = base64.b64decode(b64_match.group(1)).decode()[::-1]
+            source = json.loads(decoded).get("source")
+            if source:
+                return source
+        except (binascii.Error, json.JSONDecodeError, UnicodeDecodeError):
+            pass  # Continue to next method
+
+    # Method 3: Extract HLS source
+    hls_match = HLS_PATTERN.search(html)
+    if hls_match:
+        try:
+            return base64.b64decode(hls_match.group("hls")).decode()
+        except (binascii.Error, UnicodeDecodeError):
+            pass  # Continue to final error
+
+    raise ValueError("No video source found using any extraction method.")
+
+
 def get_direct_link_from_voe(embeded_voe_link: str) -> str:
     """
     Extract direct video link from VOE embed page.
@@ -107,7 +186,7 @@ def get_direct_link_from_voe(embeded_voe_link: str) -> str:
     """
     try:
         # Initial request to get redirect URL
-        response = requests.get(
+        response = config.get_http_session().get(
             embeded_voe_link,
             headers={"User-Agent": config.RANDOM_USER_AGENT},
             timeout=config.DEFAULT_REQUEST_TIMEOUT,
@@ -115,56 +194,63 @@ def get_direct_link_from_voe(embeded_voe_link: str) -> str:
         response.raise_for_status()
 
         # Find redirect URL using compiled regex
-        redirect_match = REDIRECT_PATTERN.search(response.text)
-        if not redirect_match:
-            raise ValueError("No redirect URL found in VOE response.")
-
-        redirect_url = redirect_match.group(0)
+        redirect_url = _find_redirect_url(response.text)
 
         # Update provider headers with referer
-        parts = redirect_url.strip().split("/")
-        if len(parts) >= 3:
-            referer = f'Referer: "{parts[0]}//{parts[2]}/"'
-            config.PROVIDER_HEADERS_D["VOE"].append(referer)
-            config.PROVIDER_HEADERS_W["VOE"].append(referer)
+        _add_referer(redirect_url)
 
         # Follow redirect and get final HTML
         try:
-            with urlopen(
-                Request(redirect_url, headers={"User-Agent": config.RANDOM_USER_AGENT}),
+            resp = config.get_http_session().get(
+                redirect_url,
+                headers={"User-Agent": config.RANDOM_USER_AGENT},
                 timeout=config.DEFAULT_REQUEST_TIMEOUT,
-            ) as resp:
-                html = resp.read().decode()
-        except (HTTPError, URLError, TimeoutError) as err:
+            )
+            resp.raise_for_status()
+            html = resp.content.decode()
+        except requests.RequestException as err:
             raise ValueError(f"Failed to follow redirect: {err}") from err
 
         # Try multiple extraction methods
+        return _extract_voe_source(html)
 
-        # Method 1: Extract from script tag
-        extracted = extract_voe_from_script(html)
-        if extracted:
-            return extracted
-
-        # Method 2: Extract from base64 encoded variable
-        b64_match = B64_PATTERN.search(html)
-        if b64_match:
-            try:
-                decoded = base64.b64decode(b64_match.group(1)).decode()[::-1]
-                source = json.loads(decoded).get("source")
-                if source:
-                    return source
-            except (binascii.Error, json.JSONDecodeError, UnicodeDecodeError):
-                pass  # Continue to next method
-
-        # Method 3: Extract HLS source
-        hls_match = HLS_PATTERN.search(html)
-        if hls_match:
-            try:
-                return base64.b64decode(hls_match.group("hls")).decode()
-            except (binascii.Error, UnicodeDecodeError):
-                pass  # Continue to final error
-
-        raise ValueError("No video source found using any extraction method.")
+    except requests.RequestException as err:
+        raise ValueError(f"Failed to fetch VOE page: {err}") from err
+    except Exception as err:
+        raise ValueError(
+            f"Unable to process this VOE link: {err}\n\n"
+            "Try using a different provider for now.\n"
+            "If this issue persists and hasn't been reported yet, please consider creating a new issue."
+        ) from err
+
+
+async def aget_direct_link_from_voe(embeded_voe_link: str) -> str:
+    """
+    Async counterpart of get_direct_link_from_voe using the shared aiohttp session.
+
+    Args:
+        embeded_voe_link: URL of the VOE embed page
+
+    Returns:
+        Direct video URL
+
+    Raises:
+        ValueError: If no direct link is found or processing fails
+    """
+    headers = {"User-Agent": config.RANDOM_USER_AGENT}
+    try:
+        response = await async_request(embeded_voe_link, headers=headers)
+
+        redirect_url = _find_redirect_url(response.text)
+        _add_referer(redirect_url)
+
+        try:
+            resp = await async_request(redirect_url, headers=headers)
+            html = resp.content.decode()
+        except requests.RequestException as err:
+            raise ValueError(f"Failed to follow redirect: {err}") from err
+
+        return _extract_voe_source(html)
 
     except requests.RequestException as err:
         raise ValueError(f"Failed to fetch VOE page: {err}") from err
@@ -192,7 +278,7 @@ def get_preview_image_link_from_voe(embeded_voe_link: str) -> str:
     """
     try:
         # Initial request to get redirect URL
-        response = requests.get(
+        response = config.get_http_session().get(
             embeded_voe_link,
             headers={"User-Agent": config.RANDOM_USER_AGENT},
             timeout=config.DEFAULT_REQUEST_TIMEOUT,
@@ -200,16 +286,12 @@ def get_preview_image_link_from_voe(embeded_voe_link: str) -> str:
         response.raise_for_status()
 
         # Find redirect URL using compiled regex
-        redirect_match = REDIRECT_PATTERN.search(response.text)
-        if not redirect_match:
-            raise ValueError("No redirect URL found in VOE response.")
-
-        redirect_url = redirect_match.group(0)
+        redirect_url = _find_redirect_url(response.text)
         image_url = f"{redirect_url.replace('/e/', '/cache/')}_storyboard_L2.jpg"
 
         # Check if the preview image is actually reachable
         try:
-            head_response = requests.head(
+            head_response = config.get_http_session().head(
                 image_url,
                 headers={"User-Agent": config.RANDOM_USER_AGENT},
                 timeout=config.DEFAULT_REQUEST_TIMEOUT,
@@ -1,26 +1,45 @@
+import asyncio
 import importlib
 import json
 import logging
 import re
-from functools import lru_cache
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Tuple, Any
+from urllib.parse import urljoin, urlparse
 
 import requests
 import requests.models
 from bs4 import BeautifulSoup
+from lxml import html as lxml_html
 
 from .aniskip import get_mal_id_from_title
+from . import config
 from .config import (
+    ASYNC_RESOLVE_CONCURRENCY,
     DEFAULT_REQUEST_TIMEOUT,
-    RANDOM_USER_AGENT,
     SUPPORTED_SITES,
     SITE_LANGUAGE_CODES,
     SITE_LANGUAGE_NAMES,
     SUPPORTED_PROVIDERS,
-    S_TO,
+    MAX_REDIRECT_HOPS,
+    PROVIDER_PROBE_BYTES,
+    PROVIDER_PROBE_MAX_PLAYLISTS,
+    PROVIDER_PROBE_TIMEOUT,
+    PROVIDER_RACE_CONCURRENCY,
+    close_async_http_session,
+    get_async_http_session,
+    get_http_session,
 )
 from .parser import arguments
-from .common import get_season_episode_count, get_movie_episode_count
+from .common import (
+    get_season_episode_count,
+    get_movie_episode_count,
+    get_metadata_cache,
+    get_direct_link_cache,
+    get_provider_health,
+    is_hoster_failure,
+)
 
 
 class Anime:
@@ -62,9 +81,32 @@ class Anime:
         episode_list (List[Episode]): A list of Episode objects for the anime.
         description_german (str): The German description of the anime.
         description_english (str): The English description of the anime.
-        html (requests.models.Response): The HTML response object for the anime's webpage.
+        html (requests.models.Response): The HTML response object for the anime's webpage,
+            released once the page has been parsed.
     """
 
+    __slots__ = (
+        "site",
+        "site_config",
+        "base_url",
+        "stream_path",
+        "slug",
+        "action",
+        "provider",
+        "language",
+        "aniskip",
+        "output_directory",
+        "episode_list",
+        "_html_cache",
+        "_page_cache",
+        "_title_cache",
+        "_description_german_cache",
+        "_description_english_cache",
+        "_shared_season_episode_count",
+        "_shared_movie_episode_count",
+        "__weakref__",
+    )
+
     def __init__(
         self,
         title: Optional[str] = None,
@@ -133,6 +175,7 @@ class Anime:
 
         # Initialize HTML and title
         self._html_cache = html
+        self._page_cache = None
         self._title_cache = title
         self._description_german_cache = description_german
         self._description_english_cache = description_english
@@ -174,10 +217,10 @@ class Anime:
         """
         if self._html_cache is None:
             try:
-                self._html_cache = requests.get(
+                self._html_cache = get_http_session().get(
                     f"{self.base_url}/{self.stream_path}/{self.slug}",
                     timeout=DEFAULT_REQUEST_TIMEOUT,
-                    headers={"User-Agent": RANDOM_USER_AGENT},
+                    headers={"User-Agent": config.RANDOM_USER_AGENT},
                 )
                 self._html_cache.raise_for_status()
             except requests.RequestException as err:
@@ -191,6 +234,20 @@ class Anime:
 
         return self._html_cache
 
+    @property
+    def page(self) -> "AnimePage":
+        """
+        Lazy-parsed anime page, the HTML response is released once parsed.
+
+        Returns:
+            AnimePage with title and German description
+        """
+        if self._page_cache is None:
+            self._page_cache = AnimePage(self.html.content)
+            self._html_cache = None
+
+        return self._page_cache
+
     @property
     def title(self) -> str:
         """
@@ -200,9 +257,17 @@ class Anime:
             Anime title string
         """
         if self._title_cache is None:
+            cache = get_metadata_cache()
+            cache_key = f"{self.base_url}/{self.slug}"
+            self._title_cache = cache.get("title", cache_key)
+            if self._title_cache:
+                return self._title_cache
+
             try:
-                self._title_cache = get_anime_title_from_html(self.html, self.site)
-                if not self._title_cache:
+                self._title_cache = self.page.title
+                if self._title_cache:
+                    cache.set("title", cache_key, self._title_cache)
+                else:
                     self._title_cache = f"Unknown Anime ({self.slug})"
                     logging.warning(
                         "Could not extract title for anime slug: %s", self.slug
@@ -247,16 +312,9 @@ class Anime:
             German description or fallback message
         """
         try:
-            soup = BeautifulSoup(self.html.content, "html.parser")
-            desc_div = soup.find("p", class_="seri_des")
-
-            if desc_div:
-                description = desc_div.get("data-full-description", "")
-                if description:
-                    return description
-
-                # Fallback to div text content
-                return desc_div.get_text(strip=True)
+            description = self.page.description_german
+            if description is not None:
+                return description
 
             return "Could not fetch German description."
 
@@ -276,10 +334,10 @@ class Anime:
             if not anime_id:
                 return "Could not find MyAnimeList ID for English description."
 
-            response = requests.get(
+            response = get_http_session().get(
                 f"https://myanimelist.net/anime/{anime_id}",
                 timeout=DEFAULT_REQUEST_TIMEOUT,
-                headers={"User-Agent": RANDOM_USER_AGENT},
+                headers={"User-Agent": config.RANDOM_USER_AGENT},
             )
             response.raise_for_status()
 
@@ -496,11 +554,47 @@ class Episode:
         language_name (List[str]): List of available language names.
         season_episode_count (Dict[int, int]): Season to episode count mapping.
         movie_episode_count (int): Number of movie episodes.
-        html (requests.models.Response): HTML response object.
+        html (requests.models.Response): HTML response object, released once the
+            page has been parsed.
         _selected_provider (str): Currently selected provider.
         _selected_language (str): Currently selected language.
     """
 
+    __slots__ = (
+        "site",
+        "site_config",
+        "base_url",
+        "stream_path",
+        "anime_title",
+        "title_german",
+        "title_english",
+        "season",
+        "episode",
+        "slug",
+        "link",
+        "mal_id",
+        "redirect_link",
+        "embeded_link",
+        "direct_link",
+        "provider",
+        "provider_name",
+        "language",
+        "language_name",
+        "season_episode_count",
+        "has_movies",
+        "movie_episode_count",
+        "_selected_provider",
+        "_selected_language",
+        "_html_cache",
+        "_page_cache",
+        "_provider_cache",
+        "_language_cache",
+        "_ranked_direct_links",
+        "_basic_details_filled",
+        "_full_details_filled",
+        "__weakref__",
+    )
+
     def __init__(
         self,
         anime_title: Optional[str] = None,
@@ -609,8 +703,10 @@ class Episode:
 
         # Cache for HTML and other expensive operations
         self._html_cache = html
+        self._page_cache = None
         self._provider_cache = None
         self._language_cache = None
+        self._ranked_direct_links = []
         self._basic_details_filled = False
         self._full_details_filled = False
 
@@ -635,10 +731,10 @@ class Episode:
                 raise ValueError("Cannot fetch HTML without episode link")
 
             try:
-                self._html_cache = requests.get(
+                self._html_cache = get_http_session().get(
                     self.link,
                     timeout=DEFAULT_REQUEST_TIMEOUT,
-                    headers={"User-Agent": RANDOM_USER_AGENT},
+                    headers={"User-Agent": config.RANDOM_USER_AGENT},
                 )
                 self._html_cache.raise_for_status()
             except requests.RequestException as err:
@@ -649,6 +745,22 @@ class Episode:
 
         return self._html_cache
 
+    @property
+    def page(self) -> "EpisodePage":
+        """
+        Lazy-parsed episode page shared by all HTML extractors, the HTML
+        response is released once parsed.
+
+        Returns:
+            EpisodePage with titles, languages and providers
+        """
+        if self._page_cache is None:
+            self._page_cache = EpisodePage(self.html.content, self.base_url)
+            # Only the extracted state is kept, not the whole response
+            self._html_cache = None
+
+        return self._page_cache
+
     def _get_episode_titles_from_html(self) -> Tuple[str, str]:
         """
         Extract episode titles from HTML.
@@ -657,19 +769,7 @@ class Episode:
             Tuple of (german_title, english_title)
         """
         try:
-            episode_soup = BeautifulSoup(self.html.content, "html.parser")
-
-            german_title_div = episode_soup.find("span", class_="episodeGermanTitle")
-            english_title_div = episode_soup.find("small", class_="episodeEnglishTitle")
-
-            german_title = (
-                german_title_div.get_text(strip=True) if german_title_div else ""
-            )
-            english_title = (
-                english_title_div.get_text(strip=True) if english_title_div else ""
-            )
-
-            return german_title, english_title
+            return self.page.title_german, self.page.title_english
 
         except Exception as err:
             logging.error("Error extracting episode titles: %s", err)
@@ -738,10 +838,9 @@ class Episode:
                 f"Failed to extract episode from link '{self.link}': {err}"
             ) from err
 
-    @lru_cache(maxsize=32)
     def _get_available_languages_from_html(self) -> List[int]:
         """
-        Extract available language codes from HTML with caching.
+        Extract available language codes from HTML, memoized per episode.
 
         Language Codes:
             1: German Dub
@@ -751,34 +850,28 @@ class Episode:
         Returns:
             List of available language codes
         """
-        try:
-            episode_soup = BeautifulSoup(self.html.content, "html.parser")
-            change_language_box = episode_soup.find("div", class_="changeLanguageBox")
+        if self._language_cache is not None:
+            return list(self._language_cache)
 
-            if not change_language_box:
+        try:
+            if not self.page.has_language_box:
                 logging.warning(
                     "No language selection box found for episode: %s", self.link
                 )
-                return []
-
-            language_codes = []
-            img_tags = change_language_box.find_all("img")
+                self._language_cache = []
+            else:
+                self._language_cache = list(self.page.languages)
 
-            for img in img_tags:
-                lang_key = img.get("data-lang-key")
-                if lang_key and lang_key.isdigit():
-                    language_codes.append(int(lang_key))
-
-            return sorted(language_codes)
+            return list(self._language_cache)
 
         except Exception as err:
             logging.error("Error extracting language codes: %s", err)
             return []
 
-    @lru_cache(maxsize=32)
     def _get_providers_from_html(self) -> Dict[str, Dict[int, str]]:
         """
-        Extract streaming providers from HTML with caching.
+        Extract streaming providers from HTML, memoized per episode and
+        shared across episode objects through the metadata cache.
 
         Returns:
             Dictionary mapping provider names to language-URL mappings
@@ -794,29 +887,27 @@ class Episode:
         Raises:
             ValueError: If no providers found
         """
-        try:
-            soup = BeautifulSoup(self.html.content, "html.parser")
-            providers = {}
+        if self._provider_cache is not None:
+            return _copy_providers(self._provider_cache)
 
-            episode_links = soup.find_all(
-                "li", class_=lambda x: x and x.startswith("episodeLink")
-            )
+        cache = get_metadata_cache()
+        cached = cache.get("providers", self.link)
+        if cached:
+            # JSON turns the language keys into strings
+            self._provider_cache = {
+                provider_name: {int(lang_key): url for lang_key, url in urls.items()}
+                for provider_name, urls in cached.items()
+            }
+            return _copy_providers(self._provider_cache)
 
-            if not episode_links:
+        try:
+            if not self.page.episode_link_count:
                 raise ValueError(
                     f"No streams available for episode: {self.link}\n"
                     "Try again later or check in the community chat."
                 )
 
-            for link in episode_links:
-                provider_data = self._extract_provider_data(link)
-                if provider_data:
-                    provider_name, lang_key, redirect_url = provider_data
-
-                    if provider_name not in providers:
-                        providers[provider_name] = {}
-
-                    providers[provider_name][lang_key] = redirect_url
+            providers = _copy_providers(self.page.providers)
 
             if not providers:
                 raise ValueError(f"Could not extract providers from {self.link}")
@@ -827,50 +918,14 @@ class Episode:
                 json.dumps(providers, indent=2),
             )
 
-            return providers
+            cache.set("providers", self.link, providers)
+            self._provider_cache = providers
+            return _copy_providers(providers)
 
         except Exception as err:
             logging.error("Error extracting providers: %s", err)
             raise
 
-    def _extract_provider_data(self, link_element) -> Optional[Tuple[str, int, str]]:
-        """
-        Extract provider data from HTML element.
-
-        Args:
-            link_element: BeautifulSoup element containing provider data
-
-        Returns:
-            Tuple of (provider_name, lang_key, redirect_url) or None
-        """
-        try:
-            # Extract provider name
-            provider_name_tag = link_element.find("h4")
-            provider_name = (
-                provider_name_tag.get_text(strip=True) if provider_name_tag else None
-            )
-
-            # Extract redirect link
-            redirect_link_tag = link_element.find("a", class_="watchEpisode")
-            redirect_path = redirect_link_tag.get("href") if redirect_link_tag else None
-
-            # Extract language key
-            lang_key_str = link_element.get("data-lang-key")
-            lang_key = (
-                int(lang_key_str) if lang_key_str and lang_key_str.isdigit() else None
-            )
-
-            # Validate all required data is present
-            if provider_name and redirect_path and lang_key:
-                redirect_url = f"{self.base_url}{redirect_path}"
-                return provider_name, lang_key, redirect_url
-
-            return None
-
-        except (ValueError, AttributeError) as err:
-            logging.debug("Failed to extract provider data from element: %s", err)
-            return None
-
     def _get_language_key_from_name(self, language_name: str) -> int:
         """
         Convert language name to language key using site-specific mappings.
@@ -930,27 +985,33 @@ class Episode:
 
         return language_names
 
-    def _get_direct_link_from_provider(self) -> str:
+    def _get_direct_link_from_provider(
+        self, provider: Optional[str] = None, embeded_link: Optional[str] = None
+    ) -> str:
         """
         Get direct streaming link from the selected provider.
 
+        Args:
+            provider: Provider to extract from (defaults to the selected provider)
+            embeded_link: Embedded link of that provider (defaults to embeded_link)
+
         Returns:
             Direct streaming link
 
         Raises:
             ValueError: If provider is not supported or extraction fails
         """
-        provider = self._selected_provider
-
-        if provider not in SUPPORTED_PROVIDERS:
-            raise ValueError(
-                f"Provider '{provider}' is currently not supported. "
-                f"Supported providers: {SUPPORTED_PROVIDERS}"
-            )
+        provider = provider or self._selected_provider
+        embeded_link = embeded_link or self.embeded_link
 
-        if not self.embeded_link:
-            raise ValueError("No embedded link available for direct link extraction")
+        cache_key = _prepare_direct_link(provider, embeded_link)
+        cached = get_direct_link_cache().get(provider, cache_key)
+        if cached:
+            logging.debug("Reusing cached direct link from '%s'", provider)
+            return cached
 
+        _ensure_provider_available(provider)
+        start = time.perf_counter()
         try:
             module = importlib.import_module("aniworld.extractors")
             func_name = f"get_direct_link_from_{provider.lower()}"
@@ -959,28 +1020,11 @@ class Episode:
                 raise ValueError(f"Extractor function '{func_name}' not found")
 
             func = getattr(module, func_name)
-
-            # Prepare kwargs for the extractor function
-            kwargs = {f"embeded_{provider.lower()}_link": self.embeded_link}
-
-            # Special case for Luluvdo which needs arguments
-            if provider == "Luluvdo":
-                kwargs["arguments"] = arguments
-
-            direct_link = func(**kwargs)
-
-            if not direct_link:
-                raise ValueError(f"Provider '{provider}' returned empty direct link")
-
-            return direct_link
+            direct_link = func(**_get_extractor_kwargs(provider, embeded_link))
+            return _store_direct_link(provider, cache_key, direct_link, start)
 
         except Exception as err:
-            logging.error(
-                "Error getting direct link from provider '%s': %s", provider, err
-            )
-            raise ValueError(
-                f"Failed to get direct link from provider '{provider}': {err}"
-            ) from err
+            raise _direct_link_error(provider, err) from err
 
     def get_redirect_link(self) -> Optional[str]:
         """
@@ -994,18 +1038,20 @@ class Episode:
             self.auto_fill_details()
 
             lang_key = self._get_language_key_from_name(self._selected_language)
-
-            # Check if selected provider and language combination exists
-            if (
+            health = get_provider_health()
+            selected_available = (
                 self._selected_provider in self.provider
                 and lang_key in self.provider[self._selected_provider]
-            ):
+            )
+
+            # Check if selected provider and language combination exists
+            if selected_available and health.is_available(self._selected_provider):
                 self.redirect_link = self.provider[self._selected_provider][lang_key]
                 return self.redirect_link
 
-            # Fallback: find any provider with the selected language
+            # Fallback: find any working provider with the selected language
             for provider_name, lang_dict in self.provider.items():
-                if lang_key in lang_dict:
+                if lang_key in lang_dict and health.is_available(provider_name):
                     logging.info(
                         "Switching provider from '%s' to '%s' for language '%s' on site '%s'",
                         self._selected_provider,
@@ -1017,6 +1063,12 @@ class Episode:
                     self.redirect_link = lang_dict[lang_key]
                     return self.redirect_link
 
+            # Every provider is failing, give the selected one a last attempt
+            if selected_available:
+                health.allow_retry(self._selected_provider)
+                self.redirect_link = self.provider[self._selected_provider][lang_key]
+                return self.redirect_link
+
             # No provider found with selected language
             available_langs = set()
             for lang_dict in self.provider.values():
@@ -1061,15 +1113,7 @@ class Episode:
             return None
 
         try:
-            response = requests.get(
-                self.redirect_link,
-                timeout=DEFAULT_REQUEST_TIMEOUT,
-                headers={"User-Agent": RANDOM_USER_AGENT},
-                allow_redirects=True,
-            )
-            response.raise_for_status()
-
-            self.embeded_link = response.url
+            self.embeded_link = _get_embeded_link(self.redirect_link)
             return self.embeded_link
 
         except requests.RequestException as err:
@@ -1123,6 +1167,212 @@ class Episode:
             self.direct_link = None
             return None
 
+    async def _aget_direct_link_from_provider(self) -> str:
+        """
+        Async counterpart of _get_direct_link_from_provider.
+
+        Providers without an async extractor run in a worker thread.
+
+        Returns:
+            Direct streaming link
+
+        Raises:
+            ValueError: If provider is not supported or extraction fails
+        """
+        provider = self._selected_provider
+        embeded_link = self.embeded_link
+
+        cache_key = _prepare_direct_link(provider, embeded_link)
+        cached = await get_direct_link_cache().aget(provider, cache_key)
+        if cached:
+            logging.debug("Reusing cached direct link from '%s'", provider)
+            return cached
+
+        _ensure_provider_available(provider)
+        start = time.perf_counter()
+        try:
+            module = importlib.import_module("aniworld.extractors")
+            kwargs = _get_extractor_kwargs(provider, embeded_link)
+
+            async_func = getattr(module, f"aget_direct_link_from_{provider.lower()}", None)
+            if async_func is not None:
+                direct_link = await async_func(**kwargs)
+            else:
+                func_name = f"get_direct_link_from_{provider.lower()}"
+                if not hasattr(module, func_name):
+                    raise ValueError(f"Extractor function '{func_name}' not found")
+                direct_link = await asyncio.to_thread(getattr(module, func_name), **kwargs)
+
+            return _store_direct_link(provider, cache_key, direct_link, start)
+
+        except Exception as err:
+            raise _direct_link_error(provider, err) from err
+
+    async def aget_direct_link(
+        self, provider: Optional[str] = None, language: Optional[str] = None
+    ) -> Optional[str]:
+        """
+        Async counterpart of get_direct_link.
+
+        The episode page, the redirect and the extractor requests share one
+        aiohttp session, so many episodes can be resolved concurrently on a
+        single event loop.
+
+        Args:
+            provider: Provider name to use (overrides selected provider)
+            language: Language to use (overrides selected language)
+
+        Returns:
+            Direct streaming link or None if unavailable
+        """
+        if provider:
+            self._selected_provider = provider
+
+        if language:
+            self._selected_language = language
+
+        if self._selected_provider not in SUPPORTED_PROVIDERS:
+            logging.error("Provider '%s' is not supported", self._selected_provider)
+            return None
+
+        try:
+            if not self.embeded_link:
+                if not self.redirect_link:
+                    await self._aload_page()
+                    if not self.get_redirect_link():
+                        logging.error("Failed to get redirect link")
+                        return None
+
+                self.embeded_link = await _aget_embeded_link(self.redirect_link)
+
+            self.direct_link = await self._aget_direct_link_from_provider()
+            return self.direct_link
+
+        except Exception as err:
+            logging.error("Error getting direct link: %s", err)
+            self.direct_link = None
+            return None
+
+    async def _aload_page(self) -> None:
+        """Fetch the episode page on the aiohttp session unless details are known"""
+        if self._full_details_filled or self._page_cache is not None:
+            return
+        if self._html_cache is not None or not self.link:
+            return
+
+        async with get_async_http_session().get(
+            self.link, headers={"User-Agent": config.RANDOM_USER_AGENT}
+        ) as response:
+            response.raise_for_status()
+            content = await response.read()
+        self._page_cache = EpisodePage(content, self.base_url)
+
+    def _resolve_and_probe(
+        self, provider: str, redirect_link: str
+    ) -> Optional[Tuple[str, str, str, float]]:
+        """
+        Resolve the direct link of one provider and measure its throughput.
+
+        Returns:
+            (provider, embedded link, direct link, bytes per second) or None
+            if the provider failed
+        """
+        try:
+            embeded_link = _get_embeded_link(redirect_link)
+            direct_link = self._get_direct_link_from_provider(provider, embeded_link)
+        except (requests.RequestException, ValueError) as err:
+            logging.debug("Provider '%s' dropped out of the race: %s", provider, err)
+            return None
+
+        throughput = _probe_direct_link(provider, direct_link)
+        if throughput is None:
+            return None
+        return provider, embeded_link, direct_link, throughput
+
+    def race_direct_link(self) -> Optional[str]:
+        """
+        Get the direct link of the fastest provider for the selected language.
+
+        The direct links of all supported providers offering the language are
+        resolved in parallel and probed with a small ranged request. The
+        fastest one is selected, the others are kept for next_direct_link.
+
+        Returns:
+            Direct streaming link or None if no provider works
+        """
+        try:
+            self.auto_fill_details()
+            lang_key = self._get_language_key_from_name(self._selected_language)
+        except Exception as err:
+            logging.error("Error preparing provider race: %s", err)
+            return None
+
+        health = get_provider_health()
+        candidates = [
+            (provider, lang_dict[lang_key])
+            for provider, lang_dict in self.provider.items()
+            if provider in SUPPORTED_PROVIDERS
+            and lang_key in lang_dict
+            and health.is_available(provider)
+        ]
+        if not candidates:
+            logging.warning(
+                "No supported provider found for language '%s'", self._selected_language
+            )
+            return None
+
+        with ThreadPoolExecutor(
+            max_workers=min(PROVIDER_RACE_CONCURRENCY, len(candidates)),
+            thread_name_prefix="provider-race",
+        ) as executor:
+            results = list(
+                executor.map(lambda args: self._resolve_and_probe(*args), candidates)
+            )
+
+        ranked = sorted(
+            (result for result in results if result),
+            key=lambda result: result[3],
+            reverse=True,
+        )
+        for provider, _, _, throughput in ranked:
+            logging.debug(
+                "Provider '%s' probed at %.0f KiB/s", provider, throughput / 1024
+            )
+
+        self._ranked_direct_links = [
+            (provider, embeded_link, direct_link)
+            for provider, embeded_link, direct_link, _ in ranked
+        ]
+        return self._use_ranked_direct_link()
+
+    def next_direct_link(self) -> Optional[str]:
+        """
+        Switch to the next fastest provider after a failed download.
+
+        Returns:
+            Direct streaming link or None if no raced provider is left
+        """
+        if self._ranked_direct_links:
+            self._ranked_direct_links.pop(0)
+        return self._use_ranked_direct_link()
+
+    def _use_ranked_direct_link(self) -> Optional[str]:
+        """Select the fastest remaining provider of the last race"""
+        if not self._ranked_direct_links:
+            self.direct_link = None
+            return None
+
+        provider, self.embeded_link, self.direct_link = self._ranked_direct_links[0]
+        if provider != self._selected_provider:
+            logging.info(
+                "Using provider '%s' instead of '%s'", provider, self._selected_provider
+            )
+        self._selected_provider = provider
+        self.redirect_link = self.provider.get(provider, {}).get(
+            self._get_language_key_from_name(self._selected_language)
+        )
+        return self.direct_link
+
     def _get_preview_image_link_from_provider(self) -> str:
         """
         Get preview image link from the given provider.
@@ -1285,10 +1535,9 @@ class Episode:
             if self.link:
                 try:
                     # Get anime title if missing
+                    # Titles, languages and providers share one parse
                     if not self.anime_title:
-                        self.anime_title = get_anime_title_from_html(
-                            self.html, self.site
-                        )
+                        self.anime_title = self.page.anime_title
 
                     # Get episode titles if missing
                     if not self.title_german and not self.title_english:
@@ -1417,50 +1666,486 @@ class Episode:
         )
 
 
+def _resolve_redirect(url: str) -> str:
+    """
+    Follow a redirect chain by reading only the Location headers.
+
+    Args:
+        url: URL to resolve (e.g. an aniworld.to /redirect/ link)
+
+    Returns:
+        Final URL of the chain
+
+    Raises:
+        requests.RequestException: If a request fails or the chain is too long
+    """
+    session = get_http_session()
+    for _ in range(MAX_REDIRECT_HOPS):
+        # stream=True stops requests from downloading the hoster's embed page
+        with session.get(
+            url,
+            timeout=DEFAULT_REQUEST_TIMEOUT,
+            headers={"User-Agent": config.RANDOM_USER_AGENT},
+            allow_redirects=False,
+            stream=True,
+        ) as response:
+            if not response.is_redirect:
+                response.raise_for_status()
+                return url
+            url = urljoin(url, response.headers["Location"])
+
+    raise requests.TooManyRedirects(f"Exceeded {MAX_REDIRECT_HOPS} redirects")
+
+
+async def _aresolve_redirect(url: str) -> str:
+    """Async counterpart of _resolve_redirect"""
+    session = get_async_http_session()
+    for _ in range(MAX_REDIRECT_HOPS):
+        async with session.get(
+            url, headers={"User-Agent": config.RANDOM_USER_AGENT}, allow_redirects=False
+        ) as response:
+            if response.status not in (301, 302, 303, 307, 308):
+                response.raise_for_status()
+                return url
+            url = urljoin(url, response.headers["Location"])
+
+    raise requests.TooManyRedirects(f"Exceeded {MAX_REDIRECT_HOPS} redirects")
+
+
+async def _aget_embeded_link(redirect_link: str) -> str:
+    """Async counterpart of _get_embeded_link"""
+    cache = get_metadata_cache()
+    cached = cache.get("redirect", redirect_link)
+    if cached:
+        return cached
+
+    embeded_link = await _aresolve_redirect(redirect_link)
+    cache.set("redirect", redirect_link, embeded_link)
+    return embeded_link
+
+
+def _direct_link_cache_key(provider: str, embeded_link: str) -> str:
+    """Key of a direct link in the direct link cache"""
+    # Luluvdo hands out different links for streaming and downloading
+    if provider == "Luluvdo":
+        return f"{getattr(arguments, 'action', '')}|{embeded_link}"
+    return embeded_link
+
+
+def _prepare_direct_link(provider: str, embeded_link: Optional[str]) -> str:
+    """
+    Validate a direct link extraction and build its cache key.
+
+    Args:
+        provider: Provider to extract from
+        embeded_link: Embedded link of that provider
+
+    Returns:
+        Key of the direct link in the direct link cache
+
+    Raises:
+        ValueError: If provider is not supported or there is no embedded link
+    """
+    if provider not in SUPPORTED_PROVIDERS:
+        raise ValueError(
+            f"Provider '{provider}' is currently not supported. "
+            f"Supported providers: {SUPPORTED_PROVIDERS}"
+        )
+
+    if not embeded_link:
+        raise ValueError("No embedded link available for direct link extraction")
+
+    return _direct_link_cache_key(provider, embeded_link)
+
+
+def _ensure_provider_available(provider: str) -> None:
+    """Skip providers with an open circuit instead of waiting for their timeout"""
+    if not get_provider_health().is_available(provider):
+        raise ValueError(f"Provider '{provider}' is skipped after repeated failures")
+
+
+def _get_extractor_kwargs(provider: str, embeded_link: str) -> Dict[str, Any]:
+    """Build the keyword arguments of a provider's extractor function"""
+    kwargs = {f"embeded_{provider.lower()}_link": embeded_link}
+
+    # Special case for Luluvdo which needs arguments
+    if provider == "Luluvdo":
+        kwargs["arguments"] = arguments
+
+    return kwargs
+
+
+def _store_direct_link(
+    provider: str, cache_key: str, direct_link: Optional[str], start: float
+) -> str:
+    """
+    Record a successful extraction and cache its direct link.
+
+    Args:
+        provider: Provider the link was extracted from
+        cache_key: Key from _prepare_direct_link
+        direct_link: Link returned by the extractor
+        start: perf_counter value from before the extraction
+
+    Returns:
+        The direct link
+
+    Raises:
+        ValueError: If the extractor returned no link
+    """
+    if not direct_link:
+        raise ValueError(f"Provider '{provider}' returned empty direct link")
+
+    get_provider_health().record_success(provider, time.perf_counter() - start)
+    get_direct_link_cache().set(provider, cache_key, direct_link)
+    return direct_link
+
+
+def _direct_link_error(provider: str, err: Exception) -> ValueError:
+    """Log a failed extraction and build the error to raise from it"""
+    # Extraction bugs are logged but do not mark the hoster as down
+    if is_hoster_failure(err):
+        get_provider_health().record_failure(provider, err)
+    logging.error("Error getting direct link from provider '%s': %s", provider, err)
+    return ValueError(f"Failed to get direct link from provider '{provider}': {err}")
+
+
+async def aget_direct_links(
+    episodes: List["Episode"], concurrency: int = ASYNC_RESOLVE_CONCURRENCY
+) -> List[Optional[str]]:
+    """
+    Resolve the direct links of many episodes concurrently on the running loop.
+
+    Args:
+        episodes: Episodes to resolve
+        concurrency: Episodes resolved at once
+
+    Returns:
+        Direct links in the order of the episodes, None where resolving failed
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def resolve(episode: "Episode") -> Optional[str]:
+        async with semaphore:
+            return await episode.aget_direct_link()
+
+    return await asyncio.gather(*(resolve(episode) for episode in episodes))
+
+
+def get_direct_links(
+    episodes: List["Episode"], concurrency: int = ASYNC_RESOLVE_CONCURRENCY
+) -> List[Optional[str]]:
+    """
+    Resolve the direct links of many episodes concurrently on a single thread.
+
+    Args:
+        episodes: Episodes to resolve
+        concurrency: Episodes resolved at once
+
+    Returns:
+        Direct links in the order of the episodes, None where resolving failed
+    """
+
+    async def run() -> List[Optional[str]]:
+        try:
+            return await aget_direct_links(episodes, concurrency)
+        finally:
+            await close_async_http_session()
+
+    return asyncio.run(run())
+
+
+def _get_embeded_link(redirect_link: str) -> str:
+    """Resolve a redirect link to its embedded link, using the metadata cache"""
+    cache = get_metadata_cache()
+    cached = cache.get("redirect", redirect_link)
+    if cached:
+        return cached
+
+    embeded_link = _resolve_redirect(redirect_link)
+    cache.set("redirect", redirect_link, embeded_link)
+    return embeded_link
+
+
+def _is_hls_playlist(url: str, response: requests.Response) -> bool:
+    """Check whether a response is an HLS playlist instead of video data"""
+    content_type = response.headers.get("Content-Type", "").lower()
+    return "mpegurl" in content_type or urlparse(url).path.endswith(".m3u8")
+
+
+def _first_hls_uri(playlist_url: str, playlist: str) -> Optional[str]:
+    """
+    Get the first variant or segment listed in an HLS playlist.
+
+    Args:
+        playlist_url: URL of the playlist, relative entries are resolved against it
+        playlist: Content of the playlist
+
+    Returns:
+        Absolute URL of the first entry or None if the playlist lists nothing
+    """
+    for line in playlist.splitlines():
+        line = line.strip()
+        if line and not line.startswith("#"):
+            return urljoin(playlist_url, line)
+    return None
+
+
+def _probe_direct_link(provider: str, direct_link: str) -> Optional[float]:
+    """
+    Measure the throughput of a direct link with a small ranged request.
+
+    VOE, Filemoon and Vidmoly hand out HLS playlists of a few KB, which
+    would always look slow. Those are followed to their first segment and
+    the segment is measured instead.
+
+    Args:
+        provider: Provider the link belongs to, for its download headers
+        direct_link: Direct link to probe
+
+    Returns:
+        Bytes per second or None if the link does not answer
+    """
+    headers = {
+        "Range": f"bytes=0-{PROVIDER_PROBE_BYTES - 1}",
+        **config.get_download_headers(provider),
+    }
+
+    url = direct_link
+    try:
+        for _ in range(PROVIDER_PROBE_MAX_PLAYLISTS + 1):
+            start = time.perf_counter()
+            with get_http_session().get(
+                url,
+                headers=headers,
+                timeout=PROVIDER_PROBE_TIMEOUT,
+                stream=True,
+                verify=False,
+            ) as response:
+                if response.status_code not in (200, 206):
+                    logging.debug(
+                        "Probe of '%s' failed with status %d",
+                        provider,
+                        response.status_code,
+                    )
+                    if response.status_code in config.HTTP_RETRY_STATUS_CODES:
+                        get_provider_health().record_failure(
+                            provider, f"Probe returned HTTP {response.status_code}"
+                        )
+                    return None
+
+                # Servers ignoring the range would send the whole video
+                received = bytearray()
+                for chunk in response.iter_content(chunk_size=64 * 1024):
+                    received += chunk
+                    if len(received) >= PROVIDER_PROBE_BYTES:
+                        break
+
+                if not _is_hls_playlist(url, response):
+                    break
+            url = _first_hls_uri(url, received.decode("utf-8", "replace"))
+            if url is None:
+                logging.debug("Probe of '%s' found an empty HLS playlist", provider)
+                return None
+        else:
+            logging.debug("Probe of '%s' found no HLS segment", provider)
+            return None
+    except requests.RequestException as err:
+        logging.debug("Probe of '%s' failed: %s", provider, err)
+        if is_hoster_failure(err):
+            get_provider_health().record_failure(provider, err)
+        return None
+
+    # The throughput of a short probe is not comparable to the one of a whole
+    # download, only the download is recorded in the provider health
+    get_provider_health().record_success(provider)
+    return len(received) / max(time.perf_counter() - start, 1e-6)
+
+
+def _copy_providers(providers: Dict[str, Dict[int, str]]) -> Dict[str, Dict[int, str]]:
+    """Copy a provider map so callers cannot change a memoized one"""
+    return {provider_name: dict(urls) for provider_name, urls in providers.items()}
+
+
+def _class_xpath(tag: str, class_name: str) -> str:
+    """XPath matching tags carrying class_name among their classes"""
+    return (
+        f'.//{tag}[contains(concat(" ", normalize-space(@class), " "), " {class_name} ")]'
+    )
+
+
+def _get_text(element) -> str:
+    """Text content of an element like BeautifulSoup's get_text(strip=True)"""
+    return "".join(text.strip() for text in element.xpath(".//text()"))
+
+
+def _find_first(element, xpath: str):
+    """First element matching xpath or None"""
+    matches = element.xpath(xpath)
+    return matches[0] if matches else None
+
+
+def _extract_series_title(document) -> str:
+    """Extract the anime title from a parsed series or episode page"""
+    # <div class="series-title"><h1><span>Title</span></h1>...</div>
+    title_div = _find_first(document, _class_xpath("div", "series-title"))
+    if title_div is None:
+        return ""
+
+    heading = _find_first(title_div, ".//h1")
+    if heading is not None:
+        span_element = _find_first(heading, ".//span")
+        return _get_text(span_element if span_element is not None else heading)
+
+    # Fallback to div text
+    return _get_text(title_div)
+
+
+def _extract_provider_data(
+    link_element, base_url: str
+) -> Optional[Tuple[str, int, str]]:
+    """
+    Extract provider data from a parsed episodeLink element.
+
+    Args:
+        link_element: lxml element of a single hoster entry
+        base_url: Site base URL the redirect path is relative to
+
+    Returns:
+        Tuple of (provider_name, lang_key, redirect_url) or None
+    """
+    provider_name_tag = _find_first(link_element, ".//h4")
+    provider_name = _get_text(provider_name_tag) if provider_name_tag is not None else None
+
+    redirect_link_tag = _find_first(link_element, _class_xpath("a", "watchEpisode"))
+    redirect_path = (
+        redirect_link_tag.get("href") if redirect_link_tag is not None else None
+    )
+
+    lang_key_str = link_element.get("data-lang-key")
+    lang_key = int(lang_key_str) if lang_key_str and lang_key_str.isdigit() else None
+
+    # Validate all required data is present
+    if provider_name and redirect_path and lang_key:
+        return provider_name, lang_key, f"{base_url}{redirect_path}"
+
+    return None
+
+
+class EpisodePage:
+    """
+    Data extracted from an episode page in a single lxml parse.
+
+    Attributes:
+        anime_title: Anime title from the series header
+        title_german: German episode title
+        title_english: English episode title
+        has_language_box: Whether the page has a language selection box
+        languages: Sorted available language codes
+        episode_link_count: Number of hoster entries on the page
+        providers: Provider name -> {language code: redirect URL}
+    """
+
+    __slots__ = (
+        "anime_title",
+        "title_german",
+        "title_english",
+        "has_language_box",
+        "languages",
+        "episode_link_count",
+        "providers",
+    )
+
+    def __init__(self, content: bytes, base_url: str) -> None:
+        """
+        Parse an episode page.
+
+        Args:
+            content: Raw HTML of the episode page
+            base_url: Site base URL for building redirect links
+        """
+        document = lxml_html.fromstring(content)
+
+        self.anime_title = _extract_series_title(document)
+
+        german_title = _find_first(document, _class_xpath("span", "episodeGermanTitle"))
+        english_title = _find_first(
+            document, _class_xpath("small", "episodeEnglishTitle")
+        )
+        self.title_german = _get_text(german_title) if german_title is not None else ""
+        self.title_english = (
+            _get_text(english_title) if english_title is not None else ""
+        )
+
+        language_box = _find_first(document, _class_xpath("div", "changeLanguageBox"))
+        self.has_language_box = language_box is not None
+        self.languages = []
+        if language_box is not None:
+            self.languages = sorted(
+                int(lang_key)
+                for lang_key in language_box.xpath(".//img/@data-lang-key")
+                if lang_key.isdigit()
+            )
+
+        # Hoster entries use classes like "episodeLink1234"
+        episode_links = document.xpath(
+            './/li[contains(concat(" ", normalize-space(@class)), " episodeLink")]'
+        )
+        self.episode_link_count = len(episode_links)
+        self.providers = {}
+        for link in episode_links:
+            provider_data = _extract_provider_data(link, base_url)
+            if provider_data:
+                provider_name, lang_key, redirect_url = provider_data
+                self.providers.setdefault(provider_name, {})[lang_key] = redirect_url
+
+
+class AnimePage:
+    """
+    Data extracted from an anime series page in a single lxml parse.
+
+    Attributes:
+        title: Anime title from the series header
+        description_german: German description or None if the page has none
+    """
+
+    __slots__ = ("title", "description_german")
+
+    def __init__(self, content: bytes) -> None:
+        """
+        Parse an anime series page.
+
+        Args:
+            content: Raw HTML of the series page
+        """
+        document = lxml_html.fromstring(content)
+
+        self.title = _extract_series_title(document)
+
+        self.description_german = None
+        description = _find_first(document, _class_xpath("p", "seri_des"))
+        if description is not None:
+            # Fallback to the paragraph text content
+            self.description_german = description.get(
+                "data-full-description"
+            ) or _get_text(description)
+
+
 def get_anime_title_from_html(
     html: requests.models.Response, site: str = "aniworld.to"
 ) -> str:
     """
-    Extract anime title from HTML response with site-specific parsing.
+    Extract anime title from HTML response.
 
     Args:
         html: HTTP response object containing the page HTML
-        site: The streaming site being used for parsing adjustments
+        site: The streaming site the page belongs to (used for logging)
 
     Returns:
         Anime title string or empty string if not found
     """
     try:
-        soup = BeautifulSoup(html.content, "html.parser")
-
-        # Site-specific title extraction
-        if site == S_TO:
-            # S_TO uses: <div class="series-title"><h1><span>Title</span></h1>...</div>
-            title_div = soup.find("div", class_="series-title")
-            if title_div:
-                title_span = title_div.find("h1")
-                if title_span:
-                    span_element = title_span.find("span")
-                    if span_element:
-                        return span_element.get_text(strip=True)
-                    return title_span.get_text(strip=True)
-                return title_div.get_text(strip=True)
-        else:  # aniworld.to (default)
-            title_div = soup.find("div", class_="series-title")
-
-        if title_div:
-            # Try different title extraction methods
-            title_span = title_div.find("h1")
-            if title_span:
-                span_element = title_span.find("span")
-                if span_element:
-                    return span_element.get_text(strip=True)
-                return title_span.get_text(strip=True)
-
-            # Fallback to div text
-            return title_div.get_text(strip=True)
-
-        return ""
+        return _extract_series_title(lxml_html.fromstring(html.content))
 
     except Exception as err:
         logging.error("Error extracting anime title from %s: %s", site, err)
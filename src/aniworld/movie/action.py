@@ -1,12 +1,12 @@
 import os
 import logging
-import yt_dlp
 import re
 import requests
-from ..config import DEFAULT_MOVIE_DOWNLOAD_PATH, RANDOM_USER_AGENT, MEGAKINO_URL
+from .. import config
+from ..config import DEFAULT_MOVIE_DOWNLOAD_PATH, MEGAKINO_URL
 from ..models import Movie
 from ..action.common import sanitize_filename
-from ..extractors.provider.voe import get_direct_link_from_voe
+from .. import extractors
 
 def megakino_get_voe_link(movie_url: str) -> str or None:
     """
@@ -15,10 +15,15 @@ def megakino_get_voe_link(movie_url: str) -> str or None:
     try:
         with requests.Session() as s:
             # Handle anti-bot token
-            s.get(f"{MEGAKINO_URL}/index.php?yg=token", headers={"User-Agent": RANDOM_USER_AGENT})
+            s.get(
+                f"{MEGAKINO_URL}/index.php?yg=token",
+                headers={"User-Agent": config.RANDOM_USER_AGENT},
+            )
 
             # Get movie page content
-            response = s.get(movie_url, headers={"User-Agent": RANDOM_USER_AGENT})
+            response = s.get(
+                movie_url, headers={"User-Agent": config.RANDOM_USER_AGENT}
+            )
             response.raise_for_status()
 
             # Find the voe.sx link in the iframe's data-src attribute
@@ -46,6 +51,8 @@ def download_movie(movie: Movie, progress_callback=None) -> bool:
     Downloads a movie from megakino by first extracting the voe.sx link,
     then getting the direct video URL from VOE, and finally downloading with yt-dlp.
     """
+    import yt_dlp
+
     try:
         # Step 1: Get the voe.sx embed link from the movie page.
         voe_embed_link = megakino_get_voe_link(movie.link)
@@ -55,7 +62,7 @@ def download_movie(movie: Movie, progress_callback=None) -> bool:
             return False
 
         # Step 2: Use the existing VOE extractor to get the final, direct video link.
-        direct_link = get_direct_link_from_voe(voe_embed_link)
+        direct_link = extractors.get_direct_link_from_voe(voe_embed_link)
         if not direct_link:
             if progress_callback:
                 progress_callback({'status': 'error', 'error': 'Failed to extract direct link from VOE.'})
@@ -16,11 +16,12 @@ import requests
 from .common import (
     download_mpv,
     download_syncplay,
+    get_provider_health,
     remove_anime4k,
     remove_mpv_scripts,
 )
-from .extractors.provider.hanime import get_direct_link_from_hanime
 from .anime4k import download_anime4k
+from . import extractors
 from . import config
 
 
@@ -77,7 +78,7 @@ def get_random_anime_slug(genre: str) -> Optional[str]:
     headers = {"User-Agent": config.RANDOM_USER_AGENT}
 
     try:
-        response = requests.post(
+        response = config.get_http_session().post(
             url, data=data, headers=headers, timeout=config.DEFAULT_REQUEST_TIMEOUT
         )
         response.raise_for_status()
@@ -196,6 +197,13 @@ def _add_action_arguments(parser: argparse.ArgumentParser) -> None:
         type=CaseInsensitiveChoices(config.SUPPORTED_PROVIDERS),
         help="Specify the preferred provider.",
     )
+    action_opts.add_argument(
+        "-R",
+        "--race-providers",
+        action="store_true",
+        default=config.DEFAULT_RACE_PROVIDERS,
+        help="Resolve all providers in parallel and download from the fastest one.",
+    )
 
 
 def _add_anime4k_arguments(parser: argparse.ArgumentParser) -> None:
@@ -271,6 +279,12 @@ def _add_miscellaneous_arguments(parser: argparse.ArgumentParser) -> None:
         action="store_true",
         help="Skip anime intros and outros using Aniskip.",
     )
+    misc_opts.add_argument(
+        "--aniskip-script-opts",
+        action="store_true",
+        default=config.DEFAULT_ANISKIP_SCRIPT_OPTS,
+        help="Pass Aniskip times to MPV as script options without chapter files.",
+    )
     misc_opts.add_argument(
         "-K",
         "--keep-watching",
@@ -297,6 +311,12 @@ def _add_miscellaneous_arguments(parser: argparse.ArgumentParser) -> None:
         action="store_true",
         help="Output only the execution command.",
     )
+    misc_opts.add_argument(
+        "-H",
+        "--provider-health",
+        action="store_true",
+        help="Show the health scores of the providers and exit.",
+    )
 
 
 def _handle_uninstall() -> None:
@@ -354,6 +374,35 @@ _____________________________
     sys.exit(0)
 
 
+def _handle_provider_health() -> None:
+    """Handle provider health display."""
+    scores = get_provider_health().get_scores()
+    if not scores:
+        print("No provider outcomes recorded yet.")
+        sys.exit(0)
+
+    print(f"{'Provider':<12} {'Score':>5} {'Latency':>8} {'Speed':>12} {'Errors':>7}  Status")
+    for provider, stats in sorted(
+        scores.items(), key=lambda item: item[1]["score"], reverse=True
+    ):
+        latency = f"{stats['latency']:.1f}s" if stats["latency"] is not None else "-"
+        speed = (
+            f"{stats['bytes_per_second'] / 1024 / 1024:.2f} MiB/s"
+            if stats["bytes_per_second"] is not None
+            else "-"
+        )
+        status = (
+            "ok"
+            if stats["available"]
+            else f"skipped for {stats['cooldown_remaining']}s"
+        )
+        print(
+            f"{provider:<12} {stats['score']:>5} {latency:>8} {speed:>12} "
+            f"{stats['failures']:>7}  {status}"
+        )
+    sys.exit(0)
+
+
 def _handle_provider_links(args: argparse.Namespace) -> None:
     """Handle provider link processing."""
     if not args.provider_link:
@@ -376,7 +425,7 @@ def _handle_provider_links(args: argparse.Namespace) -> None:
         # Process hanime.tv links
         for link in hanime_links:
             try:
-                direct_link = get_direct_link_from_hanime(link)
+                direct_link = extractors.get_direct_link_from_hanime(link)
                 if direct_link:
                     print(f"-> {link}")
                     print(f'"{direct_link}"')
@@ -640,6 +689,9 @@ def parse_arguments() -> argparse.Namespace:
     if args.version:
         _handle_version()
 
+    if args.provider_health:
+        _handle_provider_health()
+
     if args.anime4k:
         download_anime4k(args.anime4k)
 
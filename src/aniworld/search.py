@@ -15,7 +15,7 @@ import curses
 import requests
 
 from .ascii_art import display_ascii_art
-from .config import DEFAULT_REQUEST_TIMEOUT, ANIWORLD_TO, MEGAKINO_URL
+from .config import DEFAULT_REQUEST_TIMEOUT, ANIWORLD_TO, MEGAKINO_URL, get_http_session
 
 
 # Constants for better maintainability
@@ -80,7 +80,7 @@ def _cached_search_request(search_url: str) -> str:
     Returns:
         str: Raw response text
     """
-    response = requests.get(search_url, timeout=DEFAULT_REQUEST_TIMEOUT)
+    response = get_http_session().get(search_url, timeout=DEFAULT_REQUEST_TIMEOUT)
     response.raise_for_status()
     return response.text.strip()
 
@@ -257,7 +257,7 @@ def fetch_popular_and_new_anime() -> Dict[str, List[Dict[str, str]]]:
         Dictionary with 'popular' and 'new' keys containing lists of anime data
     """
     try:
-        response = requests.get(ANIWORLD_TO, timeout=DEFAULT_REQUEST_TIMEOUT)
+        response = get_http_session().get(ANIWORLD_TO, timeout=DEFAULT_REQUEST_TIMEOUT)
         response.raise_for_status()
 
         soup = BeautifulSoup(response.text, "html.parser")
@@ -42,8 +42,10 @@ class WebApp:
         )
         self.db = UserDatabase() if self.auth_enabled else None
 
-        # Download manager
-        self.download_manager = get_download_manager(self.db)
+        # Download manager, the queue is persisted even without authentication
+        self.download_manager = get_download_manager(self.db or UserDatabase())
+        # Resume downloads that were queued or interrupted before a restart
+        self.download_manager.start_queue_processor()
 
         # Create Flask app
         self.app = self._create_app()
@@ -627,6 +629,12 @@ class WebApp:
 
                     language = data.get("language", "German Sub")
                     provider = data.get("provider", "VOE")
+                    try:
+                        priority = self._parse_priority(
+                            data.get("priority", config.DEFAULT_DOWNLOAD_PRIORITY)
+                        )
+                    except ValueError as err:
+                        return jsonify({"success": False, "error": str(err)}), 400
 
                     # DEBUG: Log received parameters
                     logging.debug(
@@ -676,6 +684,7 @@ class WebApp:
                         provider=provider,
                         total_episodes=total_episodes,
                         created_by=current_user["id"] if current_user else None,
+                        priority=priority,
                     )
 
                     if not queue_id:
@@ -884,6 +893,64 @@ class WebApp:
                     {"success": False, "error": "Failed to get queue status"}
                 ), 500
 
+        @self.app.route("/api/providers/health")
+        @self._require_api_auth
+        def api_provider_health():
+            """Get provider health scores endpoint."""
+            try:
+                from ..common import get_provider_health
+
+                return jsonify(
+                    {"success": True, "providers": get_provider_health().get_scores()}
+                )
+            except Exception as e:
+                logging.error(f"Failed to get provider health: {e}")
+                return jsonify(
+                    {"success": False, "error": "Failed to get provider health"}
+                ), 500
+
+        @self.app.route("/api/queue/<int:queue_id>/priority", methods=["POST"])
+        @self._require_api_auth
+        def api_queue_priority(queue_id):
+            """Change the priority of a queued download endpoint."""
+            data = request.get_json(silent=True) or {}
+            try:
+                priority = self._parse_priority(
+                    data.get("priority", config.DEFAULT_DOWNLOAD_PRIORITY)
+                )
+            except ValueError as err:
+                return jsonify({"success": False, "error": str(err)}), 400
+
+            if not self._can_manage_download(queue_id):
+                return jsonify(
+                    {"success": False, "error": "Not allowed to change this download"}
+                ), 403
+
+            if not self.download_manager.set_priority(queue_id, priority):
+                return jsonify(
+                    {"success": False, "error": "Download is not waiting in the queue"}
+                ), 404
+
+            return jsonify({"success": True, "queue_id": queue_id, "priority": priority})
+
+        @self.app.route("/api/queue/<int:queue_id>/move-to-front", methods=["POST"])
+        @self._require_api_auth
+        def api_queue_move_to_front(queue_id):
+            """Move a queued download to the front of the queue endpoint."""
+            if not self._can_manage_download(queue_id):
+                return jsonify(
+                    {"success": False, "error": "Not allowed to change this download"}
+                ), 403
+
+            if not self.download_manager.move_to_front(
+                queue_id, self._get_max_priority()
+            ):
+                return jsonify(
+                    {"success": False, "error": "Download is not waiting in the queue"}
+                ), 404
+
+            return jsonify({"success": True, "queue_id": queue_id})
+
         @self.app.route("/api/download-status")
         def api_download_status():
             """Get current download status endpoint."""
@@ -963,13 +1030,65 @@ class WebApp:
         def api_ip():
             """API endpoint to get the public IP address."""
             try:
-                response = requests.get("https://api.ipify.org?format=json")
+                response = config.get_http_session().get("https://api.ipify.org?format=json")
                 response.raise_for_status()
                 return jsonify(response.json())
             except requests.exceptions.RequestException as e:
                 logging.error(f"Failed to get public IP address: {e}")
                 return jsonify({"success": False, "error": "Failed to get IP address"}), 500
 
+    def _get_max_priority(self) -> int:
+        """Highest queue priority the current user may use."""
+        if not self.auth_enabled:
+            return config.DOWNLOAD_PRIORITY_MAX
+
+        user = None
+        if self.db:
+            user = self.db.get_user_by_session(request.cookies.get("session_token"))
+        if user and user["is_admin"]:
+            return config.DOWNLOAD_PRIORITY_MAX
+        return config.DEFAULT_DOWNLOAD_PRIORITY
+
+    def _parse_priority(self, value) -> int:
+        """
+        Parse a requested queue priority.
+
+        Only admins may queue above the default priority, otherwise one user
+        could starve the downloads of everyone else.
+
+        Raises:
+            ValueError: If the priority is no integer or out of range
+        """
+        try:
+            priority = int(value)
+        except (TypeError, ValueError):
+            raise ValueError("Priority must be an integer") from None
+
+        max_priority = self._get_max_priority()
+        if not config.DOWNLOAD_PRIORITY_MIN <= priority <= max_priority:
+            raise ValueError(
+                f"Priority must be between {config.DOWNLOAD_PRIORITY_MIN} "
+                f"and {max_priority}"
+            )
+        return priority
+
+    def _can_manage_download(self, queue_id: int) -> bool:
+        """Check if the current user may reorder a queued download."""
+        if not self.auth_enabled:
+            return True
+
+        if not self.db:
+            return False
+
+        user = self.db.get_user_by_session(request.cookies.get("session_token"))
+        if not user:
+            return False
+
+        if user["is_admin"]:
+            return True
+
+        return self.download_manager.get_download_owner(queue_id) == user["id"]
+
     def _format_uptime(self, seconds: int) -> str:
         """Format uptime in human readable format."""
         if seconds < 60:
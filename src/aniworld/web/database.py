@@ -3,10 +3,16 @@ Database models and utilities for AniWorld Downloader web authentication
 """
 
 import hashlib
+import json
 import os
+import queue
 import secrets
 import sqlite3
-from typing import Optional, Dict, List
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Optional, Dict, List, Tuple
 from pathlib import Path
 
 
@@ -26,6 +32,14 @@ def get_database_path() -> str:
 class UserDatabase:
     """SQLite database manager for user authentication"""
 
+    # Idle connections kept open for reuse
+    POOL_SIZE = 8
+    # Prepared statements cached per connection
+    STATEMENT_CACHE_SIZE = 64
+    # Seconds a validated session token is served from memory
+    SESSION_CACHE_TTL = 30
+    SESSION_CACHE_MAX_ENTRIES = 1024
+
     def __init__(self, db_path: Optional[str] = None):
         """
         Initialize the user database.
@@ -34,11 +48,103 @@ class UserDatabase:
             db_path: Path to the SQLite database file (if None, uses system location)
         """
         self.db_path = db_path or get_database_path()
+        self._pool = queue.LifoQueue(maxsize=self.POOL_SIZE)
+        self._session_cache = {}  # session_token -> (user dict, expires at)
+        self._session_cache_lock = threading.Lock()
         self._init_database()
 
+    def _create_connection(self) -> sqlite3.Connection:
+        """Open a connection configured for concurrent use by the web server"""
+        conn = sqlite3.connect(
+            self.db_path,
+            check_same_thread=False,
+            cached_statements=self.STATEMENT_CACHE_SIZE,
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        # WAL stays consistent with NORMAL, fsync only happens on checkpoints
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=5000")
+        return conn
+
+    @contextmanager
+    def _connection(self):
+        """
+        Borrow a pooled connection wrapped in a transaction.
+
+        The transaction is committed when the block succeeds and rolled back
+        when it raises, like using the connection itself as context manager.
+        Reusing connections keeps their prepared statement cache warm.
+        """
+        try:
+            conn = self._pool.get_nowait()
+        except queue.Empty:
+            conn = self._create_connection()
+
+        try:
+            with conn:
+                yield conn
+        except BaseException:
+            conn.close()
+            raise
+
+        try:
+            self._pool.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def close(self) -> None:
+        """Close all idle pooled connections."""
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                break
+
+    def _get_cached_session(self, session_token: str) -> Optional[Dict]:
+        """Get a recently validated session user from memory"""
+        with self._session_cache_lock:
+            entry = self._session_cache.get(session_token)
+            if entry is None:
+                return None
+            user, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._session_cache[session_token]
+                return None
+            return dict(user)
+
+    def _cache_session(self, session_token: str, user: Dict) -> None:
+        """Remember a validated session user for SESSION_CACHE_TTL seconds"""
+        now = time.monotonic()
+        with self._session_cache_lock:
+            if len(self._session_cache) >= self.SESSION_CACHE_MAX_ENTRIES:
+                self._session_cache = {
+                    token: entry
+                    for token, entry in self._session_cache.items()
+                    if entry[1] >= now
+                }
+                if len(self._session_cache) >= self.SESSION_CACHE_MAX_ENTRIES:
+                    self._session_cache.clear()
+            self._session_cache[session_token] = (
+                dict(user),
+                now + self.SESSION_CACHE_TTL,
+            )
+
+    def _invalidate_sessions(self, session_token: Optional[str] = None) -> None:
+        """
+        Drop one or all cached sessions after they changed in the database.
+
+        Call this once the change is committed, otherwise a concurrent lookup
+        can cache the old row again before the commit lands.
+        """
+        with self._session_cache_lock:
+            if session_token is None:
+                self._session_cache.clear()
+            else:
+                self._session_cache.pop(session_token, None)
+
     def _init_database(self) -> None:
         """Initialize the database tables if they don't exist."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connection() as conn:
             cursor = conn.cursor()
 
             # Create users table
@@ -67,7 +173,41 @@ class UserDatabase:
                 )
             """)
 
-            # Note: download_queue table removed - download status now handled in memory
+            # Create download queue table so queued jobs survive restarts
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS download_queue (
+                    id INTEGER PRIMARY KEY,
+                    anime_title TEXT NOT NULL,
+                    episode_urls TEXT,
+                    movie_url TEXT,
+                    is_movie BOOLEAN NOT NULL DEFAULT 0,
+                    language TEXT,
+                    provider TEXT,
+                    total_episodes INTEGER NOT NULL DEFAULT 0,
+                    completed_episodes INTEGER NOT NULL DEFAULT 0,
+                    status TEXT NOT NULL,
+                    priority INTEGER NOT NULL DEFAULT 0,
+                    current_episode TEXT,
+                    progress_percentage REAL NOT NULL DEFAULT 0,
+                    error_message TEXT,
+                    created_by INTEGER,
+                    created_at TIMESTAMP,
+                    started_at TIMESTAMP,
+                    completed_at TIMESTAMP
+                )
+            """)
+
+            # Create per-episode state table for resuming interrupted jobs
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS download_episodes (
+                    queue_id INTEGER NOT NULL,
+                    episode_url TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (queue_id, episode_url),
+                    FOREIGN KEY (queue_id) REFERENCES download_queue (id) ON DELETE CASCADE
+                )
+            """)
 
             conn.commit()
 
@@ -107,7 +247,7 @@ class UserDatabase:
             salt = secrets.token_hex(16)
             password_hash = self._hash_password(password, salt)
 
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute(
                     """
@@ -137,7 +277,7 @@ class UserDatabase:
             User dictionary if credentials are valid, None otherwise
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute(
                     """
@@ -189,7 +329,7 @@ class UserDatabase:
         """
         session_token = secrets.token_urlsafe(32)
 
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connection() as conn:
             cursor = conn.cursor()
 
             # Clean up expired sessions first
@@ -220,8 +360,12 @@ class UserDatabase:
         Returns:
             User dictionary if session is valid, None otherwise
         """
+        cached_user = self._get_cached_session(session_token)
+        if cached_user is not None:
+            return cached_user
+
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute(
                     """
@@ -235,12 +379,14 @@ class UserDatabase:
 
                 row = cursor.fetchone()
                 if row:
-                    return {
+                    user = {
                         "id": row[0],
                         "username": row[1],
                         "is_admin": bool(row[2]),
                         "is_original_admin": bool(row[3]),
                     }
+                    self._cache_session(session_token, user)
+                    return user
 
                 return None
 
@@ -258,7 +404,7 @@ class UserDatabase:
             True if session was deleted, False otherwise
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute(
                     """
@@ -271,6 +417,8 @@ class UserDatabase:
 
         except Exception:
             return False
+        finally:
+            self._invalidate_sessions(session_token)
 
     def get_all_users(self) -> List[Dict]:
         """
@@ -280,7 +428,7 @@ class UserDatabase:
             List of user dictionaries
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute("""
                     SELECT id, username, is_admin, is_original_admin, created_at, last_login
@@ -316,7 +464,7 @@ class UserDatabase:
             True if user was deleted, False otherwise
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute("DELETE FROM users WHERE id = ?", (user_id,))
                 conn.commit()
@@ -324,6 +472,8 @@ class UserDatabase:
 
         except Exception:
             return False
+        finally:
+            self._invalidate_sessions()
 
     def update_user(
         self,
@@ -345,7 +495,7 @@ class UserDatabase:
             True if user was updated, False otherwise
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connection() as conn:
                 cursor = conn.cursor()
 
                 updates = []
@@ -387,6 +537,8 @@ class UserDatabase:
             return False
         except Exception:
             return False
+        finally:
+            self._invalidate_sessions()
 
     def has_users(self) -> bool:
         """
@@ -396,7 +548,7 @@ class UserDatabase:
             True if at least one user exists, False otherwise
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute("SELECT COUNT(*) FROM users")
                 count = cursor.fetchone()[0]
@@ -420,7 +572,7 @@ class UserDatabase:
             True if password was changed successfully, False otherwise
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connection() as conn:
                 cursor = conn.cursor()
 
                 # Get current password hash and salt
@@ -463,7 +615,7 @@ class UserDatabase:
     def cleanup_expired_sessions(self) -> None:
         """Clean up expired sessions."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute("""
                     DELETE FROM sessions WHERE expires_at < CURRENT_TIMESTAMP
@@ -472,6 +624,229 @@ class UserDatabase:
 
         except Exception:
             pass
+        finally:
+            self._invalidate_sessions()
+
+    # Download Queue Management Methods
+
+    def save_download_jobs(self, jobs: List[Dict]) -> bool:
+        """
+        Insert or update download jobs in a single transaction.
+
+        Args:
+            jobs: Download job dictionaries as kept by DownloadQueueManager
+
+        Returns:
+            True if all jobs were saved, False otherwise
+        """
+        if not jobs:
+            return True
+
+        def _timestamp(value):
+            return value.isoformat() if value else None
+
+        rows = [
+            (
+                job["id"],
+                job["anime_title"],
+                json.dumps(job.get("episode_urls") or []),
+                job.get("movie_url"),
+                bool(job.get("is_movie")),
+                job.get("language"),
+                job.get("provider"),
+                job.get("total_episodes", 0),
+                job.get("completed_episodes", 0),
+                job["status"],
+                job.get("priority", 0),
+                job.get("current_episode"),
+                job.get("progress_percentage", 0.0),
+                job.get("error_message"),
+                job.get("created_by"),
+                _timestamp(job.get("created_at")),
+                _timestamp(job.get("started_at")),
+                _timestamp(job.get("completed_at")),
+            )
+            for job in jobs
+        ]
+
+        try:
+            with self._connection() as conn:
+                cursor = conn.cursor()
+                cursor.executemany(
+                    """
+                    INSERT OR REPLACE INTO download_queue (
+                        id, anime_title, episode_urls, movie_url, is_movie,
+                        language, provider, total_episodes, completed_episodes,
+                        status, priority, current_episode, progress_percentage,
+                        error_message, created_by, created_at, started_at,
+                        completed_at
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                    rows,
+                )
+                conn.commit()
+                return True
+
+        except Exception:
+            return False
+
+    def save_episode_states(self, states: List[Tuple[int, str, str]]) -> bool:
+        """
+        Insert or update the download state of episodes.
+
+        Args:
+            states: List of (queue_id, episode_url, status) tuples
+
+        Returns:
+            True if all states were saved, False otherwise
+        """
+        if not states:
+            return True
+
+        try:
+            with self._connection() as conn:
+                cursor = conn.cursor()
+                cursor.executemany(
+                    """
+                    INSERT OR REPLACE INTO download_episodes (queue_id, episode_url, status, updated_at)
+                    VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+                """,
+                    states,
+                )
+                conn.commit()
+                return True
 
-    # Download Queue Management Methods - Removed
-    # Download status is now handled in memory by DownloadQueueManager
+        except Exception:
+            return False
+
+    def get_download_jobs(
+        self, statuses: List[str], limit: Optional[int] = None
+    ) -> List[Dict]:
+        """
+        Get persisted download jobs with the given statuses.
+
+        Unfinished jobs are returned oldest first, use limit to get the most
+        recent finished jobs instead.
+
+        Args:
+            statuses: Job statuses to include (e.g. ["queued", "downloading"])
+            limit: Only return the newest N jobs (optional)
+
+        Returns:
+            List of download job dictionaries including their episode states
+        """
+        if not statuses:
+            return []
+
+        placeholders = ", ".join("?" for _ in statuses)
+        query = f"""
+            SELECT id, anime_title, episode_urls, movie_url, is_movie, language,
+                   provider, total_episodes, completed_episodes, status, priority,
+                   current_episode, progress_percentage, error_message, created_by,
+                   created_at, started_at, completed_at
+            FROM download_queue WHERE status IN ({placeholders})
+        """
+        params = list(statuses)
+        if limit is not None:
+            query += " ORDER BY id DESC LIMIT ?"
+            params.append(limit)
+        else:
+            query += " ORDER BY id"
+
+        def _timestamp(value):
+            return datetime.fromisoformat(value) if value else None
+
+        try:
+            with self._connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(query, params)
+
+                jobs = []
+                for row in cursor.fetchall():
+                    jobs.append(
+                        {
+                            "id": row[0],
+                            "anime_title": row[1],
+                            "episode_urls": json.loads(row[2]) if row[2] else [],
+                            "movie_url": row[3],
+                            "is_movie": bool(row[4]),
+                            "language": row[5],
+                            "provider": row[6],
+                            "total_episodes": row[7],
+                            "completed_episodes": row[8],
+                            "status": row[9],
+                            "priority": row[10],
+                            "current_episode": row[11] or "",
+                            "progress_percentage": row[12],
+                            "error_message": row[13] or "",
+                            "created_by": row[14],
+                            "created_at": _timestamp(row[15]),
+                            "started_at": _timestamp(row[16]),
+                            "completed_at": _timestamp(row[17]),
+                            "episode_states": {},
+                        }
+                    )
+
+                if limit is not None:
+                    jobs.reverse()
+
+                for job in jobs:
+                    cursor.execute(
+                        """
+                        SELECT episode_url, status FROM download_episodes
+                        WHERE queue_id = ?
+                    """,
+                        (job["id"],),
+                    )
+                    job["episode_states"] = dict(cursor.fetchall())
+
+                return jobs
+
+        except Exception:
+            return []
+
+    def get_max_download_id(self) -> int:
+        """
+        Get the highest download job id ever stored.
+
+        Returns:
+            Highest job id or 0 if the queue was never used
+        """
+        try:
+            with self._connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("SELECT MAX(id) FROM download_queue")
+                return cursor.fetchone()[0] or 0
+
+        except Exception:
+            return 0
+
+    def prune_download_history(self, keep: int) -> None:
+        """
+        Delete all but the newest finished download jobs.
+
+        Args:
+            keep: Number of finished jobs to keep
+        """
+        try:
+            with self._connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    """
+                    DELETE FROM download_queue
+                    WHERE status IN ('completed', 'failed') AND id NOT IN (
+                        SELECT id FROM download_queue
+                        WHERE status IN ('completed', 'failed')
+                        ORDER BY id DESC LIMIT ?
+                    )
+                """,
+                    (keep,),
+                )
+                cursor.execute("""
+                    DELETE FROM download_episodes
+                    WHERE queue_id NOT IN (SELECT id FROM download_queue)
+                """)
+                conn.commit()
+
+        except Exception:
+            pass
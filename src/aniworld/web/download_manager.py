@@ -3,51 +3,216 @@ Download Queue Manager for AniWorld Downloader
 Handles global download queue processing and status tracking
 """
 
+import atexit
+import heapq
+import itertools
 import threading
-import time
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 from datetime import datetime
+from .. import config
 from .database import UserDatabase
 
 
 class DownloadQueueManager:
-    """Manages the global download queue processing with in-memory storage"""
+    """Manages the global download queue processing, persisted to the database"""
 
-    def __init__(self, database: Optional[UserDatabase] = None):
-        self.db = database  # Only used for user auth, not download storage
+    def __init__(
+        self,
+        database: Optional[UserDatabase] = None,
+        max_concurrent_downloads: Optional[int] = None,
+        max_concurrent_episodes: Optional[int] = None,
+    ):
+        self.db = database  # Persists the queue so it survives restarts
         self.is_processing = False
-        self.current_download_id = None
-        self.worker_thread = None
+        self.current_download_ids = set()
+        self.worker_threads = []
         self._stop_event = threading.Event()
 
+        # Worker pool configuration
+        self.max_concurrent_downloads = (
+            max_concurrent_downloads or config.DEFAULT_MAX_CONCURRENT_DOWNLOADS
+        )
+        self.max_concurrent_episodes = (
+            max_concurrent_episodes or config.DEFAULT_MAX_CONCURRENT_EPISODES
+        )
+        self._provider_semaphores = {}  # provider -> BoundedSemaphore
+        self._running_by_user = {}  # created_by -> number of running jobs
+
+        # Pending jobs are indexed separately from the status map, so picking
+        # the next job never contends with progress updates on _queue_lock.
+        # Lock order is always _pending_lock -> _queue_lock.
+        self._pending_lock = threading.Lock()
+        # Signalled whenever a job is queued or the processor is stopped
+        self._queue_condition = threading.Condition(self._pending_lock)
+        self._pending = {}  # created_by -> heap of (-priority, seq, queue_id)
+        self._pending_keys = {}  # queue_id -> (created_by, current heap key)
+        self._pending_seq = itertools.count()
+
         # In-memory download queue storage
         self._next_id = 1
         self._queue_lock = threading.Lock()
         self._active_downloads = {}  # id -> download_job dict
         self._completed_downloads = []  # list of completed download jobs (keep last N)
         self._max_completed_history = 10
+        self._restored = False
+
+        # Changes waiting to be written to the database in one batch,
+        # guarded by _queue_lock
+        self._dirty_jobs = {}  # id -> download_job dict
+        self._dirty_episodes = []  # (queue_id, episode_url, status)
+        self._flush_event = threading.Event()
+        self._flush_lock = threading.Lock()
+        self._flush_thread = None
+        if self.db:
+            atexit.register(self._flush_pending_writes)
 
     def start_queue_processor(self):
-        """Start the background queue processor"""
+        """Start the background queue processor, resuming persisted downloads"""
+        self._restore_persisted_downloads()
+
         if not self.is_processing:
             self.is_processing = True
             self._stop_event.clear()
-            self.worker_thread = threading.Thread(
-                target=self._process_queue, daemon=True
+            self.worker_threads = []
+            for index in range(self.max_concurrent_downloads):
+                worker = threading.Thread(
+                    target=self._process_queue,
+                    name=f"download-worker-{index + 1}",
+                    daemon=True,
+                )
+                worker.start()
+                self.worker_threads.append(worker)
+            if self.db:
+                self._flush_thread = threading.Thread(
+                    target=self._flush_loop, name="download-queue-flush", daemon=True
+                )
+                self._flush_thread.start()
+            logging.info(
+                "Download queue processor started with %d worker(s)",
+                self.max_concurrent_downloads,
             )
-            self.worker_thread.start()
-            logging.info("Download queue processor started")
 
     def stop_queue_processor(self):
         """Stop the background queue processor"""
         if self.is_processing:
             self.is_processing = False
             self._stop_event.set()
-            if self.worker_thread:
-                self.worker_thread.join(timeout=5)
+            with self._queue_condition:
+                self._queue_condition.notify_all()
+            for worker in self.worker_threads:
+                worker.join(timeout=5)
+            self.worker_threads = []
+            self._flush_event.set()
+            if self._flush_thread:
+                self._flush_thread.join(timeout=5)
+                self._flush_thread = None
+            self._flush_pending_writes()
             logging.info("Download queue processor stopped")
 
+    def _restore_persisted_downloads(self):
+        """Load the persisted queue once, requeueing interrupted downloads"""
+        with self._queue_condition:
+            if self._restored:
+                return
+            self._restored = True
+            if not self.db:
+                return
+
+            unfinished = self.db.get_download_jobs(["queued", "downloading"])
+            finished = self.db.get_download_jobs(
+                ["completed", "failed"], limit=self._max_completed_history
+            )
+            max_id = self.db.get_max_download_id()
+
+            with self._queue_lock:
+                self._next_id = max(self._next_id, max_id + 1)
+                self._completed_downloads = finished + self._completed_downloads
+
+                for job in unfinished:
+                    if job["id"] in self._active_downloads:
+                        continue
+                    if job["status"] == "downloading":
+                        # Interrupted by a crash or restart, already finished
+                        # episodes are skipped and .part files are continued
+                        job["status"] = "queued"
+                        job["current_episode"] = "Resuming after restart..."
+                        self._mark_dirty(job)
+                    job["current_episode_progress"] = 0.0
+                    job["episode_progress"] = {}
+                    self._active_downloads[job["id"]] = job
+                    self._push_pending(job["id"], job["created_by"], job["priority"])
+
+            if unfinished:
+                logging.info("Restored %d unfinished download(s)", len(unfinished))
+                self._queue_condition.notify_all()
+
+    def _mark_dirty(self, job):
+        """Schedule a job for the next database write, caller must hold _queue_lock"""
+        if self.db:
+            self._dirty_jobs[job["id"]] = job
+
+    def _flush_loop(self):
+        """Background writer batching queue changes into the database"""
+        while self.is_processing and not self._stop_event.is_set():
+            self._flush_event.wait(config.DOWNLOAD_QUEUE_FLUSH_INTERVAL)
+            self._flush_event.clear()
+            try:
+                self._flush_pending_writes()
+            except Exception as e:
+                logging.error(f"Error persisting download queue: {e}")
+
+    def _flush_pending_writes(self):
+        """Write all changed jobs and episode states in a single batch"""
+        if not self.db:
+            return
+
+        with self._flush_lock:
+            with self._queue_lock:
+                dirty_jobs = self._dirty_jobs
+                jobs = [dict(job) for job in dirty_jobs.values()]
+                episode_states = self._dirty_episodes
+                self._dirty_jobs = {}
+                self._dirty_episodes = []
+
+            if not jobs and not episode_states:
+                return
+
+            jobs_saved = self.db.save_download_jobs(jobs)
+            states_saved = self.db.save_episode_states(episode_states)
+
+            # Unsaved changes are retried with the next flush, changes made
+            # since this one started are newer and stay in front
+            with self._queue_lock:
+                if not jobs_saved:
+                    logging.warning(
+                        "Failed to persist %d download job(s), retrying", len(jobs)
+                    )
+                    for queue_id, job in dirty_jobs.items():
+                        self._dirty_jobs.setdefault(queue_id, job)
+                if not states_saved:
+                    logging.warning("Failed to persist download episode states, retrying")
+                    self._dirty_episodes = episode_states + self._dirty_episodes
+
+            if jobs_saved and any(
+                job["status"] in ("completed", "failed") for job in jobs
+            ):
+                self.db.prune_download_history(config.DOWNLOAD_QUEUE_HISTORY_LIMIT)
+
+    def _requeue_interrupted(self, queue_id: int):
+        """Put a job interrupted by stopping the processor back in the queue"""
+        with self._queue_condition:
+            with self._queue_lock:
+                job = self._active_downloads.get(queue_id)
+                if job is None:
+                    return
+                job["status"] = "queued"
+                job["current_episode"] = "Interrupted, will resume"
+                job["episode_progress"] = {}
+                self._mark_dirty(job)
+            self._push_pending(queue_id, job["created_by"], job["priority"])
+
     def add_download(
         self,
         anime_title: str,
@@ -58,8 +223,12 @@ class DownloadQueueManager:
         provider: str = None,
         total_episodes: int = 0,
         created_by: int = None,
+        priority: int = 0,
     ) -> int:
-        """Add a download to the queue"""
+        """Add a download to the queue, higher priorities are started first"""
+        # Persisted ids must be known before handing out a new one
+        self._restore_persisted_downloads()
+
         with self._queue_lock:
             queue_id = self._next_id
             self._next_id += 1
@@ -78,14 +247,24 @@ class DownloadQueueManager:
                 "current_episode": "",
                 "progress_percentage": 0.0,
                 "current_episode_progress": 0.0,  # Progress within current episode (0-100)
+                "episode_progress": {},  # episode -> progress of in-flight episodes
                 "error_message": "",
                 "created_by": created_by,
+                "priority": priority,
                 "created_at": datetime.now(),
                 "started_at": None,
                 "completed_at": None,
+                "episode_states": {},  # episode url -> completed / failed
             }
 
             self._active_downloads[queue_id] = download_job
+            self._mark_dirty(download_job)
+
+        self._flush_event.set()
+
+        with self._queue_condition:
+            self._push_pending(queue_id, created_by, priority)
+            self._queue_condition.notify()
 
         # Start processor if not running
         if not self.is_processing:
@@ -107,6 +286,7 @@ class DownloadQueueManager:
                             "total_episodes": download["total_episodes"],
                             "completed_episodes": download["completed_episodes"],
                             "status": download["status"],
+                            "priority": download["priority"],
                             "current_episode": download["current_episode"],
                             "progress_percentage": download["progress_percentage"],
                             "current_episode_progress": download[
@@ -146,20 +326,51 @@ class DownloadQueueManager:
         """Background worker that processes the download queue"""
         while self.is_processing and not self._stop_event.is_set():
             try:
-                # Get next job
-                job = self._get_next_queued_download()
+                # Block until a job is queued or the processor is stopped
+                job = self._wait_for_next_download()
 
                 if job:
-                    self.current_download_id = job["id"]
-                    self._process_download_job(job)
-                    self.current_download_id = None
-                else:
-                    # No jobs, wait a bit
-                    time.sleep(2)
+                    try:
+                        self._process_download_job(job)
+                    finally:
+                        self._release_job(job)
 
             except Exception as e:
                 logging.error(f"Error in queue processor: {e}")
-                time.sleep(5)
+                self._stop_event.wait(5)
+
+    def _wait_for_next_download(self):
+        """Wait without polling until a job can be claimed, None when stopping"""
+        with self._queue_condition:
+            while self.is_processing and not self._stop_event.is_set():
+                job = self._claim_next_download()
+                if job:
+                    return job
+                self._queue_condition.wait()
+            return None
+
+    def _release_job(self, job):
+        """Release the worker slot held by a finished job"""
+        with self._pending_lock:
+            self.current_download_ids.discard(job["id"])
+            user = job.get("created_by")
+            remaining = self._running_by_user.get(user, 0) - 1
+            if remaining > 0:
+                self._running_by_user[user] = remaining
+            else:
+                self._running_by_user.pop(user, None)
+
+    def _get_provider_semaphore(self, provider: Optional[str]):
+        """Get the semaphore capping concurrent downloads for a provider"""
+        with self._queue_lock:
+            semaphore = self._provider_semaphores.get(provider)
+            if semaphore is None:
+                limit = config.PROVIDER_CONCURRENCY_LIMITS.get(
+                    provider, config.DEFAULT_PROVIDER_CONCURRENCY
+                )
+                semaphore = threading.BoundedSemaphore(limit)
+                self._provider_semaphores[provider] = semaphore
+            return semaphore
 
     def _process_download_job(self, job):
         """Process a single download job"""
@@ -225,7 +436,15 @@ class DownloadQueueManager:
                     _error_reported_by_callback = True
 
             # The download_movie function now returns True on success and False on failure.
-            download_successful = download_movie(movie, web_progress_callback)
+            try:
+                download_successful = download_movie(movie, web_progress_callback)
+            except KeyboardInterrupt:
+                # Raised by the progress callback when the queue is stopped
+                download_successful = False
+
+            if self._stop_event.is_set():
+                self._requeue_interrupted(queue_id)
+                return
 
             # Only mark as completed if the download function succeeded AND the callback
             # did not report an error. This prevents overwriting a "failed" status.
@@ -253,10 +472,6 @@ class DownloadQueueManager:
 
             # Import necessary modules
             from ..entry import _group_episodes_by_series
-            from ..models import Anime
-            from pathlib import Path
-            from ..action.common import sanitize_filename
-            from .. import config
             import os
 
             # Process episodes
@@ -290,9 +505,11 @@ class DownloadQueueManager:
                 )
 
             # Download logic
-            successful_downloads = 0
-            failed_downloads = 0
-            current_episode_index = 0
+            tracker = {
+                "lock": threading.Lock(),
+                "successful": 0,
+                "failed": 0,
+            }
 
             # Get download directory from arguments (which includes -o parameter)
             from ..parser import arguments
@@ -305,185 +522,50 @@ class DownloadQueueManager:
             if hasattr(arguments, "output_dir") and arguments.output_dir is not None:
                 download_dir = str(arguments.output_dir)
 
-            for anime in anime_list:
-                for episode in anime.episode_list:
-                    if self._stop_event.is_set():
-                        break
-
-                    episode_info = f"{anime.title} - Episode {episode.episode} (Season {episode.season})"
-
-                    # Update progress - reset episode progress to 0 when starting new episode
-                    # DON'T update completed_episodes here - it causes the progress bar to jump
-                    self._update_download_status(
-                        queue_id,
-                        "downloading",
-                        completed_episodes=None,  # Don't update completed count when starting new episode
-                        current_episode=f"Downloading {episode_info}",
-                        current_episode_progress=0.0,
-                    )
-
-                    try:
-                        # Create temp anime with single episode
-                        temp_anime = Anime(
-                            title=anime.title,
-                            slug=anime.slug,
-                            site=anime.site,
-                            language=anime.language,
-                            provider=anime.provider,
-                            action=anime.action,
-                            episode_list=[episode],
+            episodes = [
+                (anime, episode)
+                for anime in anime_list
+                for episode in anime.episode_list
+            ]
+
+            if self.max_concurrent_episodes > 1 and len(episodes) > 1:
+                with ThreadPoolExecutor(
+                    max_workers=self.max_concurrent_episodes,
+                    thread_name_prefix=f"download-job-{queue_id}",
+                ) as executor:
+                    futures = [
+                        executor.submit(
+                            self._download_episode,
+                            job,
+                            anime,
+                            episode,
+                            download_dir,
+                            tracker,
                         )
-
-                        # Create web progress callback for this specific download
-                        def web_progress_callback(progress_data):
-                            """Handle progress updates from yt-dlp and update web interface"""
-                            try:
-                                # Check if we should stop during download
-                                if self._stop_event.is_set():
-                                    # Signal yt-dlp to stop by raising an exception
-                                    raise KeyboardInterrupt("Download stopped by user")
-
-                                # Log the raw progress data for debugging (disabled to reduce spam)
-                                # logging.info(f"Progress data received: {progress_data}")
-
-                                if progress_data["status"] == "downloading":
-                                    # Try multiple methods to extract progress percentage
-                                    percentage = 0.0
-
-                                    # Method 1: _percent_str field
-                                    percent_str = progress_data.get("_percent_str")
-                                    if percent_str:
-                                        try:
-                                            # Clean ANSI codes before converting to float
-                                            import re
-                                            cleaned_percent_str = re.sub(r"\x1b\[[0-9;]*m", "", str(percent_str)).strip()
-                                            percentage = float(
-                                                cleaned_percent_str.replace("%", "")
-                                            )
-                                        except (ValueError, TypeError):
-                                            pass
-
-                                    # Method 2: Calculate from downloaded/total bytes
-                                    if percentage == 0.0:
-                                        downloaded = progress_data.get(
-                                            "downloaded_bytes", 0
-                                        )
-                                        total = progress_data.get("total_bytes", 0)
-                                        if total and total > 0:
-                                            percentage = (downloaded / total) * 100
-
-                                    # Method 3: Use fragment info if available
-                                    if percentage == 0.0:
-                                        fragment_index = progress_data.get(
-                                            "fragment_index", 0
-                                        )
-                                        fragment_count = progress_data.get(
-                                            "fragment_count", 0
-                                        )
-                                        if fragment_count and fragment_count > 0:
-                                            percentage = (
-                                                fragment_index / fragment_count
-                                            ) * 100
-
-                                    # Ensure percentage is valid
-                                    percentage = min(100.0, max(0.0, percentage))
-
-                                    # Create status message
-                                    speed = progress_data.get("_speed_str", "N/A")
-                                    eta = progress_data.get("_eta_str", "N/A")
-
-                                    # Clean ANSI color codes from yt-dlp output
-                                    import re
-
-                                    if speed != "N/A":
-                                        speed = re.sub(
-                                            r"\x1b\[[0-9;]*m", "", str(speed)
-                                        ).strip()
-                                    if eta != "N/A":
-                                        eta = re.sub(
-                                            r"\x1b\[[0-9;]*m", "", str(eta)
-                                        ).strip()
-
-                                    status_msg = f"Downloading {episode_info} - {percentage:.1f}%"
-                                    if speed != "N/A" and speed:
-                                        status_msg += f" | Speed: {speed}"
-                                    if eta != "N/A" and eta:
-                                        status_msg += f" | ETA: {eta}"
-
-                                    # Update episode progress
-                                    self.update_episode_progress(
-                                        queue_id, percentage, status_msg
-                                    )
-
-                                    # Log successful update for debugging (disabled to reduce spam)
-                                    # logging.info(f"Updated progress: {percentage:.1f}% for queue {queue_id}")
-
-                                elif progress_data["status"] == "finished":
-                                    # Episode completed - don't update progress here
-                                    # The progress will be updated correctly after file verification
-                                    logging.info(
-                                        f"Episode finished for queue {queue_id}"
-                                    )
-
-                            except Exception as e:
-                                logging.warning(f"Web progress callback error: {e}")
-
-                        # Execute download and capture result
+                        for anime, episode in episodes
+                    ]
+                    for future in futures:
                         try:
-                            # Check files before download to better detect success
-                            from pathlib import Path
-
-                            # Use the actual configured download directory
-                            anime_download_dir = Path(download_dir) / sanitize_filename(
-                                anime.title
-                            )
-
-                            # Count files before download
-                            files_before = 0
-                            if anime_download_dir.exists():
-                                files_before = len(list(anime_download_dir.glob("*")))
-
-                            # Import and call the new download function with progress callback
-                            from ..action.download import download
-
-                            download(temp_anime, web_progress_callback)
-
-                            # Count files after download
-                            files_after = 0
-                            if anime_download_dir.exists():
-                                files_after = len(list(anime_download_dir.glob("*")))
-
-                            # Check if any new files were created and update progress immediately
-                            if files_after > files_before:
-                                successful_downloads += 1
-                                logging.info(f"Downloaded: {episode_info}")
-
-                                # Update completed episodes count ONLY after successful download
-                                self._update_download_status(
-                                    queue_id,
-                                    "downloading",
-                                    completed_episodes=successful_downloads,  # Update completed count after successful download
-                                    current_episode=f"Completed {episode_info}",
-                                    current_episode_progress=100.0,
-                                )
-                            else:
-                                failed_downloads += 1
-                                logging.warning(
-                                    f"Failed to download: {episode_info} - No new files created"
-                                )
-
-                        except Exception as download_error:
-                            # If an exception was raised during download, it failed
-                            failed_downloads += 1
-                            logging.warning(
-                                f"Failed to download: {episode_info} - Error: {download_error}"
+                            future.result()
+                        except Exception as e:
+                            logging.error(
+                                f"Episode worker of download job {queue_id} failed: {e}"
                             )
+                            with tracker["lock"]:
+                                tracker["failed"] += 1
+            else:
+                for anime, episode in episodes:
+                    if self._stop_event.is_set():
+                        break
+                    self._download_episode(job, anime, episode, download_dir, tracker)
 
-                    except Exception as e:
-                        failed_downloads += 1
-                        logging.error(f"Error downloading {episode_info}: {e}")
+            if self._stop_event.is_set():
+                # Finished episodes are remembered, the rest resumes later
+                self._requeue_interrupted(queue_id)
+                return
 
-                    current_episode_index += 1
+            successful_downloads = tracker["successful"]
+            failed_downloads = tracker["failed"]
 
             # Final status update
             total_attempted = successful_downloads + failed_downloads
@@ -513,16 +595,311 @@ class DownloadQueueManager:
                 queue_id, "failed", error_message=f"Download failed: {str(e)}"
             )
 
+    def _download_episode(self, job, anime, episode, download_dir, tracker):
+        """Download a single episode of an anime job and record the outcome"""
+        from pathlib import Path
+        from ..models import Anime
+        from ..action.common import sanitize_filename
+        from ..action.download import download, _get_output_filename
+
+        queue_id = job["id"]
+
+        if self._stop_event.is_set():
+            return
+
+        episode_info = (
+            f"{anime.title} - Episode {episode.episode} (Season {episode.season})"
+        )
+
+        # Episodes finished before an interruption are not downloaded again
+        if job.get("episode_states", {}).get(episode.link) == "completed":
+            with tracker["lock"]:
+                tracker["successful"] += 1
+            logging.info(f"Already downloaded: {episode_info}")
+            return
+
+        # Episodes of the job may download concurrently, every episode only
+        # starts its own progress instead of resetting the one of the job
+        self.update_episode_progress(
+            queue_id, 0.0, f"Downloading {episode_info}", episode_key=episode_info
+        )
+
+        succeeded = False
+        try:
+            # Create temp anime with single episode
+            temp_anime = Anime(
+                title=anime.title,
+                slug=anime.slug,
+                site=anime.site,
+                language=anime.language,
+                provider=anime.provider,
+                action=anime.action,
+                episode_list=[episode],
+            )
+
+            # Create web progress callback for this specific download
+            def web_progress_callback(progress_data):
+                """Handle progress updates from yt-dlp and update web interface"""
+                try:
+                    # Check if we should stop during download
+                    if self._stop_event.is_set():
+                        # Signal yt-dlp to stop by raising an exception
+                        raise KeyboardInterrupt("Download stopped by user")
+
+                    if progress_data["status"] == "downloading":
+                        # Try multiple methods to extract progress percentage
+                        percentage = 0.0
+
+                        # Method 1: _percent_str field
+                        percent_str = progress_data.get("_percent_str")
+                        if percent_str:
+                            try:
+                                # Clean ANSI codes before converting to float
+                                import re
+                                cleaned_percent_str = re.sub(r"\x1b\[[0-9;]*m", "", str(percent_str)).strip()
+                                percentage = float(
+                                    cleaned_percent_str.replace("%", "")
+                                )
+                            except (ValueError, TypeError):
+                                pass
+
+                        # Method 2: Calculate from downloaded/total bytes
+                        if percentage == 0.0:
+                            downloaded = progress_data.get("downloaded_bytes", 0)
+                            total = progress_data.get("total_bytes", 0)
+                            if total and total > 0:
+                                percentage = (downloaded / total) * 100
+
+                        # Method 3: Use fragment info if available
+                        if percentage == 0.0:
+                            fragment_index = progress_data.get("fragment_index", 0)
+                            fragment_count = progress_data.get("fragment_count", 0)
+                            if fragment_count and fragment_count > 0:
+                                percentage = (fragment_index / fragment_count) * 100
+
+                        # Ensure percentage is valid
+                        percentage = min(100.0, max(0.0, percentage))
+
+                        # Create status message
+                        speed = progress_data.get("_speed_str", "N/A")
+                        eta = progress_data.get("_eta_str", "N/A")
+
+                        # Clean ANSI color codes from yt-dlp output
+                        import re
+
+                        if speed != "N/A":
+                            speed = re.sub(r"\x1b\[[0-9;]*m", "", str(speed)).strip()
+                        if eta != "N/A":
+                            eta = re.sub(r"\x1b\[[0-9;]*m", "", str(eta)).strip()
+
+                        status_msg = f"Downloading {episode_info} - {percentage:.1f}%"
+                        if speed != "N/A" and speed:
+                            status_msg += f" | Speed: {speed}"
+                        if eta != "N/A" and eta:
+                            status_msg += f" | ETA: {eta}"
+
+                        # Update episode progress
+                        self.update_episode_progress(
+                            queue_id, percentage, status_msg, episode_key=episode_info
+                        )
+
+                    elif progress_data["status"] == "finished":
+                        # Episode completed - don't update progress here
+                        # The progress will be updated correctly after file verification
+                        logging.info(f"Episode finished for queue {queue_id}")
+
+                except Exception as e:
+                    logging.warning(f"Web progress callback error: {e}")
+
+            # Execute download and capture result
+            try:
+                # Use the actual configured download directory
+                sanitized_title = sanitize_filename(anime.title)
+                output_path = (
+                    Path(download_dir)
+                    / sanitized_title
+                    / _get_output_filename(temp_anime, episode, sanitized_title)
+                )
+
+                # Respect the per-provider concurrency cap of the provider
+                # actually downloaded from, racing may pick another one
+                download(
+                    temp_anime,
+                    web_progress_callback,
+                    provider_limit=self._get_provider_semaphore,
+                )
+
+                # Only the expected output file counts, other episodes of this
+                # job may finish in the same directory concurrently
+                if output_path.exists():
+                    succeeded = True
+                    logging.info(f"Downloaded: {episode_info}")
+                else:
+                    logging.warning(
+                        f"Failed to download: {episode_info} - No output file created"
+                    )
+
+            except KeyboardInterrupt:
+                # Raised by the progress callback when the queue is stopped
+                logging.info(f"Stopped downloading: {episode_info}")
+            except Exception as download_error:
+                # If an exception was raised during download, it failed
+                logging.warning(
+                    f"Failed to download: {episode_info} - Error: {download_error}"
+                )
+
+        except Exception as e:
+            logging.error(f"Error downloading {episode_info}: {e}")
+
+        if not succeeded and self._stop_event.is_set():
+            # Interrupted, not failed - the .part file is continued on resume
+            self._clear_episode_progress(queue_id, episode_info)
+            return
+
+        with tracker["lock"]:
+            if succeeded:
+                tracker["successful"] += 1
+            else:
+                tracker["failed"] += 1
+            successful_downloads = tracker["successful"]
+
+        self._set_episode_state(
+            queue_id, episode.link, "completed" if succeeded else "failed"
+        )
+
+        if succeeded:
+            # Update completed episodes count ONLY after successful download
+            self._finish_episode_progress(
+                queue_id, episode_info, successful_downloads, f"Completed {episode_info}"
+            )
+        else:
+            self._clear_episode_progress(queue_id, episode_info)
+
+    def _push_pending(self, queue_id: int, user, priority: int, seq: int = None):
+        """Index a queued job, caller must hold _pending_lock"""
+        if seq is None:
+            seq = next(self._pending_seq)
+        key = (-priority, seq, queue_id)
+        self._pending_keys[queue_id] = (user, key)
+        heapq.heappush(self._pending.setdefault(user, []), key)
+
+    def _peek_pending(self, user):
+        """Return the best valid heap entry of a user, dropping stale ones"""
+        heap = self._pending.get(user)
+        while heap:
+            entry = self._pending_keys.get(heap[0][2])
+            if entry is not None and entry[1] == heap[0]:
+                return heap[0]
+            heapq.heappop(heap)
+        self._pending.pop(user, None)
+        return None
+
     def _get_next_queued_download(self):
-        """Get the next download job in the queue"""
+        """Claim the next download job in the queue"""
+        with self._pending_lock:
+            return self._claim_next_download()
+
+    def _claim_next_download(self):
+        """
+        Claim the next queued job, caller must hold _pending_lock.
+
+        The job with the highest priority wins. Between equal priorities jobs
+        are handed out fairly across users (owner with the fewest running jobs
+        first) and then in the order they were queued.
+        """
+        while True:
+            best_user = None
+            best_rank = None
+            for user in list(self._pending):
+                top = self._peek_pending(user)
+                if top is None:
+                    continue
+                rank = (top[0], self._running_by_user.get(user, 0), top[1])
+                if best_rank is None or rank < best_rank:
+                    best_user, best_rank = user, rank
+
+            if best_rank is None:
+                return None
+
+            queue_id = heapq.heappop(self._pending[best_user])[2]
+            del self._pending_keys[queue_id]
+
+            with self._queue_lock:
+                job = self._active_downloads.get(queue_id)
+                if job is None or job["status"] != "queued":
+                    continue
+                # Mark as claimed so no other worker picks it up
+                job["status"] = "downloading"
+                self._mark_dirty(job)
+
+            self.current_download_ids.add(queue_id)
+            self._running_by_user[best_user] = (
+                self._running_by_user.get(best_user, 0) + 1
+            )
+            return job
+
+    def set_priority(self, queue_id: int, priority: int) -> bool:
+        """Change the priority of a queued download"""
+        with self._pending_lock:
+            return self._reprioritize(queue_id, priority)
+
+    def _reprioritize(self, queue_id: int, priority: int, seq: int = None) -> bool:
+        """Re-index a queued job, caller must hold _pending_lock"""
+        entry = self._pending_keys.get(queue_id)
+        if entry is None:
+            return False
+
+        user, (_, old_seq, _) = entry
         with self._queue_lock:
-            for download in self._active_downloads.values():
-                if download["status"] == "queued":
-                    return download
-            return None
+            job = self._active_downloads.get(queue_id)
+            if job is None:
+                return False
+            job["priority"] = priority
+            self._mark_dirty(job)
+
+        # The old heap entry becomes stale and is dropped lazily
+        self._push_pending(queue_id, user, priority, old_seq if seq is None else seq)
+        return True
+
+    def move_to_front(
+        self, queue_id: int, max_priority: int = config.DOWNLOAD_PRIORITY_MAX
+    ) -> bool:
+        """
+        Move a queued download ahead of the other queued jobs.
+
+        The job gets a priority above every other queued job. If that would
+        exceed max_priority, it gets max_priority and is queued before the
+        other jobs of its owner, so users limited to the default priority can
+        only reorder their own downloads.
+        """
+        with self._pending_lock:
+            entry = self._pending_keys.get(queue_id)
+            if entry is None:
+                return False
+
+            tops = [self._peek_pending(user) for user in list(self._pending)]
+            highest = max((-top[0] for top in tops if top is not None), default=0)
+            if highest < max_priority:
+                return self._reprioritize(queue_id, highest + 1)
+
+            owner = entry[0]
+            first_seq = min(
+                key[1] for user, key in self._pending_keys.values() if user == owner
+            )
+            return self._reprioritize(queue_id, max_priority, first_seq - 1)
+
+    def get_download_owner(self, queue_id: int) -> Optional[int]:
+        """Get the user id that queued a download"""
+        with self._queue_lock:
+            download = self._active_downloads.get(queue_id)
+            return download["created_by"] if download else None
 
     def update_episode_progress(
-        self, queue_id: int, episode_progress: float, current_episode_desc: str = None
+        self,
+        queue_id: int,
+        episode_progress: float,
+        current_episode_desc: str = None,
+        episode_key: str = None,
     ):
         """Update the progress within the current episode"""
         with self._queue_lock:
@@ -530,25 +907,91 @@ class DownloadQueueManager:
                 return False
 
             download = self._active_downloads[queue_id]
-            download["current_episode_progress"] = min(
-                100.0, max(0.0, episode_progress)
-            )
+            episode_progress = min(100.0, max(0.0, episode_progress))
 
             if current_episode_desc:
                 download["current_episode"] = current_episode_desc
+            self._mark_dirty(download)
+
+            # Episodes of the same job may download concurrently, so every
+            # in-flight episode contributes its own partial progress
+            if episode_key is not None:
+                download["episode_progress"][episode_key] = episode_progress
+                self._refresh_progress(download)
+                return True
+
+            download["current_episode_progress"] = episode_progress
 
             # Calculate overall progress: completed episodes + current episode progress
             completed = download["completed_episodes"]
             total = download["total_episodes"]
             if total > 0:
-                current_episode_contribution = (
-                    (episode_progress / 100.0) if episode_progress >= 0 else 0
-                )
+                current_episode_contribution = episode_progress / 100.0
                 new_progress = (completed + current_episode_contribution) / total * 100
-                download["progress_percentage"] = new_progress
+                download["progress_percentage"] = min(100.0, new_progress)
 
             return True
 
+    def _refresh_progress(self, download):
+        """
+        Derive the progress of a job from its finished and in-flight episodes,
+        caller must hold _queue_lock.
+
+        The episode progress shown is the average of the in-flight episodes,
+        so parallel episodes do not overwrite each other's progress.
+        """
+        in_flight = download["episode_progress"]
+        if in_flight:
+            download["current_episode_progress"] = sum(in_flight.values()) / len(
+                in_flight
+            )
+
+        total = download["total_episodes"]
+        if total > 0:
+            new_progress = (
+                (download["completed_episodes"] + sum(in_flight.values()) / 100.0)
+                / total
+                * 100
+            )
+            download["progress_percentage"] = min(100.0, new_progress)
+
+    def _set_episode_state(self, queue_id: int, episode_url: str, status: str):
+        """Remember the outcome of an episode so a resumed job can skip it"""
+        with self._queue_lock:
+            download = self._active_downloads.get(queue_id)
+            if download is None:
+                return
+            download.setdefault("episode_states", {})[episode_url] = status
+            if self.db:
+                self._dirty_episodes.append((queue_id, episode_url, status))
+
+    def _clear_episode_progress(self, queue_id: int, episode_key: str):
+        """Forget the partial progress of an episode that has finished"""
+        with self._queue_lock:
+            download = self._active_downloads.get(queue_id)
+            if download:
+                download["episode_progress"].pop(episode_key, None)
+                self._refresh_progress(download)
+                self._mark_dirty(download)
+
+    def _finish_episode_progress(
+        self, queue_id: int, episode_key: str, completed_episodes: int, message: str
+    ):
+        """Count an episode as completed and drop its partial progress"""
+        with self._queue_lock:
+            download = self._active_downloads.get(queue_id)
+            if download is None:
+                return
+            download["episode_progress"].pop(episode_key, None)
+            download["completed_episodes"] = max(
+                download["completed_episodes"], completed_episodes
+            )
+            download["current_episode"] = message
+            if not download["episode_progress"]:
+                download["current_episode_progress"] = 100.0
+            self._refresh_progress(download)
+            self._mark_dirty(download)
+
     def _update_download_status(
         self,
         queue_id: int,
@@ -566,6 +1009,7 @@ class DownloadQueueManager:
 
             download = self._active_downloads[queue_id]
             download["status"] = status
+            self._mark_dirty(download)
 
             if completed_episodes is not None:
                 download["completed_episodes"] = completed_episodes
@@ -654,6 +1098,7 @@ class DownloadQueueManager:
 
                 # Remove from active downloads
                 del self._active_downloads[queue_id]
+                self._flush_event.set()
 
             return True
 
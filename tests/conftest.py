@@ -0,0 +1,75 @@
+import sys
+import time
+
+import pytest
+
+# aniworld.parser parses the command line on import, keep pytest's own
+# arguments away from it
+sys.argv = sys.argv[:1]
+
+_benchmark_results = []
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--benchmark",
+        action="store_true",
+        help="also run the benchmarks against the implementations they replaced",
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "benchmark: timing comparison, only run with --benchmark"
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip the benchmarks unless asked for, their timings depend on the machine"""
+    if config.getoption("--benchmark"):
+        return
+
+    skip = pytest.mark.skip(reason="benchmark, run with --benchmark")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
+
+
+@pytest.fixture
+def benchmark_timer(request):
+    """
+    Time a callable and report the result in the terminal summary.
+
+    The returned function takes a label, the callable, the number of rounds
+    and optionally a timer (e.g. time.process_time for CPU time). It returns
+    the average seconds per round.
+    """
+
+    def measure(label, func, rounds, timer=time.perf_counter):
+        start = timer()
+        for _ in range(rounds):
+            func()
+        elapsed = (timer() - start) / rounds
+        _benchmark_results.append((request.node.name, label, elapsed))
+        return elapsed
+
+    return measure
+
+
+@pytest.fixture
+def isolated_metadata_cache(tmp_path, monkeypatch):
+    """Replace the process wide metadata cache with one in tmp_path"""
+    from aniworld.common import cache
+
+    metadata_cache = cache.MetadataCache(str(tmp_path / "metadata.db"))
+    monkeypatch.setattr(cache, "_metadata_cache", metadata_cache)
+    return metadata_cache
+
+
+def pytest_terminal_summary(terminalreporter):
+    if not _benchmark_results:
+        return
+
+    terminalreporter.section("benchmarks")
+    for test_name, label, elapsed in _benchmark_results:
+        terminalreporter.write_line(f"{test_name}: {label}: {elapsed * 1000:.3f} ms")
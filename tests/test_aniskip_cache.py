@@ -0,0 +1,157 @@
+import importlib
+import os
+import threading
+from collections import Counter
+
+import pytest
+
+
+# aniworld.aniskip re-exports the aniskip function under the module's name
+aniskip_module = importlib.import_module("aniworld.aniskip.aniskip")
+
+TITLE = "Kaguya-sama: Love is War"
+SEASON_IDS = {1: 37999, 2: 40591, 3: 43608}
+
+
+def mal_page(anime_id: int) -> str:
+    season = next(season for season, id_ in SEASON_IDS.items() if id_ == anime_id)
+    sequel = ""
+    if season + 1 in SEASON_IDS:
+        sequel = (
+            "<div>Sequel (TV)</div>"
+            f'<div class="title"><a href="https://myanimelist.net/anime/'
+            f'{SEASON_IDS[season + 1]}/Kaguya">Next</a></div>'
+        )
+    return (
+        "<html><body><div><span class=\"dark_text\">Episodes:</span> 12</div>"
+        f"{sequel}</body></html>"
+    )
+
+
+class _Response:
+    def __init__(self, status_code=200, json_data=None, text=""):
+        self.status_code = status_code
+        self._json = json_data
+        self.text = text
+        self.content = text.encode()
+
+    def json(self):
+        return self._json
+
+    def raise_for_status(self):
+        pass
+
+
+class _Session:
+    """Answers MyAnimeList and AniSkip requests and counts them"""
+
+    def __init__(self):
+        self.requests = Counter()
+        self._lock = threading.Lock()
+
+    def get(self, url, timeout=None):
+        with self._lock:
+            self.requests[url] += 1
+
+        if "search/prefix.json" in url:
+            items = [{"id": SEASON_IDS[1], "name": TITLE}]
+            return _Response(json_data={"categories": [{"items": items}]})
+        if "aniskip.com" in url:
+            episode = int(url.split("?")[0].rsplit("/", 1)[1])
+            if episode == 12:
+                return _Response(json_data={"found": False, "results": []})
+            results = [
+                {"skip_type": "op", "interval": {"start_time": 0, "end_time": 90}},
+                {"skip_type": "ed", "interval": {"start_time": 1300, "end_time": 1390}},
+            ]
+            return _Response(json_data={"found": True, "results": results})
+        return _Response(text=mal_page(int(url.rsplit("/", 1)[1])))
+
+
+@pytest.fixture
+def session(isolated_metadata_cache, monkeypatch):
+    fake = _Session()
+    monkeypatch.setattr(aniskip_module, "get_http_session", lambda: fake)
+    for setup in ("setup_autostart", "setup_autoexit", "setup_aniskip"):
+        monkeypatch.setattr(aniskip_module, setup, lambda: True)
+    yield fake
+    aniskip_module.cleanup_chapters()
+
+
+def test_season_is_resolved_once(session):
+    flags = [aniskip_module.aniskip(TITLE, episode, 3, 12) for episode in range(1, 13)]
+
+    assert all("--script-opts=skip-op_start=0" in flag for flag in flags[:11])
+    assert flags[11] == ""
+    # One search, two sequel walks, one episode count and one AniSkip
+    # request per episode
+    assert sum(session.requests.values()) == 1 + 2 + 1 + 12
+    assert max(session.requests.values()) == 1
+
+
+def test_seasons_walked_through_are_cached(session):
+    assert aniskip_module.get_mal_id_from_title(TITLE, 2) == SEASON_IDS[2]
+    session.requests.clear()
+
+    assert aniskip_module.get_mal_id_from_title(TITLE, 1) == SEASON_IDS[1]
+    assert aniskip_module.get_mal_id_from_title(TITLE, 3) == SEASON_IDS[3]
+    # Only the sequel of season 2 is looked up
+    assert list(session.requests) == [
+        aniskip_module.MAL_ANIME_URL.format(SEASON_IDS[2])
+    ]
+
+
+def test_prefetch_fills_cache(session):
+    skip_times = aniskip_module.prefetch_aniskip(TITLE, 1, range(1, 13), 12)
+
+    assert skip_times[1]["found"]
+    assert skip_times[12] is None
+    session.requests.clear()
+
+    for episode in range(1, 13):
+        aniskip_module.aniskip(TITLE, episode, 1, 12)
+    assert not session.requests
+
+
+def test_episode_count_mismatch_skips_aniskip(session):
+    assert aniskip_module.prefetch_aniskip(TITLE, 1, range(1, 25), 24) == {}
+    assert not [url for url in session.requests if "aniskip.com" in url]
+
+
+def _chapters_file(flags: str) -> str:
+    return flags.split()[0][len("--chapters-file="):]
+
+
+def test_chapters_files_are_reused_and_cleaned_up(session):
+    flags = aniskip_module.aniskip(TITLE, 1, 1, 12)
+    chapters_file = _chapters_file(flags)
+    directory = os.path.dirname(chapters_file)
+
+    with open(chapters_file, encoding="utf-8") as chapters:
+        content = chapters.read()
+    assert content.startswith(";FFMETADATA1")
+    assert "TITLE=Opening" in content and "TITLE=Episode" in content
+
+    # Watching the episode again reuses its file
+    mtime = os.stat(chapters_file).st_mtime_ns
+    assert aniskip_module.aniskip(TITLE, 1, 1, 12) == flags
+    assert os.stat(chapters_file).st_mtime_ns == mtime
+
+    aniskip_module.aniskip(TITLE, 2, 1, 12)
+    assert sorted(os.listdir(directory)) == [
+        f"{SEASON_IDS[1]}-1.ffmetadata",
+        f"{SEASON_IDS[1]}-2.ffmetadata",
+    ]
+
+    aniskip_module.cleanup_chapters()
+    assert not os.path.exists(directory)
+
+
+def test_script_opts_only_writes_nothing(session):
+    flags = aniskip_module.aniskip(TITLE, 1, 1, 12, script_opts_only=True)
+
+    assert flags == (
+        "--script-opts=skip-op_start=0,skip-op_end=90,"
+        "skip-ed_start=1300,skip-ed_end=1390,skip-chapters=yes"
+    )
+    assert aniskip_module._chapters_directory is None
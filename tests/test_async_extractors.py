@@ -0,0 +1,114 @@
+import asyncio
+import http.server
+import threading
+
+import pytest
+
+from aniworld import models
+from aniworld.common import cache, provider_health
+from aniworld.extractors import aget_direct_link_from_vidoza
+
+
+@pytest.fixture
+def hoster():
+    """Local server with aniworld.to style redirects to Vidoza embed pages"""
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.startswith("/redirect/"):
+                self.send_response(302)
+                self.send_header("Location", f"/embed/{self.path.rsplit('/', 1)[1]}")
+                self.end_headers()
+                return
+            if self.path.startswith("/embed/"):
+                video = self.path.rsplit("/", 1)[1]
+                body = f'<script>sourcesCode: [{{ src: "https://cdn/{video}.mp4" }}]</script>'
+                self.send_response(200)
+                self.end_headers()
+                self.wfile.write(body.encode())
+                return
+            status = 503 if self.path.startswith("/unavailable") else 404
+            self.send_response(status)
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+
+
+@pytest.fixture(autouse=True)
+def isolated_caches(isolated_metadata_cache, monkeypatch):
+    monkeypatch.setattr(
+        cache, "_direct_link_cache", cache.DirectLinkCache(isolated_metadata_cache)
+    )
+    monkeypatch.setattr(provider_health, "_provider_health", provider_health.ProviderHealth())
+
+
+def make_episode(hoster: str, number: int) -> models.Episode:
+    episode = models.Episode(
+        link=f"https://aniworld.to/anime/stream/some-anime/staffel-1/episode-{number}",
+        provider={"Vidoza": {3: f"{hoster}/redirect/episode-{number}"}},
+        _selected_provider="Vidoza",
+        _selected_language="German Sub",
+    )
+    episode._full_details_filled = True
+    return episode
+
+
+def test_async_extractor(hoster):
+    async def run():
+        try:
+            return await aget_direct_link_from_vidoza(f"{hoster}/embed/video")
+        finally:
+            await models.close_async_http_session()
+
+    assert asyncio.run(run()) == "https://cdn/video.mp4"
+
+
+def test_async_extractor_errors_like_sync(hoster):
+    async def run():
+        try:
+            return await aget_direct_link_from_vidoza(f"{hoster}/missing")
+        finally:
+            await models.close_async_http_session()
+
+    with pytest.raises(ValueError, match="Failed to fetch Vidoza page"):
+        asyncio.run(run())
+
+
+def test_get_direct_links_resolves_batch(hoster):
+    episodes = [make_episode(hoster, number) for number in range(1, 51)]
+
+    links = models.get_direct_links(episodes, concurrency=8)
+
+    assert links == [f"https://cdn/episode-{number}.mp4" for number in range(1, 51)]
+    assert episodes[0].embeded_link == f"{hoster}/embed/episode-1"
+
+
+def test_async_unavailable_hoster_counts_as_failure(hoster):
+    async def run():
+        try:
+            return await aget_direct_link_from_vidoza(f"{hoster}/unavailable")
+        finally:
+            await models.close_async_http_session()
+
+    with pytest.raises(ValueError) as excinfo:
+        asyncio.run(run())
+    assert provider_health.is_hoster_failure(excinfo.value)
+
+    episode = make_episode(hoster, 1)
+    episode.embeded_link = f"{hoster}/unavailable"
+
+    async def resolve():
+        try:
+            return await episode._aget_direct_link_from_provider()
+        finally:
+            await models.close_async_http_session()
+
+    with pytest.raises(ValueError):
+        asyncio.run(resolve())
+    assert provider_health.get_provider_health().get_scores()["Vidoza"]["failures"] == 1
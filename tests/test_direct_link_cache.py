@@ -0,0 +1,104 @@
+import http.server
+import threading
+import time
+
+import pytest
+
+from aniworld import config
+from aniworld.common import cache
+
+
+@pytest.fixture
+def hoster():
+    """Local server answering HEAD requests with a configurable status"""
+    state = {"status": 200, "heads": 0, "headers": None}
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_HEAD(self):
+            state["heads"] += 1
+            state["headers"] = self.headers
+            self.send_response(state["status"])
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.HTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    state["url"] = f"http://127.0.0.1:{server.server_port}/video.mp4"
+    yield state
+    server.shutdown()
+
+
+@pytest.fixture
+def links():
+    return cache.DirectLinkCache(cache.MetadataCache(":memory:"))
+
+
+def test_parse_expiry():
+    expires_at = int(time.time()) + 600
+
+    assert cache.DirectLinkCache.parse_expiry(f"https://x/v.mp4?expires={expires_at}") == expires_at
+    assert cache.DirectLinkCache.parse_expiry(f"https://x/v.mp4?e={expires_at * 1000}") == expires_at
+    assert cache.DirectLinkCache.parse_expiry("https://x/v.mp4?e=100") is None
+    assert cache.DirectLinkCache.parse_expiry("https://x/v.mp4?token=abc") is None
+
+
+def test_reuses_validated_link(links, hoster):
+    links.set("VOE", "https://voe.sx/e/abc", hoster["url"])
+
+    assert links.get("VOE", "https://voe.sx/e/abc") == hoster["url"]
+    assert hoster["heads"] == 1
+
+
+def test_validation_sends_download_headers(links, hoster, monkeypatch):
+    monkeypatch.setattr(
+        config,
+        "PROVIDER_HEADERS_D",
+        {"Vidmoly": ['Referer: "https://vidmoly.net"', "broken header"]},
+    )
+    assert config.get_download_headers("Vidmoly") == {
+        "Referer": '"https://vidmoly.net"'
+    }
+    assert config.get_download_headers("VOE") == {}
+
+    links.set("Vidmoly", "https://vidmoly.net/embed-abc", hoster["url"])
+
+    assert links.get("Vidmoly", "https://vidmoly.net/embed-abc") == hoster["url"]
+    assert hoster["headers"]["Referer"] == '"https://vidmoly.net"'
+
+
+def test_drops_rejected_link_and_learns_ttl(links, hoster):
+    links.set("VOE", "https://voe.sx/e/abc", hoster["url"])
+    hoster["status"] = 403
+
+    assert links.get("VOE", "https://voe.sx/e/abc") is None
+    assert links.cache.get(links.KIND, "VOE|https://voe.sx/e/abc") is None
+    assert links.get_ttl("VOE") < cache.DIRECT_LINK_TTLS["VOE"]
+
+
+def test_skips_already_expired_link(links):
+    links.set("VOE", "https://voe.sx/e/abc", f"https://x/v.mp4?expires={int(time.time()) + 30}")
+
+    assert links.cache.get(links.KIND, "VOE|https://voe.sx/e/abc") is None
+
+
+def test_unreachable_link_does_not_shorten_ttl(links):
+    links.set("VOE", "https://voe.sx/e/abc", "http://127.0.0.1:9/video.mp4")
+
+    assert links.get("VOE", "https://voe.sx/e/abc") is None
+    assert links.cache.get(links.KIND, "VOE|https://voe.sx/e/abc") is None
+    assert links.get_ttl("VOE") == cache.DIRECT_LINK_TTLS["VOE"]
+
+
+def test_learned_ttl_grows_back(links, hoster):
+    links.cache.set(links.TTL_KIND, "VOE", 600)
+    # The link still works after more than half of the learned TTL
+    links.cache.set(
+        links.KIND,
+        "VOE|https://voe.sx/e/abc",
+        {"url": hoster["url"], "created_at": time.time() - 400},
+    )
+
+    assert links.get("VOE", "https://voe.sx/e/abc") == hoster["url"]
+    assert links.get_ttl("VOE") == 900
@@ -0,0 +1,178 @@
+import importlib
+from types import SimpleNamespace
+
+import pytest
+
+from aniworld import entry, models
+from aniworld.web.download_manager import DownloadQueueManager
+
+# aniworld.action exports the download function under the module's name
+download_action = importlib.import_module("aniworld.action.download")
+
+
+def make_anime(episodes: int) -> SimpleNamespace:
+    return SimpleNamespace(
+        title="Some Anime",
+        slug="some-anime",
+        site="aniworld.to",
+        language="German Sub",
+        provider="VOE",
+        action="Download",
+        episode_list=[
+            SimpleNamespace(
+                link=f"https://aniworld.to/anime/stream/some-anime/staffel-1/episode-{n}",
+                season=1,
+                episode=n,
+            )
+            for n in range(1, episodes + 1)
+        ],
+    )
+
+
+@pytest.fixture
+def manager():
+    manager = DownloadQueueManager(max_concurrent_episodes=2)
+    # Jobs are processed by the tests, not by worker threads
+    manager.is_processing = True
+    return manager
+
+
+@pytest.fixture
+def job(manager):
+    queue_id = manager.add_download(
+        "Some Anime",
+        episode_urls=[episode.link for episode in make_anime(2).episode_list],
+        language="German Sub",
+        provider="VOE",
+        total_episodes=2,
+    )
+    return manager._active_downloads[queue_id]
+
+
+def test_parallel_episodes_keep_their_own_progress(manager, job):
+    queue_id = job["id"]
+    manager.update_episode_progress(queue_id, 0.0, "Episode 1", episode_key="1")
+    manager.update_episode_progress(queue_id, 80.0, "Episode 1", episode_key="1")
+
+    # Starting the second episode does not reset the first one
+    manager.update_episode_progress(queue_id, 0.0, "Episode 2", episode_key="2")
+    assert job["progress_percentage"] == pytest.approx(40.0)
+    assert job["current_episode_progress"] == pytest.approx(40.0)
+
+    manager.update_episode_progress(queue_id, 20.0, "Episode 2", episode_key="2")
+    manager._finish_episode_progress(queue_id, "1", 1, "Completed episode 1")
+    assert job["progress_percentage"] == pytest.approx(60.0)
+    assert job["current_episode_progress"] == pytest.approx(20.0)
+
+
+@pytest.mark.parametrize("max_concurrent_episodes", [1, 2])
+def test_stopping_requeues_interrupted_job(
+    manager, job, monkeypatch, max_concurrent_episodes
+):
+    manager.max_concurrent_episodes = max_concurrent_episodes
+    monkeypatch.setattr(
+        entry, "_group_episodes_by_series", lambda episode_urls: [make_anime(2)]
+    )
+    monkeypatch.setattr(models, "Anime", lambda **kwargs: SimpleNamespace(**kwargs))
+
+    def stopped_download(anime, web_progress_callback, provider_limit=None):
+        manager._stop_event.set()
+        web_progress_callback({"status": "downloading"})
+
+    monkeypatch.setattr(download_action, "download", stopped_download)
+
+    manager._process_anime_download_job(job)
+
+    assert job["status"] == "queued"
+    assert job["episode_states"] == {}
+    assert job["id"] in manager._pending_keys
+
+
+def test_failed_episode_worker_is_counted(manager, job, monkeypatch):
+    monkeypatch.setattr(
+        entry, "_group_episodes_by_series", lambda episode_urls: [make_anime(2)]
+    )
+
+    def broken_episode(job, anime, episode, download_dir, tracker):
+        raise RuntimeError("worker crashed")
+
+    monkeypatch.setattr(manager, "_download_episode", broken_episode)
+
+    manager._process_anime_download_job(job)
+
+    assert manager._completed_downloads[-1]["status"] == "failed"
+
+
+def test_failed_flush_is_retried():
+    class FlakyDatabase:
+        def __init__(self):
+            self.fail = True
+            self.jobs = {}
+            self.states = []
+
+        def save_download_jobs(self, jobs):
+            if self.fail:
+                return False
+            self.jobs.update((job["id"], job) for job in jobs)
+            return True
+
+        def save_episode_states(self, states):
+            if self.fail:
+                return False
+            self.states.extend(states)
+            return True
+
+        def prune_download_history(self, limit):
+            pass
+
+    database = FlakyDatabase()
+    manager = DownloadQueueManager(database=database)
+    manager._restored = True
+    manager.is_processing = True
+
+    queue_id = manager.add_download("Some Anime", episode_urls=["a"], total_episodes=1)
+    manager._set_episode_state(queue_id, "a", "failed")
+    manager._flush_pending_writes()
+    assert database.jobs == {}
+
+    # A change made after the failed flush is not overwritten by the retry
+    manager._set_episode_state(queue_id, "a", "completed")
+    manager._update_download_status(queue_id, "downloading", current_episode="Retry")
+    database.fail = False
+    manager._flush_pending_writes()
+
+    assert database.jobs[queue_id]["current_episode"] == "Retry"
+    assert database.states == [(queue_id, "a", "failed"), (queue_id, "a", "completed")]
+    assert not manager._dirty_jobs and not manager._dirty_episodes
+
+
+def test_move_to_front_is_capped(manager):
+    first = manager.add_download("A", episode_urls=["a"], created_by=1)
+    second = manager.add_download("B", episode_urls=["b"], created_by=2)
+    third = manager.add_download("C", episode_urls=["c"], created_by=2)
+
+    # Capped at the default priority, the job only overtakes its owner's jobs
+    assert manager.move_to_front(third, max_priority=0)
+    assert manager._active_downloads[third]["priority"] == 0
+    assert manager._get_next_queued_download()["id"] == first
+    assert manager._get_next_queued_download()["id"] == third
+    assert manager._get_next_queued_download()["id"] == second
+
+
+def test_priority_range_depends_on_role():
+    from aniworld.web.app import WebApp
+
+    web_app = WebApp.__new__(WebApp)
+    web_app.auth_enabled = True
+    web_app.db = None
+
+    assert web_app._parse_priority("-3") == -3
+    with pytest.raises(ValueError, match="between -10 and 0"):
+        web_app._parse_priority(1)
+    with pytest.raises(ValueError, match="integer"):
+        web_app._parse_priority("high")
+
+    web_app.auth_enabled = False
+    assert web_app._parse_priority(10) == 10
+    with pytest.raises(ValueError):
+        web_app._parse_priority(11)
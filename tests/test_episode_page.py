@@ -0,0 +1,159 @@
+import gc
+import weakref
+
+import pytest
+from bs4 import BeautifulSoup
+
+from aniworld.models import Episode, EpisodePage, get_anime_title_from_html
+
+BASE_URL = "https://aniworld.to"
+ROUNDS = 20
+
+
+def build_episode_page(episodes: int = 24, filler_links: int = 400) -> bytes:
+    """Build an episode page shaped like the ones served by aniworld.to"""
+    navigation = "".join(
+        f'<li><a href="/anime/stream/some-anime/staffel-1/episode-{index}">{index}</a></li>'
+        for index in range(1, episodes + 1)
+    )
+    filler = "".join(
+        f'<div class="coverListItem"><a href="/anime/stream/other-{index}">'
+        f"<h3>Other Anime {index}</h3><span>Genre</span></a></div>"
+        for index in range(filler_links)
+    )
+    hosters = "".join(
+        f'<li class="episodeLink{100 + index * 3 + lang_key}" data-lang-key="{lang_key}">'
+        f'<div><a class="watchEpisode" href="/redirect/{1000 + index * 3 + lang_key}">'
+        f"<i class=\"icon {name}\"></i><h4>{name}</h4></a></div></li>"
+        for index, name in enumerate(["VOE", "Doodstream", "Vidoza", "Filemoon"])
+        for lang_key in (1, 2, 3)
+    )
+    page = f"""
+    <html><head><title>Some Anime</title></head><body>
+    <div class="series-title"><h1 title="Some Anime"><span>Some Anime</span></h1>
+    <small>2020 - 2024</small></div>
+    <ul>{navigation}</ul>
+    <div class="hosterSiteTitle">
+        <h2><span class="episodeGermanTitle">Der Anfang</span>
+        <small class="episodeEnglishTitle">The Beginning</small></h2>
+    </div>
+    <div class="changeLanguageBox">
+        <img data-lang-key="3" src="/german-sub.svg">
+        <img data-lang-key="1" src="/german.svg">
+        <img data-lang-key="2" src="/english-sub.svg">
+    </div>
+    <ul class="row">{hosters}</ul>
+    {filler}
+    </body></html>
+    """
+    return page.encode()
+
+
+# Keep provider maps out of the user's metadata cache
+pytestmark = pytest.mark.usefixtures("isolated_metadata_cache")
+
+
+class _Response:
+    def __init__(self, content: bytes):
+        self.content = content
+
+
+def parse_with_beautifulsoup(content: bytes):
+    """The four separate html.parser passes used before EpisodePage"""
+    title_div = BeautifulSoup(content, "html.parser").find("div", class_="series-title")
+    anime_title = title_div.find("h1").find("span").get_text(strip=True)
+
+    soup = BeautifulSoup(content, "html.parser")
+    title_german = soup.find("span", class_="episodeGermanTitle").get_text(strip=True)
+    title_english = soup.find("small", class_="episodeEnglishTitle").get_text(strip=True)
+
+    soup = BeautifulSoup(content, "html.parser")
+    languages = sorted(
+        int(img["data-lang-key"])
+        for img in soup.find("div", class_="changeLanguageBox").find_all("img")
+    )
+
+    soup = BeautifulSoup(content, "html.parser")
+    providers = {}
+    for link in soup.find_all("li", class_=lambda x: x and x.startswith("episodeLink")):
+        name = link.find("h4").get_text(strip=True)
+        href = link.find("a", class_="watchEpisode")["href"]
+        providers.setdefault(name, {})[int(link["data-lang-key"])] = f"{BASE_URL}{href}"
+
+    return anime_title, title_german, title_english, languages, providers
+
+
+def test_episode_page_matches_beautifulsoup():
+    content = build_episode_page()
+    page = EpisodePage(content, BASE_URL)
+
+    assert (
+        page.anime_title,
+        page.title_german,
+        page.title_english,
+        page.languages,
+        page.providers,
+    ) == parse_with_beautifulsoup(content)
+    assert page.has_language_box
+    assert page.episode_link_count == 12
+    assert get_anime_title_from_html(_Response(content)) == "Some Anime"
+
+
+def test_episode_page_without_streams():
+    page = EpisodePage(b"<html><body><p>Not found</p></body></html>", BASE_URL)
+
+    assert page.anime_title == ""
+    assert not page.has_language_box
+    assert page.languages == []
+    assert page.episode_link_count == 0
+    assert page.providers == {}
+
+
+@pytest.mark.benchmark
+def test_episode_page_parse_benchmark(benchmark_timer):
+    content = build_episode_page()
+
+    benchmark_timer(
+        "4x BeautifulSoup", lambda: parse_with_beautifulsoup(content), ROUNDS
+    )
+    benchmark_timer("EpisodePage", lambda: EpisodePage(content, BASE_URL), ROUNDS)
+
+
+def _run_job(content: bytes, episodes: int):
+    """Resolve metadata of a batch of episodes like a download job does"""
+    refs = []
+    for number in range(1, episodes + 1):
+        episode = Episode(
+            link=f"{BASE_URL}/anime/stream/some-anime/staffel-1/episode-{number}",
+            html=_Response(content),
+        )
+        episode.auto_fill_details()
+        assert episode._get_available_languages_from_html() == [1, 2, 3]
+        assert "VOE" in episode._get_providers_from_html()
+        refs.append(weakref.ref(episode))
+    return refs
+
+
+def test_episodes_are_collectable_after_job():
+    refs = _run_job(build_episode_page(filler_links=0), episodes=40)
+    gc.collect()
+
+    assert [ref for ref in refs if ref() is not None] == []
+
+
+def test_episode_memoizes_per_instance():
+    episode = Episode(
+        link=f"{BASE_URL}/anime/stream/some-anime/staffel-1/episode-1",
+        html=_Response(build_episode_page(filler_links=0)),
+    )
+
+    providers = episode._get_providers_from_html()
+    providers["VOE"].clear()
+    episode._html_cache = None  # a second parse would need a network request
+
+    assert episode._get_providers_from_html()["VOE"] == {
+        1: f"{BASE_URL}/redirect/1001",
+        2: f"{BASE_URL}/redirect/1002",
+        3: f"{BASE_URL}/redirect/1003",
+    }
+    assert episode._get_available_languages_from_html() == [1, 2, 3]
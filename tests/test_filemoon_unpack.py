@@ -0,0 +1,124 @@
+import re
+import string
+import time
+
+import pytest
+
+from aniworld.extractors.provider import filemoon
+
+ROUNDS = 3
+FILE_URL = (
+    "https://be7713.rcr82.waw05.cdn112.com/hls2/01/08634/k1jqbnwy3ycf_,n,.urlset/"
+    "master.m3u8?t=Z3mDSSl4X1yzOsvC7SEWiz0S2KnbdzG7nw4Q9pR8a_4&s=1731000000&e=10800"
+)
+
+
+def to_base(index: int, radix: int) -> str:
+    alphabet = string.digits + string.ascii_lowercase + string.ascii_uppercase
+    word = ""
+    while True:
+        index, rest = divmod(index, radix)
+        word = alphabet[rest] + word
+        if not index:
+            return word
+
+
+def pack(source: str, radix: int = 36) -> str:
+    """Pack a script like Dean Edwards' p.a.c.k.e.r does"""
+    words = []
+    for word in re.findall(r"\b\w+\b", source, re.ASCII):
+        if word not in words:
+            words.append(word)
+
+    encoded = {word: to_base(index, radix) for index, word in enumerate(words)}
+    payload = re.sub(
+        r"\b\w+\b", lambda match: encoded[match.group(0)], source, flags=re.ASCII
+    )
+    payload = payload.replace("\\", "\\\\").replace("'", "\\'")
+    symbols = "|".join("" if encoded[word] == word else word for word in words)
+    return (
+        "eval(function(p,a,c,k,e,d){e=function(c){return(c<a?'':e(parseInt(c/a)))"
+        "+((c=c%a)>35?String.fromCharCode(c+29):c.toString(36))};if(!''.replace(/^/,"
+        "String)){while(c--){d[e(c)]=k[c]||e(c)}k=[function(e){return d[e]}];"
+        "e=function(){return'\\\\w+'};c=1};while(c--){if(k[c]){p=p.replace(new "
+        "RegExp('\\\\b'+e(c)+'\\\\b','g'),k[c])}}return p}"
+        f"('{payload}',{radix},{len(words)},'{symbols}'.split('|'),0,{{}}))"
+    )
+
+
+def build_iframe_page(radix: int = 36, filler_scripts: int = 200) -> str:
+    """An iframe page shaped like the ones served by Filemoon"""
+    player = (
+        'var player=jwplayer("vplayer");player.setup({sources:[{file:"'
+        + FILE_URL
+        + '"}],image:"https://videothumbs.me/k1jqbnwy3ycf.jpg",width:"100%",'
+        'height:"100%",stretching:"uniform",duration:"1420.05",'
+        "preload:'none',androidhls:\"true\",tracks:[],captions:{userFontScale:1}});"
+        "player.on('time',function(x){if(x.position>5){ls.set('tt'+x.duration,"
+        "Math.round(x.position))}});var vvplay,vvad;"
+    )
+    filler = "".join(
+        f"<script>function f{index}(a,b){{var c=a+b;for(var i=0;i<{index};i++)"
+        f"{{c=c*2-i;if(c>1000){{c=c%97}}}}return c}}</script>"
+        for index in range(filler_scripts)
+    )
+    return (
+        "<!DOCTYPE html><html><head><title>Filemoon</title>"
+        "<style>body{margin:0;background:#000}</style></head><body>"
+        f'<div id="vplayer"></div>{filler}'
+        f"<script type='text/javascript'>{pack(player, radix)}</script>"
+        "</body></html>"
+    )
+
+
+def extract_with_beautifier(html: str) -> str:
+    """The extraction before the packed script fast path"""
+    return filemoon._extract_file_url(filemoon._beautify_javascript(html), "iframe")
+
+
+@pytest.mark.parametrize("radix", [10, 36, 62])
+def test_fast_path_matches_beautifier(radix):
+    page = build_iframe_page(radix)
+
+    assert filemoon._find_file_url(page, "iframe") == FILE_URL
+    assert extract_with_beautifier(page) == FILE_URL
+
+
+def test_falls_back_to_beautifier(monkeypatch):
+    calls = []
+    beautify = filemoon._beautify_javascript
+
+    def _beautify(html):
+        calls.append(html)
+        return beautify(html)
+
+    monkeypatch.setattr(filemoon, "_beautify_javascript", _beautify)
+
+    # Player setup that is not packed
+    page = f'<script>jwplayer("vplayer").setup({{file: "{FILE_URL}"}});</script>'
+    assert filemoon._find_file_url(page, "iframe") == FILE_URL
+
+    # Malformed symbol table
+    page = build_iframe_page().replace(".split('|')", "|broken.split('|')")
+    with pytest.raises(ValueError):
+        filemoon._find_file_url(page, "iframe")
+    assert len(calls) == 2
+
+
+@pytest.mark.benchmark
+def test_extraction_benchmark(benchmark_timer):
+    page = build_iframe_page()
+    size = f"{len(page) / 1024:.1f} KiB"
+
+    benchmark_timer(
+        f"{size} CPU time with jsbeautifier",
+        lambda: extract_with_beautifier(page),
+        ROUNDS,
+        timer=time.process_time,
+    )
+    benchmark_timer(
+        f"{size} CPU time unpacking only",
+        lambda: filemoon._find_file_url(page, "iframe"),
+        ROUNDS,
+        timer=time.process_time,
+    )
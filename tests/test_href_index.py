@@ -0,0 +1,121 @@
+import pytest
+from bs4 import BeautifulSoup
+
+from aniworld.common import EpisodeHrefIndex
+
+SLUG = "one-piece"
+SEASONS = range(1, 22)
+ROUNDS = 3
+
+
+def build_series_page(seasons: int = 21, episodes: int = 60, movies: int = 15) -> str:
+    """A long running series page linking every episode, film and other anime"""
+    episode_links = "".join(
+        f'<li><a href="/anime/stream/{SLUG}/staffel-{season}/episode-{episode}">'
+        f"{episode}</a></li>"
+        for season in range(1, seasons + 1)
+        for episode in range(1, episodes + 1)
+    )
+    movie_links = "".join(
+        f'<li><a href="/anime/stream/{SLUG}/filme/film-{movie}">Film {movie}</a></li>'
+        for movie in range(1, movies + 1)
+    )
+    # Recently released episodes of other anime in the sidebar
+    other_links = "".join(
+        f'<a href="/anime/stream/other-{index}/staffel-1/episode-{index}">Other</a>'
+        f'<a href="/anime/stream/other-{index}/filme/film-{index}">Other film</a>'
+        for index in range(1, 200)
+    )
+    return (
+        f"<html><body><ul>{episode_links}</ul><ul>{movie_links}</ul>"
+        f"<aside>{other_links}</aside></body></html>"
+    )
+
+
+def season_count_with_beautifulsoup(soup: BeautifulSoup, season: int) -> int:
+    """_parse_season_episodes as it was before the href index"""
+    return len(
+        set(
+            link["href"]
+            for link in soup.find_all("a", href=True)
+            if f"staffel-{season}/episode-" in link["href"]
+        )
+    )
+
+
+def movie_count_with_beautifulsoup(soup: BeautifulSoup) -> int:
+    """The per film anchor scan get_movie_episode_count used before"""
+    movie_index = 1
+    while [
+        link["href"]
+        for link in soup.find_all("a", href=True)
+        if f"{SLUG}/filme/film-{movie_index}" in link["href"]
+    ]:
+        movie_index += 1
+    return movie_index - 1
+
+
+def test_index_matches_anchor_scans():
+    html = build_series_page(seasons=3, episodes=12, movies=4)
+    index = EpisodeHrefIndex(html, SLUG)
+
+    soup = BeautifulSoup(html, "html.parser")
+
+    assert index.movie_count() == movie_count_with_beautifulsoup(soup) == 4
+    for season in range(1, 4):
+        assert index.episode_count(season) == 12
+    assert index.episode_count(4) == 0
+
+
+def test_index_filters_other_anime():
+    html = build_series_page(seasons=1, episodes=3, movies=0)
+
+    assert EpisodeHrefIndex(html, SLUG).episode_count(1) == 3
+    # Episode numbers of all anime, 1-3 are shared
+    assert EpisodeHrefIndex(html).episode_count(1) == 199
+    assert EpisodeHrefIndex(html, SLUG).movie_count() == 0
+
+
+def test_movie_count_stops_at_gap():
+    html = (
+        f'<a href="/anime/stream/{SLUG}/filme/film-1">1</a>'
+        f"<a href='/anime/stream/{SLUG}/filme/film-2'>2</a>"
+        f'<a href="/anime/stream/{SLUG}/filme/film-4">4</a>'
+    )
+
+    assert EpisodeHrefIndex(html, SLUG).movie_count() == 2
+
+
+def test_index_matches_anchor_scans_on_large_page():
+    html = build_series_page()
+    soup = BeautifulSoup(html, "html.parser")
+    index = EpisodeHrefIndex(html, SLUG)
+
+    counts = [index.episode_count(season) for season in SEASONS]
+    assert counts == [60] * 21
+    # The anchor scan also counted the sidebar's season 1 episodes
+    assert counts[1:] == [
+        season_count_with_beautifulsoup(soup, season) for season in SEASONS[1:]
+    ]
+    assert index.movie_count() == movie_count_with_beautifulsoup(soup) == 15
+
+
+@pytest.mark.benchmark
+def test_href_index_benchmark(benchmark_timer):
+    html = build_series_page()
+    size = f"{len(html) / 1024:.0f} KiB"
+
+    def scan_anchors():
+        soup = BeautifulSoup(html, "html.parser")
+        for season in SEASONS:
+            season_count_with_beautifulsoup(soup, season)
+        movie_count_with_beautifulsoup(soup)
+
+    def use_index():
+        index = EpisodeHrefIndex(html, SLUG)
+        for season in SEASONS:
+            index.episode_count(season)
+        index.movie_count()
+
+    benchmark_timer(f"{size} scanning anchors", scan_anchors, ROUNDS)
+    benchmark_timer(f"{size} with the href index", use_index, ROUNDS)
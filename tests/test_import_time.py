@@ -0,0 +1,82 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+SRC = Path(__file__).resolve().parent.parent / "src"
+
+PROVIDER_DEPENDENCIES = ("jsbeautifier", "fake_useragent")
+# Only needed to download, for the interactive menu or for the web interface
+ACTION_DEPENDENCIES = ("yt_dlp", "curses", "npyscreen", "aiohttp", "flask")
+
+
+def loaded_modules(statement: str) -> set:
+    """
+    Run a statement in a fresh interpreter.
+
+    Args:
+        statement: Python code to run, usually an import
+
+    Returns:
+        Names of all modules in sys.modules afterwards, including the ones
+        imported with importlib.import_module
+    """
+    env = dict(os.environ, PYTHONPATH=str(SRC))
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            f"{statement}\nimport sys\nprint(*sys.modules, sep='\\n')",
+        ],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    return set(result.stdout.split())
+
+
+def test_extractors_import_no_provider():
+    loaded = loaded_modules("import aniworld.extractors")
+
+    assert not [name for name in loaded if name.startswith("aniworld.extractors.")]
+    assert not [name for name in loaded if name in PROVIDER_DEPENDENCIES]
+
+
+def test_extractor_imported_on_first_use():
+    loaded = loaded_modules(
+        "import aniworld.extractors as extractors; "
+        "extractors.get_direct_link_from_streamtape"
+    )
+
+    assert "aniworld.extractors.provider.streamtape" in loaded
+    assert "aniworld.extractors.provider.voe" not in loaded
+
+
+def test_config_user_agent_is_lazy():
+    loaded = loaded_modules("import aniworld.config")
+
+    assert "fake_useragent" not in loaded
+
+
+def test_entry_point_imports_only_what_it_needs():
+    loaded = loaded_modules("import aniworld.__main__")
+
+    assert not [name for name in loaded if name in ACTION_DEPENDENCIES]
+    assert not [name for name in loaded if name in PROVIDER_DEPENDENCIES]
+
+
+@pytest.mark.benchmark
+def test_entry_point_startup_benchmark(benchmark_timer):
+    # Importing the entry point took about 500 ms before the imports above
+    # were deferred and about 220 ms after, on the machine it was measured on
+    env = dict(os.environ, PYTHONPATH=str(SRC))
+    benchmark_timer(
+        "interpreter start and import aniworld.__main__",
+        lambda: subprocess.run(
+            [sys.executable, "-c", "import aniworld.__main__"], env=env, check=True
+        ),
+        3,
+    )
@@ -0,0 +1,44 @@
+import time
+
+import pytest
+
+from aniworld.common import cache
+
+
+@pytest.fixture
+def metadata_cache(tmp_path):
+    return cache.MetadataCache(str(tmp_path / "metadata.db"), max_entries=3)
+
+
+def _age(metadata_cache, kind: str, key: str, seconds: float) -> None:
+    """Pretend an entry was last accessed seconds ago"""
+    with metadata_cache._conn:
+        metadata_cache._conn.execute(
+            "UPDATE metadata_cache SET last_access = ? WHERE kind = ? AND key = ?",
+            (time.time() - seconds, kind, key),
+        )
+
+
+def test_reads_do_not_write(metadata_cache):
+    metadata_cache.set("seasons", "a", {"1": 12})
+    _age(metadata_cache, "seasons", "a", 3600)
+    changes = metadata_cache._conn.total_changes
+
+    for _ in range(50):
+        assert metadata_cache.get("seasons", "a") == {"1": 12}
+
+    assert metadata_cache._conn.total_changes == changes
+
+
+def test_batched_access_keeps_entry_on_eviction(metadata_cache, monkeypatch):
+    monkeypatch.setattr(cache, "_EVICTION_INTERVAL", 1)
+    for key in "abc":
+        metadata_cache.set("seasons", key, 1)
+        _age(metadata_cache, "seasons", key, 3600 - ord(key))
+
+    # "a" is the least recently written one but was read since
+    assert metadata_cache.get("seasons", "a") == 1
+    metadata_cache.set("seasons", "d", 1)
+
+    assert metadata_cache.get("seasons", "a") == 1
+    assert metadata_cache.get("seasons", "b") is None
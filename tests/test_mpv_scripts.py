@@ -0,0 +1,88 @@
+import os
+
+import pytest
+
+from aniworld.common import common
+
+SCRIPTS = ("aniskip.lua", "autoexit.lua", "autostart.lua")
+
+
+@pytest.fixture
+def copies(tmp_path, monkeypatch, isolated_metadata_cache):
+    """Install into a temporary MPV directory and count the file comparisons"""
+    monkeypatch.setattr(common, "MPV_DIRECTORY", str(tmp_path / "mpv"))
+    monkeypatch.setattr(
+        common, "MPV_SCRIPTS_DIRECTORY", str(tmp_path / "mpv" / "scripts")
+    )
+    monkeypatch.setattr(common, "_installed_scripts", set())
+
+    calls = []
+    copy_file_if_different = common.copy_file_if_different
+
+    def _copy(source_path, destination_path):
+        calls.append(os.path.basename(destination_path))
+        return copy_file_if_different(source_path, destination_path)
+
+    monkeypatch.setattr(common, "copy_file_if_different", _copy)
+    return calls
+
+
+def _script_path(name: str) -> str:
+    return os.path.join(common.MPV_SCRIPTS_DIRECTORY, name)
+
+
+def test_scripts_are_verified_once_per_process(copies):
+    for _ in range(24):
+        for script in SCRIPTS:
+            assert common.setup_mpv_script(script)
+
+    assert sorted(copies) == sorted(SCRIPTS)
+    assert all(os.path.exists(_script_path(script)) for script in SCRIPTS)
+
+
+def test_stamp_skips_comparison_in_next_process(copies):
+    common.setup_autostart()
+    common._installed_scripts.clear()
+
+    common.setup_autostart()
+    assert copies == ["autostart.lua"]
+
+
+def test_changed_copy_is_replaced(copies):
+    common.setup_autoexit()
+    common._installed_scripts.clear()
+
+    with open(_script_path("autoexit.lua"), "a", encoding="utf-8") as script:
+        script.write("-- edited\n")
+
+    common.setup_autoexit()
+    assert copies == ["autoexit.lua", "autoexit.lua"]
+    with open(_script_path("autoexit.lua"), encoding="utf-8") as script:
+        assert "-- edited" not in script.read()
+
+
+def test_removed_scripts_are_set_up_again(copies):
+    common.setup_autostart()
+    common.remove_mpv_scripts()
+
+    assert not os.path.exists(_script_path("autostart.lua"))
+    assert common.setup_autostart()
+    assert os.path.exists(_script_path("autostart.lua"))
+
+
+def test_failed_copy_is_not_stamped(copies, monkeypatch):
+    common.setup_autoexit()
+    common._installed_scripts.clear()
+
+    # An outdated copy of the same size the copy fails to replace
+    with open(_script_path("autoexit.lua"), "r+", encoding="utf-8") as script:
+        script.write("--")
+    with monkeypatch.context() as patch:
+        patch.setattr(common.shutil, "copy", lambda *args: 1 / 0)
+
+        assert not common.setup_autoexit()
+        assert "autoexit.lua" not in common._installed_scripts
+
+    assert common.setup_autoexit()
+    with open(_script_path("autoexit.lua"), encoding="utf-8") as script:
+        assert not script.read().startswith("--")
@@ -0,0 +1,162 @@
+import importlib
+import io
+import time
+
+import pytest
+import requests
+
+from aniworld.common import cache, provider_health
+
+
+@pytest.fixture
+def metadata_cache(tmp_path):
+    return cache.MetadataCache(str(tmp_path / "metadata.db"))
+
+
+@pytest.fixture
+def health(metadata_cache):
+    return provider_health.ProviderHealth(metadata_cache)
+
+
+def test_circuit_opens_after_repeated_failures(health):
+    for _ in range(provider_health.PROVIDER_FAILURE_THRESHOLD - 1):
+        health.record_failure("Doodstream", ValueError("timeout"))
+    assert health.is_available("Doodstream")
+
+    health.record_failure("Doodstream", ValueError("timeout"))
+    assert not health.is_available("Doodstream")
+
+    scores = health.get_scores()["Doodstream"]
+    assert not scores["available"]
+    assert scores["last_error"] == "timeout"
+    assert scores["cooldown_remaining"] > 0
+
+
+def test_failure_after_cooldown_reopens_circuit(health):
+    for _ in range(provider_health.PROVIDER_FAILURE_THRESHOLD):
+        health.record_failure("Filemoon")
+    stats = health.cache.get(health.KIND, "Filemoon")
+    health.cache.set(health.KIND, "Filemoon", {**stats, "open_until": time.time() - 1})
+    assert health.is_available("Filemoon")
+
+    health.record_failure("Filemoon")
+    assert not health.is_available("Filemoon")
+
+    health.record_success("Filemoon", latency=0.5)
+    assert health.is_available("Filemoon")
+
+
+def test_scores_are_shared_through_metadata_cache(health, metadata_cache):
+    health.record_success("VOE", latency=1.0, bytes_per_second=4096)
+    health.record_success("VOE", latency=2.0)
+
+    scores = provider_health.ProviderHealth(metadata_cache).get_scores()
+    assert list(scores) == ["VOE"]
+    assert scores["VOE"]["score"] == 100
+    assert scores["VOE"]["latency"] == pytest.approx(1.3)
+    assert scores["VOE"]["bytes_per_second"] == 4096
+
+
+def test_only_hoster_failures_count():
+    def wrapped(error):
+        # Extractors wrap request errors in ValueError
+        try:
+            raise ValueError("Failed to fetch VOE page") from error
+        except ValueError as err:
+            return err
+
+    unavailable = requests.Response()
+    unavailable.status_code = 503
+    not_found = requests.Response()
+    not_found.status_code = 404
+
+    assert provider_health.is_hoster_failure(requests.ConnectTimeout())
+    assert provider_health.is_hoster_failure(wrapped(requests.ReadTimeout()))
+    assert provider_health.is_hoster_failure(
+        wrapped(requests.HTTPError(response=unavailable))
+    )
+    assert not provider_health.is_hoster_failure(
+        wrapped(requests.HTTPError(response=not_found))
+    )
+    assert not provider_health.is_hoster_failure(ValueError("No video source found"))
+    assert not provider_health.is_hoster_failure(
+        ValueError("Extractor function 'get_direct_link_from_voe' not found")
+    )
+
+
+@pytest.mark.parametrize(
+    "cause, counted",
+    [
+        (None, False),
+        ("HTTPError 404", False),
+        ("HTTPError 503", True),
+        ("TransportError", True),
+    ],
+)
+def test_only_hoster_download_errors_count(cause, counted):
+    yt_dlp = pytest.importorskip("yt_dlp")
+    from yt_dlp.networking import Response
+    from yt_dlp.networking.exceptions import HTTPError, TransportError
+
+    # aniworld.action exports the download function under the module's name
+    download_action = importlib.import_module("aniworld.action.download")
+
+    exc_info = None
+    if cause == "TransportError":
+        exc_info = (TransportError, TransportError("reset"), None)
+    elif cause:
+        status = int(cause.split()[1])
+        error = HTTPError(Response(io.BytesIO(b""), "https://cdn/v.mp4", {}, status))
+        exc_info = (HTTPError, error, None)
+
+    error = yt_dlp.DownloadError("download failed", exc_info=exc_info)
+    assert download_action._is_hoster_download_error(error) is counted
+
+
+def test_processes_share_failures(health, metadata_cache):
+    web_server = provider_health.ProviderHealth(metadata_cache)
+    web_server.record_success("VOE")
+
+    for _ in range(provider_health.PROVIDER_FAILURE_THRESHOLD):
+        health.record_failure("VOE")
+
+    # The web server sees the failures of the CLI run and does not undo them
+    assert not web_server.is_available("VOE")
+    web_server.record_failure("VOE")
+    assert health.get_scores()["VOE"]["failures"] == (
+        provider_health.PROVIDER_FAILURE_THRESHOLD + 1
+    )
+
+
+def test_allow_retry_half_opens_circuit(health):
+    for _ in range(provider_health.PROVIDER_FAILURE_THRESHOLD):
+        health.record_failure("VOE")
+    assert not health.is_available("VOE")
+
+    health.allow_retry("VOE")
+    assert health.is_available("VOE")
+
+    # The next failure opens the circuit again right away
+    health.record_failure("VOE")
+    assert not health.is_available("VOE")
+
+
+def test_redirect_link_retries_when_every_provider_fails(health, monkeypatch):
+    from aniworld import models
+
+    monkeypatch.setattr(provider_health, "_provider_health", health)
+    for provider in ("VOE", "Filemoon"):
+        for _ in range(provider_health.PROVIDER_FAILURE_THRESHOLD):
+            health.record_failure(provider)
+
+    episode = models.Episode(
+        link="https://aniworld.to/anime/stream/some-anime/staffel-1/episode-1",
+        provider={"VOE": {3: "https://aniworld.to/redirect/1"}, "Filemoon": {}},
+        _selected_provider="VOE",
+        _selected_language="German Sub",
+    )
+    episode._basic_details_filled = episode._full_details_filled = True
+
+    assert episode.get_redirect_link() == "https://aniworld.to/redirect/1"
+    assert health.is_available("VOE")
+    assert not health.is_available("Filemoon")
@@ -0,0 +1,87 @@
+import http.server
+import threading
+import time
+
+import pytest
+
+from aniworld import models
+from aniworld.common import provider_health
+
+
+@pytest.fixture
+def hoster():
+    """Local server serving a slow, a fast and a broken direct link"""
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.endswith(".m3u8"):
+                # HLS master and media playlists of a few hundred bytes
+                entry = "media.m3u8" if "master" in self.path else "/hls/fast-seg0.ts"
+                body = f"#EXTM3U\n#EXT-X-VERSION:3\n#EXTINF:10.0,\n{entry}\n".encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/vnd.apple.mpegurl")
+                self.end_headers()
+                self.wfile.write(body)
+                return
+            if "broken" in self.path:
+                self.send_response(404)
+                self.end_headers()
+                return
+            delay = 0.3 if "slow" in self.path else 0
+            self.send_response(206)
+            self.end_headers()
+            for _ in range(8):
+                time.sleep(delay / 8)
+                self.wfile.write(b"x" * 32768)
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+
+
+@pytest.fixture
+def episode(hoster, monkeypatch, isolated_metadata_cache):
+    monkeypatch.setattr(provider_health, "_provider_health", provider_health.ProviderHealth())
+    monkeypatch.setattr(models, "_get_embeded_link", lambda redirect_link: redirect_link)
+    monkeypatch.setattr(
+        models.Episode,
+        "_get_direct_link_from_provider",
+        lambda self, provider=None, embeded_link=None: f"{hoster}/{embeded_link}",
+    )
+
+    episode = models.Episode(
+        link="https://aniworld.to/anime/stream/some-anime/staffel-1/episode-1",
+        provider={"VOE": {3: "slow"}, "Filemoon": {3: "fast"}, "Vidmoly": {3: "broken"}},
+        _selected_provider="VOE",
+        _selected_language="German Sub",
+    )
+    episode._basic_details_filled = episode._full_details_filled = True
+    return episode
+
+
+def test_race_picks_fastest_and_falls_back(episode, hoster):
+    assert episode.race_direct_link() == f"{hoster}/fast"
+    assert episode._selected_provider == "Filemoon"
+    assert episode.redirect_link == "fast"
+
+    assert episode.next_direct_link() == f"{hoster}/slow"
+    assert episode._selected_provider == "VOE"
+
+    # The broken provider never qualifies, but a missing video is no outage
+    assert episode.next_direct_link() is None
+    assert "Vidmoly" not in provider_health.get_provider_health().get_scores()
+
+
+def test_probe_measures_first_hls_segment(episode, hoster):
+    # Only the first segment is measured, the tiny playlists are followed
+    throughput = models._probe_direct_link("VOE", f"{hoster}/hls/master.m3u8")
+    assert throughput > models._probe_direct_link("Filemoon", f"{hoster}/slow")
+
+    # Probes do not mix into the download throughput of the provider health
+    stats = provider_health.get_provider_health().get_scores()
+    assert stats["VOE"]["successes"] == 1
+    assert stats["VOE"]["bytes_per_second"] is None
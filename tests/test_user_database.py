@@ -0,0 +1,49 @@
+from contextlib import contextmanager
+
+import pytest
+
+from aniworld.web.database import UserDatabase
+
+
+@pytest.fixture
+def database(tmp_path):
+    database = UserDatabase(str(tmp_path / "users.db"))
+    yield database
+    database.close()
+
+
+def test_lookup_before_commit_is_not_cached(database, monkeypatch):
+    assert database.create_user("someone", "secret")
+    user_id = database.verify_user("someone", "secret")["id"]
+    token = database.create_session(user_id)
+    assert database.get_user_by_session(token)["username"] == "someone"
+
+    connection = database._connection
+
+    class LookupBeforeCommit:
+        """Let another request validate the session right before the commit"""
+
+        def __init__(self, conn):
+            self._conn = conn
+
+        def __getattr__(self, name):
+            return getattr(self._conn, name)
+
+        def commit(self):
+            database.get_user_by_session(token)
+            self._conn.commit()
+
+    @contextmanager
+    def racing_connection():
+        with connection() as conn:
+            yield LookupBeforeCommit(conn)
+
+    with monkeypatch.context() as patch:
+        patch.setattr(database, "_connection", racing_connection)
+        assert database.update_user(user_id, is_admin=True)
+    assert database.get_user_by_session(token)["is_admin"]
+
+    with monkeypatch.context() as patch:
+        patch.setattr(database, "_connection", racing_connection)
+        assert database.delete_user(user_id)
+    assert database.get_user_by_session(token) is None
@@ -0,0 +1,152 @@
+import base64
+import binascii
+import json
+import random
+import string
+
+import pytest
+
+from aniworld.extractors.provider import voe
+
+FUZZ_ROUNDS = 2000
+ROUNDS = 50
+
+
+def shift_letters_loop(input_str: str) -> str:
+    """The per character ROT13 loop used before the translation tables"""
+    result = []
+    for c in input_str:
+        code = ord(c)
+        if 65 <= code <= 90:
+            code = (code - 65 + 13) % 26 + 65
+        elif 97 <= code <= 122:
+            code = (code - 97 + 13) % 26 + 97
+        result.append(chr(code))
+    return "".join(result)
+
+
+def replace_junk_chained(input_str: str) -> str:
+    for part in voe.JUNK_PARTS:
+        input_str = input_str.replace(part, "_")
+    return input_str
+
+
+def shift_back_loop(s: str, n: int) -> str:
+    return "".join(chr(ord(c) - n) for c in s)
+
+
+def decode_voe_string_loop(encoded: str):
+    """decode_voe_string as it was before the translation tables"""
+    try:
+        step1 = shift_letters_loop(encoded)
+        step2 = replace_junk_chained(step1).replace("_", "")
+        step3 = base64.b64decode(step2).decode()
+        step4 = shift_back_loop(step3, 3)
+        step5 = base64.b64decode(step4[::-1]).decode()
+        return json.loads(step5)
+    except (binascii.Error, json.JSONDecodeError, UnicodeDecodeError) as err:
+        raise ValueError(f"Failed to decode VOE string: {err}") from err
+
+
+def encode_voe_string(payload: dict, rng: random.Random) -> str:
+    """Encode a payload the way VOE does, the inverse of decode_voe_string"""
+    step4 = base64.b64encode(json.dumps(payload).encode()).decode()[::-1]
+    step3 = "".join(chr(ord(c) + 3) for c in step4)
+    step2 = base64.b64encode(step3.encode()).decode()
+
+    chunks = []
+    for char in step2:
+        chunks.append(char)
+        if rng.random() < 0.1:
+            chunks.append(rng.choice(voe.JUNK_PARTS))
+    return shift_letters_loop("".join(chunks))
+
+
+def build_payload(rng: random.Random, tracks: int) -> dict:
+    """A source payload shaped like the ones embedded in VOE pages"""
+    return {
+        "source": f"https://delivery-node-{rng.randint(1, 99)}.voe-network.net/"
+        f"engine/hls2/01/{rng.getrandbits(64):x}/master.m3u8?t={rng.getrandbits(128):x}",
+        "fallback": [
+            {"file": f"https://cdn.example.net/{rng.getrandbits(64):x}.mp4", "label": q}
+            for q in ("1080p", "720p", "480p")
+        ],
+        "tracks": [
+            {
+                "file": f"https://cdn.example.net/subs/{index}.vtt",
+                "label": rng.choice(["Deutsch", "English", "日本語"]),
+                "kind": "captions",
+            }
+            for index in range(tracks)
+        ],
+        "title": "Épisode " + "".join(rng.choices(string.ascii_letters, k=16)),
+    }
+
+
+def decode_or_error(decoder, encoded: str):
+    try:
+        return decoder(encoded)
+    except ValueError:
+        return ValueError
+
+
+def test_translation_tables_match_loops():
+    text = string.printable + "äöüß日本語"
+
+    assert voe.shift_letters(text) == shift_letters_loop(text)
+    assert voe.shift_back(text[10:], 3) == shift_back_loop(text[10:], 3)
+    assert voe.replace_junk("a@$b^^c~@d%?e*~f!!g#&h") == "a_b_c_d_e_f_g_h"
+    with pytest.raises(ValueError):
+        voe.shift_back("\x01", 3)
+
+
+def test_decoder_fuzz_matches_loop_decoder():
+    rng = random.Random(1337)
+    alphabet = string.ascii_letters + string.digits + "+/=_" + "".join(voe.JUNK_PARTS)
+
+    for _ in range(FUZZ_ROUNDS):
+        encoded = encode_voe_string(build_payload(rng, rng.randint(0, 5)), rng)
+        if rng.random() < 0.5:
+            # Corrupt some of them to compare the failures too
+            chars = list(encoded)
+            for _ in range(rng.randint(1, 4)):
+                chars[rng.randrange(len(chars))] = rng.choice(alphabet)
+            encoded = "".join(chars)
+
+        assert decode_or_error(voe.decode_voe_string, encoded) == decode_or_error(
+            decode_voe_string_loop, encoded
+        )
+
+
+def test_decoder_fuzz_random_strings():
+    rng = random.Random(42)
+    alphabet = string.ascii_letters + string.digits + "+/=_" + "".join(voe.JUNK_PARTS)
+
+    for _ in range(FUZZ_ROUNDS):
+        encoded = "".join(rng.choices(alphabet, k=rng.randint(0, 64)))
+        assert decode_or_error(voe.decode_voe_string, encoded) == decode_or_error(
+            decode_voe_string_loop, encoded
+        )
+
+
+@pytest.mark.parametrize("tracks", [2, 40, 200])
+def test_decoder_matches_loop_decoder_on_large_payloads(tracks):
+    rng = random.Random(tracks)
+    encoded = encode_voe_string(build_payload(rng, tracks), rng)
+
+    assert voe.decode_voe_string(encoded) == decode_voe_string_loop(encoded)
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("tracks", [2, 40, 200])
+def test_decoder_benchmark(benchmark_timer, tracks):
+    rng = random.Random(tracks)
+    encoded = encode_voe_string(build_payload(rng, tracks), rng)
+    size = f"{len(encoded) / 1024:.1f} KiB"
+
+    benchmark_timer(
+        f"{size} with loops", lambda: decode_voe_string_loop(encoded), ROUNDS
+    )
+    benchmark_timer(
+        f"{size} with tables", lambda: voe.decode_voe_string(encoded), ROUNDS
+    )